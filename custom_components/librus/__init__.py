@@ -2,41 +2,212 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
 
 from .const import (
+    ATTENDANCE_STORAGE_KEY,
+    ATTR_CLEAR_CACHE,
+    ATTR_DATE_FROM,
+    ATTR_DATE_TO,
+    ATTR_ENTRY_ID,
+    ATTR_RESOURCES,
     CONF_PASSWORD,
+    CONF_SCHOOL_ID,
     CONF_USERNAME,
     DOMAIN,
+    FREE_DAYS_STORAGE_KEY,
+    GRADES_STORAGE_KEY,
+    LUCKY_NUMBER_STORAGE_KEY,
     PLATFORMS,
+    REFRESH_INTERVALS,
+    REFRESHED_STORAGE_KEY,
+    SERVICE_GET_HOMEWORK,
+    SERVICE_REFRESH,
     SERVICE_REFRESH_HOMEWORK,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    TIMETABLE_STORAGE_KEY,
+)
+from .coordinator import (
+    LibrusAttendanceCoordinator,
+    LibrusDataUpdateCoordinator,
+    LibrusGradesCoordinator,
+    LibrusLuckyNumberCoordinator,
+    LibrusRuntimeData,
+    LibrusTimetableCoordinator,
+)
+from .librus_client import (
+    AsyncLibrusSessionManager,
+    LibrusAuthError,
+    LibrusConnectionError,
+    async_fetch_school_id,
 )
-from .coordinator import LibrusDataUpdateCoordinator
+from .registry import async_get_client_registry
+from .scheduler import LibrusRefreshScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
+REFRESH_HOMEWORK_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CLEAR_CACHE, default=False): cv.boolean,
+    }
+)
+
+REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_RESOURCES, default=list(REFRESH_INTERVALS)): vol.All(
+            cv.ensure_list, [vol.In(REFRESH_INTERVALS)]
+        ),
+        vol.Optional(ATTR_CLEAR_CACHE, default=False): cv.boolean,
+    }
+)
+
+GET_HOMEWORK_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DATE_FROM): cv.date,
+        vol.Optional(ATTR_DATE_TO): cv.date,
+    }
+)
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up Librus from a config entry."""
+    """Set up Librus from a config entry.
+
+    Nothing here waits for Librus: every resource is served from its
+    snapshot (or has no data yet) until the first refresh, which runs in the
+    background once setup has finished (see _async_start).
+    """
     hass.data.setdefault(DOMAIN, {})
 
-    coordinator = LibrusDataUpdateCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
+    # Accounts sharing a username share a login, accounts of one school
+    # their lookup maps
+    registry = async_get_client_registry(hass)
+    entry.async_on_unload(lambda: registry.async_release(entry.entry_id))
+    session_manager = registry.async_session_manager(entry)
+    coordinator = LibrusDataUpdateCoordinator(
+        hass,
+        entry,
+        session_manager,
+        registry.async_lookup_cache(entry, entry.data.get(CONF_SCHOOL_ID)),
+    )
+    await coordinator.async_restore_snapshot()
+    timetable = LibrusTimetableCoordinator(hass, entry, coordinator.session_manager)
+    await timetable.async_restore_snapshot()
+    # Only records added (or changed) since the snapshot are resolved
+    grades = LibrusGradesCoordinator(
+        hass, entry, coordinator.session_manager, coordinator.lookup_cache
+    )
+    await grades.async_restore_snapshot()
+    attendance = LibrusAttendanceCoordinator(
+        hass, entry, coordinator.session_manager, coordinator.lookup_cache
+    )
+    await attendance.async_restore_snapshot()
 
-    hass.data[DOMAIN][entry.entry_id] = coordinator
+    # The lucky number only rides on logins made for the data above
+    lucky_number = LibrusLuckyNumberCoordinator(hass, entry, coordinator.session_manager)
+    await lucky_number.async_restore_snapshot()
+    lucky_number.async_start()
+
+    scheduler = LibrusRefreshScheduler(
+        hass,
+        entry,
+        coordinator.session_manager,
+        {
+            "homework": coordinator,
+            "grades": grades,
+            "attendance": attendance,
+            "timetable": timetable,
+        },
+    )
+    await scheduler.async_restore_snapshot()
+
+    runtime_data = hass.data[DOMAIN][entry.entry_id] = LibrusRuntimeData(
+        homework=coordinator,
+        timetable=timetable,
+        grades=grades,
+        attendance=attendance,
+        lucky_number=lucky_number,
+        scheduler=scheduler,
+    )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
+    entry.async_create_background_task(
+        hass, _async_start(hass, entry, runtime_data), f"{DOMAIN}_start"
+    )
 
     _register_services(hass)
 
     return True
 
 
+async def _async_start(
+    hass: HomeAssistant, entry: ConfigEntry, runtime_data: LibrusRuntimeData
+) -> None:
+    """Learn the school Id if still unknown, then start the refresh scheduler.
+
+    Its first tick refreshes what is due, sharing the login made for the
+    school Id; resources refreshed shortly before a restart keep their
+    schedule (see LibrusRefreshScheduler.async_restore_snapshot).
+    """
+    if entry.data.get(CONF_SCHOOL_ID) is None:
+        school_id = await _async_learn_school_id(
+            hass, entry, runtime_data.homework.session_manager
+        )
+        if school_id is not None:
+            lookup_cache = async_get_client_registry(hass).async_move_to_school(
+                entry, school_id
+            )
+            for coordinator in (
+                runtime_data.homework,
+                runtime_data.grades,
+                runtime_data.attendance,
+            ):
+                coordinator.lookup_cache = lookup_cache
+    runtime_data.scheduler.async_start()
+
+
+async def _async_learn_school_id(
+    hass: HomeAssistant, entry: ConfigEntry, session_manager: AsyncLibrusSessionManager
+) -> int | None:
+    """Fetch the account's school Id once and keep it in the entry data.
+
+    Failures are not fatal: the entry then keeps a private lookup cache and
+    the Id is fetched again at the next setup.
+    """
+    try:
+        school_id = await async_fetch_school_id(session_manager)
+    except (LibrusAuthError, LibrusConnectionError) as err:
+        _LOGGER.debug("Librus school Id unavailable: %s", err)
+        return None
+    if school_id is not None:
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_SCHOOL_ID: school_id}
+        )
+    return school_id
+
+
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Re-render sensor attributes after the options changed."""
+    runtime_data: LibrusRuntimeData = hass.data[DOMAIN][entry.entry_id]
+    runtime_data.homework.async_update_listeners()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
@@ -46,10 +217,26 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if not hass.data[DOMAIN]:
             hass.data.pop(DOMAIN, None)
             hass.services.async_remove(DOMAIN, SERVICE_REFRESH_HOMEWORK)
+            hass.services.async_remove(DOMAIN, SERVICE_REFRESH)
+            hass.services.async_remove(DOMAIN, SERVICE_GET_HOMEWORK)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persisted snapshots when the entry is deleted."""
+    for key in (
+        STORAGE_KEY,
+        TIMETABLE_STORAGE_KEY,
+        GRADES_STORAGE_KEY,
+        ATTENDANCE_STORAGE_KEY,
+        LUCKY_NUMBER_STORAGE_KEY,
+        FREE_DAYS_STORAGE_KEY,
+        REFRESHED_STORAGE_KEY,
+    ):
+        await Store(hass, STORAGE_VERSION, key.format(entry_id=entry.entry_id)).async_remove()
+
+
 def _register_services(hass: HomeAssistant) -> None:
     """Register Librus services (idempotent)."""
     if hass.services.has_service(DOMAIN, SERVICE_REFRESH_HOMEWORK):
@@ -58,15 +245,76 @@ def _register_services(hass: HomeAssistant) -> None:
     async def handle_refresh_homework(call: ServiceCall) -> None:
         """Handle the refresh_homework service call."""
         _LOGGER.debug("On-demand homework refresh triggered via service call")
-        for coordinator in hass.data.get(DOMAIN, {}).values():
-            if isinstance(coordinator, LibrusDataUpdateCoordinator):
-                await coordinator.async_request_refresh()
+        for runtime_data in hass.data.get(DOMAIN, {}).values():
+            if isinstance(runtime_data, LibrusRuntimeData):
+                if call.data[ATTR_CLEAR_CACHE]:
+                    runtime_data.homework.lookup_cache.invalidate()
+                await runtime_data.scheduler.async_request_refresh(["homework"])
+
+    async def handle_refresh(call: ServiceCall) -> ServiceResponse:
+        """Refresh the chosen resources of the chosen (default: all) entries.
+
+        Calls made while an entry is refreshing are coalesced by its
+        scheduler; every caller gets the result of the refresh that covered
+        its request, per entry and resource.
+        """
+        loaded = {
+            entry_id: runtime_data
+            for entry_id, runtime_data in hass.data.get(DOMAIN, {}).items()
+            if isinstance(runtime_data, LibrusRuntimeData)
+        }
+        entry_ids = call.data.get(ATTR_ENTRY_ID) or list(loaded)
+        if unknown := [entry_id for entry_id in entry_ids if entry_id not in loaded]:
+            raise ServiceValidationError(
+                f"Librus config entries not loaded: {', '.join(unknown)}"
+            )
+        resources = call.data[ATTR_RESOURCES]
+        _LOGGER.debug("On-demand refresh of %s for %s", resources, entry_ids)
+        if call.data[ATTR_CLEAR_CACHE]:
+            for entry_id in entry_ids:
+                loaded[entry_id].homework.lookup_cache.invalidate()
+        results = await asyncio.gather(
+            *(
+                loaded[entry_id].scheduler.async_request_refresh(resources)
+                for entry_id in entry_ids
+            )
+        )
+        return {"entries": dict(zip(entry_ids, results, strict=True))}
+
+    async def handle_get_homework(call: ServiceCall) -> ServiceResponse:
+        """Return the full homework entries, optionally limited to a due-date range."""
+        date_from = call.data.get(ATTR_DATE_FROM)
+        date_to = call.data.get(ATTR_DATE_TO)
+        first = date_from.isoformat() if date_from else ""
+        last = date_to.isoformat() if date_to else "9999-12-31"
+        entries = [
+            entry
+            for runtime_data in hass.data.get(DOMAIN, {}).values()
+            if isinstance(runtime_data, LibrusRuntimeData)
+            for entry in runtime_data.homework.date_index.between(first, last)
+        ]
+        entries.sort(key=lambda entry: (entry.date, entry.time_from or ""))
+        return {"homework": [entry.as_dict() for entry in entries]}
 
     hass.services.async_register(
         DOMAIN,
         SERVICE_REFRESH_HOMEWORK,
         handle_refresh_homework,
-        schema=vol.Schema({}),
+        schema=REFRESH_HOMEWORK_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH,
+        handle_refresh,
+        schema=REFRESH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HOMEWORK,
+        handle_get_homework,
+        schema=GET_HOMEWORK_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
     )
 
 
@@ -81,4 +329,12 @@ async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             new_data[CONF_PASSWORD] = ""
         hass.config_entries.async_update_entry(entry, data=new_data, version=2)
         _LOGGER.debug("Migration to version 2 successful")
+    if entry.version == 2 and entry.minor_version < 2:
+        # Entries are unique per account (login) since several may be added
+        hass.config_entries.async_update_entry(
+            entry,
+            unique_id=entry.data[CONF_USERNAME].casefold() or None,
+            minor_version=2,
+        )
+        _LOGGER.debug("Migration to version 2.2 successful")
     return True
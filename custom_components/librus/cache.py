@@ -0,0 +1,141 @@
+"""Caches for slow-changing Librus data: lookup dictionaries and timetable weeks."""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    """A cached value and the wall-clock time it was stored at."""
+
+    value: Any
+    stored_at: float
+
+
+class LookupCache:
+    """Cache of resolved lookup maps (Subjects, Users, Categories), one TTL per resource.
+
+    Stores the built ID → name maps rather than raw API payloads. Resources
+    without a configured TTL are never cached. Timestamps are wall-clock so
+    entries remain meaningful across restarts.
+    """
+
+    def __init__(self, ttls: Mapping[str, timedelta]) -> None:
+        """Initialize the cache with a TTL per resource (API endpoint)."""
+        self._ttls = {key: ttl.total_seconds() for key, ttl in ttls.items()}
+        self._entries: dict[str, CacheEntry] = {}
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value for key, or None when missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry.stored_at > self._ttls.get(key, 0):
+            _LOGGER.debug("Librus lookup cache expired: %s", key)
+            del self._entries[key]
+            return None
+        return entry.value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store value for key if the resource is cacheable."""
+        if key in self._ttls:
+            self._entries[key] = CacheEntry(value, time.time())
+
+    def invalidate(self, key: str | None = None) -> None:
+        """Drop one resource, or every resource when key is None."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+        _LOGGER.debug("Librus lookup cache invalidated: %s", key or "all")
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Return the cached entries in a JSON-serializable form for persistence."""
+        return {
+            key: {"value": entry.value, "stored_at": entry.stored_at}
+            for key, entry in self._entries.items()
+        }
+
+    def restore(self, data: Mapping[str, Mapping[str, Any]]) -> None:
+        """Restore entries saved by as_dict, keeping their original timestamps.
+
+        JSON turns the integer IDs of lookup maps into strings; they are
+        converted back here. Expired entries are dropped on the next get().
+        An entry already held that is newer (e.g. restored by another config
+        entry sharing the cache) is kept.
+        """
+        for key, saved in data.items():
+            if key not in self._ttls:
+                continue
+            current = self._entries.get(key)
+            if current is not None and current.stored_at >= saved["stored_at"]:
+                continue
+            value = {int(item_id): name for item_id, name in saved["value"].items()}
+            self._entries[key] = CacheEntry(value, saved["stored_at"])
+
+
+class WeekCache:
+    """Cache of per-week data (timetable lessons), keyed by the week's Monday.
+
+    A week fetched after it ended is final and never expires; the current and
+    later weeks (and past weeks last fetched while still running) expire after
+    ttl. Timestamps are wall-clock so entries remain meaningful across restarts.
+    """
+
+    def __init__(self, ttl: timedelta) -> None:
+        """Initialize the cache with the TTL for weeks that may still change."""
+        self._ttl = ttl.total_seconds()
+        self._entries: dict[date, CacheEntry] = {}
+
+    def get(self, week_start: date) -> Any | None:
+        """Return the cached value for the week, or None when missing or stale."""
+        entry = self._entries.get(week_start)
+        if entry is None:
+            return None
+        if self.is_final(week_start):
+            return entry.value
+        if time.time() - entry.stored_at > self._ttl:
+            return None
+        return entry.value
+
+    def is_final(self, week_start: date) -> bool:
+        """Return True when the week is cached and was fetched after it ended."""
+        entry = self._entries.get(week_start)
+        return entry is not None and date.fromtimestamp(
+            entry.stored_at
+        ) >= week_start + timedelta(days=7)
+
+    def set(self, week_start: date, value: Any) -> None:
+        """Store value for the week."""
+        self._entries[week_start] = CacheEntry(value, time.time())
+
+    def as_dict(
+        self, convert: Callable[[Any], Any] = lambda value: value
+    ) -> dict[str, dict[str, Any]]:
+        """Return the cached weeks for persistence, converting each value with convert."""
+        return {
+            week_start.isoformat(): {
+                "value": convert(entry.value),
+                "stored_at": entry.stored_at,
+            }
+            for week_start, entry in self._entries.items()
+        }
+
+    def restore(
+        self,
+        data: Mapping[str, Mapping[str, Any]],
+        convert: Callable[[Any], Any] = lambda value: value,
+    ) -> None:
+        """Restore weeks saved by as_dict, converting each value with convert."""
+        for week_start, saved in data.items():
+            self._entries[date.fromisoformat(week_start)] = CacheEntry(
+                convert(saved["value"]), saved["stored_at"]
+            )
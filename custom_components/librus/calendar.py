@@ -0,0 +1,168 @@
+"""Homework and timetable calendars for the Librus integration."""
+
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, time, timedelta
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from .const import CALENDAR_HOMEWORK_KEY, CALENDAR_TIMETABLE_KEY, DOMAIN
+from .coordinator import (
+    LibrusDataUpdateCoordinator,
+    LibrusRuntimeData,
+    LibrusTimetableCoordinator,
+)
+from .models import HomeworkEntry, TimetableLesson
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the Librus homework and timetable calendars from a config entry."""
+    runtime_data: LibrusRuntimeData = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(
+        [
+            HomeworkCalendar(runtime_data.homework, entry),
+            TimetableCalendar(runtime_data.timetable, entry),
+        ]
+    )
+
+
+class HomeworkCalendar(CoordinatorEntity[LibrusDataUpdateCoordinator], CalendarEntity):
+    """Calendar of homework entries from Librus.
+
+    Answers range queries from the coordinator's date index, so no API calls
+    are made and only entries due in the requested window are visited.
+    Entries with lesson times become timed events; others are all-day events.
+    """
+
+    _attr_has_entity_name = True
+    _attr_translation_key = CALENDAR_HOMEWORK_KEY
+
+    def __init__(
+        self,
+        coordinator: LibrusDataUpdateCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the homework calendar."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry.entry_id}_{CALENDAR_HOMEWORK_KEY}"
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the current or next upcoming homework event."""
+        now = dt_util.now()
+        for entry in self.coordinator.date_index.since(now.date().isoformat()):
+            event = _homework_event(entry)
+            if event.end_datetime_local > now:
+                return event
+        return None
+
+    async def async_get_events(
+        self,
+        hass: HomeAssistant,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> list[CalendarEvent]:
+        """Return homework events overlapping [start_date, end_date)."""
+        first = dt_util.as_local(start_date).date().isoformat()
+        last = dt_util.as_local(end_date).date().isoformat()
+        events = []
+        for entry in self.coordinator.date_index.between(first, last):
+            event = _homework_event(entry)
+            if event.end_datetime_local > start_date and event.start_datetime_local < end_date:
+                events.append(event)
+        return events
+
+
+def _homework_event(entry: HomeworkEntry) -> CalendarEvent:
+    """Build a calendar event for a homework entry."""
+    day = date.fromisoformat(entry.date)
+    start: date | datetime = day
+    end: date | datetime = day + timedelta(days=1)
+    if entry.time_from and entry.time_to:
+        start = datetime.combine(
+            day, time.fromisoformat(entry.time_from), dt_util.get_default_time_zone()
+        )
+        end = datetime.combine(
+            day, time.fromisoformat(entry.time_to), dt_util.get_default_time_zone()
+        )
+    description = entry.content
+    if entry.lesson_no is not None:
+        description = f"Lesson {entry.lesson_no}\n{description or ''}".rstrip()
+    return CalendarEvent(
+        start=start,
+        end=end,
+        summary=f"{entry.subject}: {entry.category}",
+        description=description,
+        uid=str(entry.id),
+    )
+
+
+class TimetableCalendar(CoordinatorEntity[LibrusTimetableCoordinator], CalendarEntity):
+    """Calendar of timetable lessons from Librus.
+
+    The current and next week come from the coordinator; other weeks are
+    fetched once and then served from its week cache.
+    """
+
+    _attr_has_entity_name = True
+    _attr_translation_key = CALENDAR_TIMETABLE_KEY
+
+    def __init__(
+        self,
+        coordinator: LibrusTimetableCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the timetable calendar."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry.entry_id}_{CALENDAR_TIMETABLE_KEY}"
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the current or next lesson."""
+        lesson = self.coordinator.next_lesson()
+        return _lesson_event(lesson) if lesson else None
+
+    async def async_get_events(
+        self,
+        hass: HomeAssistant,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> list[CalendarEvent]:
+        """Return lessons overlapping [start_date, end_date)."""
+        lessons = await self.coordinator.async_get_lessons(
+            dt_util.as_local(start_date).date(), dt_util.as_local(end_date).date()
+        )
+        events = [_lesson_event(lesson) for lesson in lessons]
+        return [
+            event
+            for event in events
+            if event.end_datetime_local > start_date and event.start_datetime_local < end_date
+        ]
+
+
+def _lesson_event(lesson: TimetableLesson) -> CalendarEvent:
+    """Build a calendar event for a timetable lesson."""
+    tz = dt_util.get_default_time_zone()
+    summary = lesson.subject
+    if lesson.is_canceled:
+        summary = f"{summary} (canceled)"
+    elif lesson.is_substitution:
+        summary = f"{summary} (substitution)"
+    return CalendarEvent(
+        start=lesson.start(tz),
+        end=lesson.end(tz),
+        summary=summary,
+        description=f"Lesson {lesson.lesson_no}, {lesson.teacher}",
+    )
@@ -5,12 +5,34 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+import aiohttp
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
-
-from .const import CONF_PASSWORD, CONF_USERNAME, DOMAIN
-from .librus_client import LibrusConnectionError, LibrusTimeoutError
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from .const import (
+    ATTRIBUTE_MODE_COMPACT,
+    ATTRIBUTE_MODE_FULL,
+    CONF_ATTRIBUTE_MODE,
+    CONF_PASSWORD,
+    CONF_SCHOOL_ID,
+    CONF_USERNAME,
+    DEFAULT_ATTRIBUTE_MODE,
+    DOMAIN,
+)
+from .librus_client import (
+    LibrusConnectionError,
+    LibrusTimeoutError,
+    async_validate_credentials,
+)
+from .registry import async_get_client_registry
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,21 +45,36 @@ DATA_SCHEMA = vol.Schema(
 
 
 class LibrusConfigFlow(ConfigFlow, domain=DOMAIN):
-    """Handle a config flow for Librus."""
+    """Handle a config flow for Librus; one entry per account (login)."""
 
     VERSION = 2
+    MINOR_VERSION = 2
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> LibrusOptionsFlow:
+        """Return the options flow handler."""
+        return LibrusOptionsFlow()
 
     async def _validate_librus_credentials(
         self, username: str, password: str
     ) -> bool:
-        """Validate credentials against Librus in executor."""
-        from .librus_client import validate_credentials
+        """Validate credentials against Librus on a throwaway cookie jar.
 
-        return await self.hass.async_add_executor_job(
-            validate_credentials,
-            username,
-            password,
+        The requests share the integration's rate limiter with the entries.
+        """
+        session = async_create_clientsession(
+            self.hass, auto_cleanup=False, cookie_jar=aiohttp.CookieJar()
         )
+        try:
+            return await async_validate_credentials(
+                session,
+                username,
+                password,
+                async_get_client_registry(self.hass).rate_limiter,
+            )
+        finally:
+            session.detach()
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -48,6 +85,8 @@ class LibrusConfigFlow(ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             username = user_input[CONF_USERNAME]
             password = user_input[CONF_PASSWORD]
+            await self.async_set_unique_id(username.casefold())
+            self._abort_if_unique_id_configured()
 
             try:
                 if not await self._validate_librus_credentials(username, password):
@@ -62,7 +101,7 @@ class LibrusConfigFlow(ConfigFlow, domain=DOMAIN):
 
             if not errors:
                 return self.async_create_entry(
-                    title="Librus",
+                    title=f"Librus ({username})",
                     data={
                         CONF_USERNAME: username,
                         CONF_PASSWORD: password,
@@ -91,25 +130,32 @@ class LibrusConfigFlow(ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             username = user_input[CONF_USERNAME]
             password = user_input[CONF_PASSWORD]
-
-            try:
-                if not await self._validate_librus_credentials(username, password):
-                    errors["base"] = "invalid_auth"
-            except LibrusTimeoutError:
-                errors["base"] = "timeout"
-            except LibrusConnectionError:
-                errors["base"] = "cannot_connect"
-            except Exception:
-                _LOGGER.exception("Unexpected error validating Librus credentials")
-                errors["base"] = "unknown"
+            unique_id = username.casefold()
+
+            if any(
+                other.unique_id == unique_id and other.entry_id != entry.entry_id
+                for other in self._async_current_entries(include_ignore=False)
+            ):
+                errors["base"] = "already_configured"
+            else:
+                try:
+                    if not await self._validate_librus_credentials(username, password):
+                        errors["base"] = "invalid_auth"
+                except LibrusTimeoutError:
+                    errors["base"] = "timeout"
+                except LibrusConnectionError:
+                    errors["base"] = "cannot_connect"
+                except Exception:
+                    _LOGGER.exception("Unexpected error validating Librus credentials")
+                    errors["base"] = "unknown"
 
             if not errors:
+                data = {**entry.data, CONF_USERNAME: username, CONF_PASSWORD: password}
+                if unique_id != entry.unique_id:
+                    # Another account may belong to another school
+                    data.pop(CONF_SCHOOL_ID, None)
                 return self.async_update_reload_and_abort(
-                    entry,
-                    data_updates={
-                        CONF_USERNAME: username,
-                        CONF_PASSWORD: password,
-                    },
+                    entry, unique_id=unique_id, title=f"Librus ({username})", data=data
                 )
 
             return self.async_show_form(
@@ -136,3 +182,28 @@ class LibrusConfigFlow(ConfigFlow, domain=DOMAIN):
                 vol.Required(CONF_PASSWORD): str,
             }
         )
+
+
+class LibrusOptionsFlow(OptionsFlow):
+    """Handle Librus options (how homework is exposed on sensors)."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_ATTRIBUTE_MODE,
+                        default=self.config_entry.options.get(
+                            CONF_ATTRIBUTE_MODE, DEFAULT_ATTRIBUTE_MODE
+                        ),
+                    ): vol.In([ATTRIBUTE_MODE_FULL, ATTRIBUTE_MODE_COMPACT]),
+                }
+            ),
+        )
@@ -1,25 +1,141 @@
 """Constants for the Librus integration."""
 
-from datetime import timedelta
+from datetime import time, timedelta
 
 DOMAIN = "librus"
 
 CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
+# Librus school Id, learned after the first login; entries of one school
+# share their lookup maps
+CONF_SCHOOL_ID = "school_id"
+
+# hass.data key of the client registry shared by all config entries
+DATA_CLIENT_REGISTRY = f"{DOMAIN}_client_registry"
+# Most logins (OAuth flows) running at once across all config entries
+MAX_CONCURRENT_LOGINS = 2
 
 # Homework sensor
 SENSOR_HOMEWORK_KEY = "homework"
 SENSOR_HOMEWORK_NAME = "Librus Homework"
 
-# Update interval for homework data refresh
-DEFAULT_UPDATE_INTERVAL = timedelta(hours=1)
+# Calendars
+CALENDAR_HOMEWORK_KEY = "homework"
+CALENDAR_TIMETABLE_KEY = "timetable"
+
+# Timetable sensor
+SENSOR_NEXT_LESSON_KEY = "next_lesson"
+
+# Grades sensor
+SENSOR_LATEST_GRADE_KEY = "latest_grade"
+
+# Lucky number sensor
+SENSOR_LUCKY_NUMBER_KEY = "lucky_number"
+
+# Attendance sensors
+SENSOR_ATTENDANCE_KEY = "attendance"
+SENSOR_ABSENCES_KEY = "absences"
+SENSOR_LATES_KEY = "lates"
+SENSOR_EXCUSED_KEY = "excused_absences"
+
+# Per-day homework sensors
+SENSOR_HOMEWORK_TODAY_KEY = "homework_today"
+SENSOR_HOMEWORK_TOMORROW_KEY = "homework_tomorrow"
+SENSOR_HOMEWORK_WEEK_KEY = "homework_week"
+
+# Diagnostic sensors (request metrics)
+SENSOR_LOGINS_KEY = "logins"
+SENSOR_RETRIES_KEY = "retries"
+SENSOR_FAILURES_KEY = "failures"
+SENSOR_CACHE_HITS_KEY = "cache_hits"
+SENSOR_LOGIN_TIME_KEY = "login_time"
+SENSOR_CALL_TIME_KEY = "call_time"
+
+# How homework entries are exposed as state attributes (options flow)
+CONF_ATTRIBUTE_MODE = "attribute_mode"
+ATTRIBUTE_MODE_FULL = "full"
+ATTRIBUTE_MODE_COMPACT = "compact"
+DEFAULT_ATTRIBUTE_MODE = ATTRIBUTE_MODE_FULL
+
+# Compact mode: entries kept per sensor and characters kept of each content
+COMPACT_MAX_ENTRIES = 10
+COMPACT_CONTENT_LENGTH = 100
+
+# Refresh cadence per resource: (during school hours, outside them).
+# School hours are SCHOOL_HOURS on weekdays; school free days and the summer
+# break are throttled further (see below). Lookups follow LOOKUP_CACHE_TTLS
+# and the lucky number its own daily schedule.
+REFRESH_INTERVALS: dict[str, tuple[timedelta, timedelta]] = {
+    "homework": (timedelta(minutes=15), timedelta(hours=6)),
+    "grades": (timedelta(minutes=15), timedelta(hours=6)),
+    "attendance": (timedelta(minutes=30), timedelta(hours=6)),
+    "timetable": (timedelta(hours=6), timedelta(hours=12)),
+}
+SCHOOL_HOURS = (time(7, 0), time(16, 0))
+# How often the scheduler checks which resources are due
+SCHEDULER_TICK = timedelta(minutes=1)
+# A resource with no data yet (no snapshot, every refresh failed so far) is
+# retried at least this often, since setup does not wait for its first refresh
+FIRST_REFRESH_RETRY = timedelta(minutes=5)
+# Cadence for every resource on school free days (SchoolFreeDays) and during
+# the summer break (SUMMER_BREAK_MONTHS)
+FREE_DAY_REFRESH_INTERVAL = timedelta(days=1)
+SUMMER_BREAK_MONTHS = (7, 8)
+SUMMER_BREAK_REFRESH_INTERVAL = timedelta(days=7)
+# School free days are downloaded once per term; terms start on these
+# (month, day) dates. A failed download is retried after FREE_DAYS_RETRY
+TERM_STARTS = ((9, 1), (2, 1))
+FREE_DAYS_RETRY = timedelta(hours=6)
+
+# Timetable: weeks other than the current and next one cached per TTL
+TIMETABLE_CACHE_TTL = timedelta(hours=6)
+# Most weeks a single calendar query may download
+TIMETABLE_MAX_QUERY_WEEKS = 6
+
+# How long resolved lookup maps are reused before being downloaded again;
+# an expired map is re-downloaded by the next refresh that needs it
+LOOKUP_CACHE_TTLS = {
+    "HomeWorks/Categories": timedelta(hours=12),
+    "Subjects": timedelta(days=1),
+    "Users": timedelta(days=1),
+    "Grades/Categories": timedelta(days=1),
+    "Grades/Comments": timedelta(hours=12),
+    "Lessons": timedelta(days=1),
+    "Attendances/Types": timedelta(days=7),
+}
 
 # Date filtering window
 HOMEWORK_PAST_DAYS = 7
 HOMEWORK_FUTURE_DAYS = 14
 
+# Persistent snapshot of the last successful refresh (one store per entry)
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.{{entry_id}}"
+TIMETABLE_STORAGE_KEY = f"{DOMAIN}.{{entry_id}}.timetable"
+GRADES_STORAGE_KEY = f"{DOMAIN}.{{entry_id}}.grades"
+ATTENDANCE_STORAGE_KEY = f"{DOMAIN}.{{entry_id}}.attendance"
+LUCKY_NUMBER_STORAGE_KEY = f"{DOMAIN}.{{entry_id}}.lucky_number"
+FREE_DAYS_STORAGE_KEY = f"{DOMAIN}.{{entry_id}}.free_days"
+REFRESHED_STORAGE_KEY = f"{DOMAIN}.{{entry_id}}.refreshed"
+STORAGE_SAVE_DELAY = 10
+
+# Bus events fired with the per-refresh homework delta and for new grades
+EVENT_HOMEWORK_ADDED = f"{DOMAIN}_homework_added"
+EVENT_HOMEWORK_CHANGED = f"{DOMAIN}_homework_changed"
+EVENT_HOMEWORK_REMOVED = f"{DOMAIN}_homework_removed"
+EVENT_NEW_GRADE = f"{DOMAIN}_new_grade"
+
 # Service names
 SERVICE_REFRESH_HOMEWORK = "refresh_homework"
+SERVICE_REFRESH = "refresh"
+SERVICE_GET_HOMEWORK = "get_homework"
+
+# Service fields
+ATTR_CLEAR_CACHE = "clear_cache"
+ATTR_DATE_FROM = "date_from"
+ATTR_DATE_TO = "date_to"
+ATTR_ENTRY_ID = "entry_id"
+ATTR_RESOURCES = "resources"
 
 # Platforms
-PLATFORMS = ["sensor"]
+PLATFORMS = ["calendar", "sensor"]
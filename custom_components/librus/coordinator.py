@@ -1,68 +1,226 @@
-"""DataUpdateCoordinator for Librus homework data."""
+"""DataUpdateCoordinators for Librus homework, timetable, grades, attendance and lucky number data."""
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
 from typing import Any
 
+import aiohttp
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
+from .cache import LookupCache, WeekCache
 from .const import (
+    ATTENDANCE_STORAGE_KEY,
     CONF_PASSWORD,
     CONF_USERNAME,
-    DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
+    EVENT_HOMEWORK_ADDED,
+    EVENT_HOMEWORK_CHANGED,
+    EVENT_HOMEWORK_REMOVED,
+    EVENT_NEW_GRADE,
+    GRADES_STORAGE_KEY,
+    LOOKUP_CACHE_TTLS,
+    LUCKY_NUMBER_STORAGE_KEY,
+    STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    TIMETABLE_CACHE_TTL,
+    TIMETABLE_MAX_QUERY_WEEKS,
+    TIMETABLE_STORAGE_KEY,
 )
 from .librus_client import (
+    AsyncLibrusSessionManager,
     LibrusAuthError,
     LibrusConnectionError,
     LibrusTimeoutError,
-    fetch_homework_data,
+    RequestPriority,
+    async_fetch_attendances,
+    async_fetch_grades,
+    async_fetch_homework_data,
+    async_fetch_lucky_number,
+    async_fetch_timetable_week,
+    request_priority,
+)
+from .models import (
+    AttendanceRecord,
+    AttendanceSummary,
+    GradeEntry,
+    HomeworkEntry,
+    HomeworkIndex,
+    LuckyNumber,
+    TimetableLesson,
 )
+from .scheduler import LibrusRefreshScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class LibrusDataUpdateCoordinator(DataUpdateCoordinator[list[dict[str, Any]]]):
+class LibrusDataUpdateCoordinator(DataUpdateCoordinator[list[HomeworkEntry]]):
     """Coordinator to fetch homework data from Librus API.
 
-    Uses DataUpdateCoordinator for hourly auto-refresh (FR-007)
-    and on-demand refresh support (FR-008).
+    Refreshed by LibrusRefreshScheduler on its school-hours cadence (FR-007)
+    and on demand (FR-008).
     Preserves previous data on transient failures (FR-009).
+    Keeps one authenticated Librus session alive across refreshes so the
+    OAuth flow only runs again when the session has expired, and caches the
+    Subjects/Users/Categories lookup maps per LOOKUP_CACHE_TTLS.
+    The last good result is persisted so restarts can serve it immediately.
+    Entries are indexed by homework Id so each refresh fires bus events for
+    the added/changed/removed delta only, and by due date for range queries.
     """
 
     config_entry: ConfigEntry
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        """Initialize the coordinator."""
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        session_manager: AsyncLibrusSessionManager | None = None,
+        lookup_cache: LookupCache | None = None,
+    ) -> None:
+        """Initialize the coordinator.
+
+        session_manager and lookup_cache may be shared with other config
+        entries (see LibrusClientRegistry); by default the entry gets its own.
+        """
         super().__init__(
             hass,
             _LOGGER,
             name=f"{DOMAIN}_homework",
-            update_interval=DEFAULT_UPDATE_INTERVAL,
+            # Refreshed by LibrusRefreshScheduler
+            update_interval=None,
             config_entry=entry,
+            # Unchanged homework must not trigger state writes
+            always_update=False,
         )
+        if session_manager is None:
+            # Dedicated cookie jar on Home Assistant's pooled connector; the
+            # session is detached automatically when the entry unloads.
+            session_manager = AsyncLibrusSessionManager(
+                async_create_clientsession(hass, cookie_jar=aiohttp.CookieJar()),
+                entry.data[CONF_USERNAME],
+                entry.data[CONF_PASSWORD],
+            )
+        self.session_manager = session_manager
+        self.lookup_cache = (
+            LookupCache(LOOKUP_CACHE_TTLS) if lookup_cache is None else lookup_cache
+        )
+        # Day the current data was resolved for; the date window moves daily
+        self._resolved_on: date | None = None
+        # Homework Id → entry for the current data; None until the first result
+        self._homework_index: dict[int, HomeworkEntry] | None = None
+        # Date index over self.data, rebuilt lazily when the data changes
+        self._date_index = HomeworkIndex(())
+        self._date_index_source: list[HomeworkEntry] | None = None
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY.format(entry_id=entry.entry_id)
+        )
+
+    @property
+    def date_index(self) -> HomeworkIndex:
+        """Return the current homework indexed by due date."""
+        if self.data is not self._date_index_source:
+            self._date_index_source = self.data
+            self._date_index = HomeworkIndex(self.data or ())
+        return self._date_index
+
+    async def async_restore_snapshot(self) -> bool:
+        """Serve the last persisted refresh result, if any.
 
-    async def _async_update_data(self) -> list[dict[str, Any]]:
-        """Fetch homework data from Librus API in executor.
+        Restores the homework list and lookup maps saved after the previous
+        successful refresh. Returns True when a snapshot was restored.
+        """
+        snapshot = await self._store.async_load()
+        if not snapshot:
+            return False
+        self.lookup_cache.restore(snapshot.get("lookups", {}))
+        data = [HomeworkEntry.from_dict(entry) for entry in snapshot["homework"]]
+        self._async_track_changes(data)
+        self.async_set_updated_data(data)
+        _LOGGER.debug("Restored Librus homework snapshot: %d entries", len(data))
+        return True
+
+    @callback
+    def _snapshot(self) -> dict[str, Any]:
+        """Build the data persisted after a successful refresh."""
+        return {
+            "homework": [entry.as_dict() for entry in self.data],
+            "lookups": self.lookup_cache.as_dict(),
+        }
+
+    @callback
+    def _async_track_changes(self, data: list[HomeworkEntry]) -> None:
+        """Diff data against the previous Id index and fire events for the delta.
+
+        The first result only builds the index; no events are fired for it.
+        Entries leaving the date window are reported as removed. Event data
+        carries entries in their as_dict() shape.
+        """
+        index = {entry.id: entry for entry in data}
+        previous = self._homework_index
+        self._homework_index = index
+        if previous is None:
+            return
+
+        entry_id = self.config_entry.entry_id
+        for homework_id, entry in index.items():
+            old = previous.get(homework_id)
+            if old is None:
+                self.hass.bus.async_fire(
+                    EVENT_HOMEWORK_ADDED,
+                    {"entry_id": entry_id, "homework": entry.as_dict()},
+                )
+            elif old != entry:
+                self.hass.bus.async_fire(
+                    EVENT_HOMEWORK_CHANGED,
+                    {
+                        "entry_id": entry_id,
+                        "homework": entry.as_dict(),
+                        "previous": old.as_dict(),
+                    },
+                )
+        for homework_id in previous.keys() - index.keys():
+            self.hass.bus.async_fire(
+                EVENT_HOMEWORK_REMOVED,
+                {"entry_id": entry_id, "homework": previous[homework_id].as_dict()},
+            )
+
+    async def _async_update_data(self) -> list[HomeworkEntry]:
+        """Fetch homework data from Librus API on the event loop.
+
+        When HomeWorks is unchanged and nothing else needs resolving, the
+        previous data object is returned as-is, so listeners are not updated.
 
-        Runs the blocking HTTP calls in the executor thread pool.
         Raises ConfigEntryAuthFailed on authentication failure.
         Raises UpdateFailed on transient errors (preserves previous data).
         """
-        username = self.config_entry.data[CONF_USERNAME]
-        password = self.config_entry.data[CONF_PASSWORD]
-
+        today = date.today()
         try:
-            data = await self.hass.async_add_executor_job(
-                fetch_homework_data, username, password
+            data = await async_fetch_homework_data(
+                self.session_manager,
+                cache=self.lookup_cache,
+                if_changed=self.data is not None and self._resolved_on == today,
             )
+            if data is None:
+                _LOGGER.debug("Librus homework unchanged since last refresh")
+                return self.data
+            self._resolved_on = today
+            self._async_track_changes(data)
             _LOGGER.debug(
                 "Librus homework refresh successful: %d entries", len(data)
             )
+            self._store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
             return data
 
         except LibrusAuthError as err:
@@ -77,3 +235,465 @@ class LibrusDataUpdateCoordinator(DataUpdateCoordinator[list[dict[str, Any]]]):
             raise UpdateFailed(
                 f"Error connecting to Librus: {err}"
             ) from err
+
+
+def week_start(day: date) -> date:
+    """Return the Monday of day's week."""
+    return day - timedelta(days=day.weekday())
+
+
+class LibrusTimetableCoordinator(DataUpdateCoordinator[list[TimetableLesson]]):
+    """Coordinator for the Librus timetable.
+
+    data holds the lessons of the current and next week, re-downloaded on the
+    scheduler's timetable cadence (slower than homework). Other weeks are fetched
+    on demand by async_get_lessons and kept in a WeekCache: weeks fetched
+    after they ended are never fetched again. The cache is persisted, so
+    finished weeks also survive restarts. Shares the homework coordinator's
+    Librus session.
+    """
+
+    config_entry: ConfigEntry
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        session_manager: AsyncLibrusSessionManager,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_timetable",
+            # Refreshed by LibrusRefreshScheduler
+            update_interval=None,
+            config_entry=entry,
+            always_update=False,
+        )
+        self.session_manager = session_manager
+        self.week_cache = WeekCache(TIMETABLE_CACHE_TTL)
+        # Serializes on-demand week downloads from concurrent calendar queries
+        self._weeks_lock = asyncio.Lock()
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, TIMETABLE_STORAGE_KEY.format(entry_id=entry.entry_id)
+        )
+
+    def _current_weeks(self) -> tuple[date, date]:
+        """Return the Mondays of the current and next week."""
+        this_week = week_start(dt_util.now().date())
+        return this_week, this_week + timedelta(days=7)
+
+    async def async_restore_snapshot(self) -> bool:
+        """Restore the persisted week cache and serve the current weeks from it.
+
+        Returns True when cached lessons for the current week were served.
+        """
+        snapshot = await self._store.async_load()
+        if not snapshot:
+            return False
+        self.week_cache.restore(
+            snapshot["weeks"],
+            lambda lessons: [TimetableLesson.from_dict(lesson) for lesson in lessons],
+        )
+        this_week, next_week = self._current_weeks()
+        current = self.week_cache.get(this_week)
+        if current is None:
+            return False
+        self.async_set_updated_data([*current, *(self.week_cache.get(next_week) or [])])
+        return True
+
+    @callback
+    def _snapshot(self) -> dict[str, Any]:
+        """Build the data persisted after the week cache changed."""
+        return {
+            "weeks": self.week_cache.as_dict(
+                lambda lessons: [lesson.as_dict() for lesson in lessons]
+            )
+        }
+
+    async def _async_update_data(self) -> list[TimetableLesson]:
+        """Download the current and next week.
+
+        Raises ConfigEntryAuthFailed on authentication failure.
+        Raises UpdateFailed on transient errors (preserves previous data).
+        """
+        lessons: list[TimetableLesson] = []
+        try:
+            for week in self._current_weeks():
+                week_lessons = await async_fetch_timetable_week(self.session_manager, week)
+                self.week_cache.set(week, week_lessons)
+                lessons.extend(week_lessons)
+        except LibrusAuthError as err:
+            raise ConfigEntryAuthFailed("Invalid Librus credentials") from err
+        except LibrusTimeoutError as err:
+            raise UpdateFailed(f"Timeout fetching timetable: {err}") from err
+        except LibrusConnectionError as err:
+            raise UpdateFailed(f"Error connecting to Librus: {err}") from err
+        self._store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
+        return lessons
+
+    def next_lesson(self) -> TimetableLesson | None:
+        """Return the lesson in progress or the next one, skipping canceled lessons."""
+        now = dt_util.now()
+        tz = dt_util.get_default_time_zone()
+        return next(
+            (
+                lesson
+                for lesson in self.data or ()
+                if not lesson.is_canceled and lesson.end(tz) > now
+            ),
+            None,
+        )
+
+    async def async_get_lessons(self, first: date, last: date) -> list[TimetableLesson]:
+        """Return lessons dated within [first, last], fetching uncached weeks.
+
+        At most TIMETABLE_MAX_QUERY_WEEKS weeks are downloaded per call; weeks
+        that cannot be fetched are left out rather than failing the query.
+        """
+        lessons: list[TimetableLesson] = []
+        downloaded = 0
+        async with self._weeks_lock:
+            week = week_start(first)
+            while week <= last:
+                week_lessons = self.week_cache.get(week)
+                if week_lessons is None and downloaded < TIMETABLE_MAX_QUERY_WEEKS:
+                    downloaded += 1
+                    try:
+                        week_lessons = await async_fetch_timetable_week(
+                            self.session_manager, week
+                        )
+                    except (LibrusAuthError, LibrusConnectionError) as err:
+                        _LOGGER.debug("Librus timetable week %s unavailable: %s", week, err)
+                    else:
+                        self.week_cache.set(week, week_lessons)
+                lessons.extend(week_lessons or ())
+                week += timedelta(days=7)
+        if downloaded:
+            self._store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
+        first_day, last_day = first.isoformat(), last.isoformat()
+        return [lesson for lesson in lessons if first_day <= lesson.date <= last_day]
+
+
+class LibrusGradesCoordinator(DataUpdateCoordinator[list[GradeEntry]]):
+    """Coordinator for Librus grades.
+
+    Grades only accumulate over a school year, so each refresh asks the client
+    for grades with an Id above the highest one already held and appends them;
+    the history is never resolved again. A librus_new_grade event is fired per
+    new grade (not for the first sync). Lookup maps come from the homework
+    coordinator's cache and the resolved grades are persisted, so a restart
+    does not resolve the history either. Shares the homework coordinator's
+    Librus session.
+    """
+
+    config_entry: ConfigEntry
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        session_manager: AsyncLibrusSessionManager,
+        lookup_cache: LookupCache,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_grades",
+            # Refreshed by LibrusRefreshScheduler
+            update_interval=None,
+            config_entry=entry,
+            always_update=False,
+        )
+        self.session_manager = session_manager
+        self.lookup_cache = lookup_cache
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, GRADES_STORAGE_KEY.format(entry_id=entry.entry_id)
+        )
+
+    @property
+    def last_grade_id(self) -> int:
+        """Return the highest grade Id held, or 0 before the first sync."""
+        return self.data[-1].id if self.data else 0
+
+    async def async_restore_snapshot(self) -> bool:
+        """Serve the persisted grades, if any. Returns True when restored."""
+        snapshot = await self._store.async_load()
+        if not snapshot:
+            return False
+        data = [GradeEntry.from_dict(grade) for grade in snapshot["grades"]]
+        self.async_set_updated_data(data)
+        _LOGGER.debug("Restored Librus grades snapshot: %d grades", len(data))
+        return True
+
+    @callback
+    def _snapshot(self) -> dict[str, Any]:
+        """Build the data persisted after new grades arrived."""
+        return {"grades": [grade.as_dict() for grade in self.data]}
+
+    async def _async_update_data(self) -> list[GradeEntry]:
+        """Fetch and append the grades added since the last refresh.
+
+        Returns the previous data object when nothing was added, so listeners
+        are not updated.
+
+        Raises ConfigEntryAuthFailed on authentication failure.
+        Raises UpdateFailed on transient errors (preserves previous data).
+        """
+        try:
+            new_grades = await async_fetch_grades(
+                self.session_manager,
+                after_id=self.last_grade_id,
+                cache=self.lookup_cache,
+                if_changed=self.data is not None,
+            )
+        except LibrusAuthError as err:
+            raise ConfigEntryAuthFailed("Invalid Librus credentials") from err
+        except LibrusTimeoutError as err:
+            raise UpdateFailed(f"Timeout fetching grades: {err}") from err
+        except LibrusConnectionError as err:
+            raise UpdateFailed(f"Error connecting to Librus: {err}") from err
+
+        if self.data is not None and not new_grades:
+            _LOGGER.debug("No new Librus grades")
+            return self.data
+        previous = self.data
+        data = [*(previous or ()), *(new_grades or ())]
+        if previous is not None:
+            entry_id = self.config_entry.entry_id
+            for grade in new_grades or ():
+                self.hass.bus.async_fire(
+                    EVENT_NEW_GRADE, {"entry_id": entry_id, "grade": grade.as_dict()}
+                )
+        _LOGGER.debug(
+            "Librus grades refresh successful: %d new, %d total",
+            len(new_grades or ()),
+            len(data),
+        )
+        self._store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
+        return data
+
+
+class LibrusAttendanceCoordinator(DataUpdateCoordinator[AttendanceSummary]):
+    """Coordinator for Librus attendance.
+
+    data is an AttendanceSummary whose counters (overall, per subject and per
+    type) are kept up to date from record deltas: each refresh resolves only
+    new records and records whose type changed, and drops records no longer
+    returned. Sensors read the precomputed counters. The records are
+    persisted and the counters rebuilt from them on restore. Shares the
+    homework coordinator's Librus session and lookup cache.
+    """
+
+    config_entry: ConfigEntry
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        session_manager: AsyncLibrusSessionManager,
+        lookup_cache: LookupCache,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_attendance",
+            # Refreshed by LibrusRefreshScheduler
+            update_interval=None,
+            config_entry=entry,
+            always_update=False,
+        )
+        self.session_manager = session_manager
+        self.lookup_cache = lookup_cache
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, ATTENDANCE_STORAGE_KEY.format(entry_id=entry.entry_id)
+        )
+
+    async def async_restore_snapshot(self) -> bool:
+        """Serve the persisted attendance, if any. Returns True when restored."""
+        snapshot = await self._store.async_load()
+        if not snapshot:
+            return False
+        summary = AttendanceSummary(
+            AttendanceRecord.from_dict(record) for record in snapshot["records"]
+        )
+        self.async_set_updated_data(summary)
+        _LOGGER.debug(
+            "Restored Librus attendance snapshot: %d records", len(summary.records)
+        )
+        return True
+
+    @callback
+    def _snapshot(self) -> dict[str, Any]:
+        """Build the data persisted after the records changed."""
+        return {"records": [record.as_dict() for record in self.data.records.values()]}
+
+    async def _async_update_data(self) -> AttendanceSummary:
+        """Fetch new/changed attendance records and update the counters.
+
+        Returns the previous data object when nothing changed, so listeners
+        are not updated.
+
+        Raises ConfigEntryAuthFailed on authentication failure.
+        Raises UpdateFailed on transient errors (preserves previous data).
+        """
+        summary = self.data if self.data is not None else AttendanceSummary()
+        try:
+            result = await async_fetch_attendances(
+                self.session_manager,
+                known=summary.type_ids(),
+                cache=self.lookup_cache,
+                if_changed=self.data is not None,
+            )
+        except LibrusAuthError as err:
+            raise ConfigEntryAuthFailed("Invalid Librus credentials") from err
+        except LibrusTimeoutError as err:
+            raise UpdateFailed(f"Timeout fetching attendance: {err}") from err
+        except LibrusConnectionError as err:
+            raise UpdateFailed(f"Error connecting to Librus: {err}") from err
+
+        if result is None:
+            _LOGGER.debug("Librus attendance unchanged since last refresh")
+            return summary
+        changed, seen = result
+        removed = summary.records.keys() - seen
+        if self.data is not None and not changed and not removed:
+            return self.data
+        summary = summary.apply(changed, removed)
+        _LOGGER.debug(
+            "Librus attendance refresh successful: %d new or changed, %d removed, %d total",
+            len(changed),
+            len(removed),
+            len(summary.records),
+        )
+        self._store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
+        return summary
+
+
+class LibrusLuckyNumberCoordinator(DataUpdateCoordinator[LuckyNumber]):
+    """Coordinator for the lucky number, which changes at most once a day.
+
+    Has no update interval. A fetch is due when the held number's
+    LuckyNumberDay is before today and no fetch was made yet today; once a
+    day's fetch succeeded nothing is requested again until the next day.
+    A due fetch runs right after midnight and whenever another coordinator
+    obtains the shared session, and only on an already logged-in session:
+    it never triggers a login of its own.
+    """
+
+    config_entry: ConfigEntry
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        session_manager: AsyncLibrusSessionManager,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_lucky_number",
+            update_interval=None,
+            config_entry=entry,
+            always_update=False,
+        )
+        self.session_manager = session_manager
+        # Local day of the last successful fetch
+        self._fetched_on: date | None = None
+        self._refreshing = False
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, LUCKY_NUMBER_STORAGE_KEY.format(entry_id=entry.entry_id)
+        )
+
+    async def async_restore_snapshot(self) -> bool:
+        """Serve the persisted lucky number, if any. Returns True when restored."""
+        snapshot = await self._store.async_load()
+        if not snapshot:
+            return False
+        self._fetched_on = date.fromisoformat(snapshot["fetched_on"])
+        self.async_set_updated_data(LuckyNumber.from_dict(snapshot["lucky_number"]))
+        return True
+
+    @callback
+    def _snapshot(self) -> dict[str, Any]:
+        """Build the data persisted after a fetch."""
+        return {
+            "lucky_number": self.data.as_dict(),
+            "fetched_on": self._fetched_on.isoformat(),
+        }
+
+    @callback
+    def async_start(self) -> None:
+        """Start scheduling fetches; stops when the config entry unloads."""
+        self.config_entry.async_on_unload(
+            self.session_manager.async_add_listener(self.async_refresh_if_due)
+        )
+        self.config_entry.async_on_unload(
+            async_track_time_change(
+                self.hass, self._async_day_started, hour=0, minute=0, second=30
+            )
+        )
+        self.async_refresh_if_due()
+
+    @callback
+    def _async_day_started(self, now: datetime) -> None:
+        self.async_refresh_if_due()
+
+    def is_due(self) -> bool:
+        """Return True when the lucky number should be fetched now."""
+        today = dt_util.now().date()
+        if self._fetched_on == today:
+            return False
+        return self.data is None or self.data.day is None or self.data.day < today.isoformat()
+
+    @callback
+    def async_refresh_if_due(self) -> None:
+        """Fetch in the background when due and a logged-in session exists."""
+        if self._refreshing or not self.is_due() or self.session_manager.session is None:
+            return
+        self._refreshing = True
+        self.config_entry.async_create_background_task(
+            self.hass, self._async_refresh_once(), f"{DOMAIN}_lucky_number_refresh"
+        )
+
+    async def _async_refresh_once(self) -> None:
+        try:
+            with request_priority(RequestPriority.BACKGROUND):
+                await self.async_refresh()
+        finally:
+            self._refreshing = False
+
+    async def _async_update_data(self) -> LuckyNumber:
+        """Fetch the lucky number on the existing session.
+
+        Raises UpdateFailed when there is no logged-in session any more or on
+        transient errors (preserves previous data).
+        """
+        try:
+            lucky_number = await async_fetch_lucky_number(
+                self.session_manager, allow_login=False
+            )
+        except LibrusTimeoutError as err:
+            raise UpdateFailed(f"Timeout fetching lucky number: {err}") from err
+        except (LibrusAuthError, LibrusConnectionError) as err:
+            raise UpdateFailed(f"Error fetching lucky number: {err}") from err
+        self._fetched_on = dt_util.now().date()
+        _LOGGER.debug("Librus lucky number for %s fetched", lucky_number.day)
+        self._store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
+        return lucky_number
+
+
+@dataclass(slots=True)
+class LibrusRuntimeData:
+    """Per-entry runtime objects, stored in hass.data[DOMAIN][entry_id]."""
+
+    homework: LibrusDataUpdateCoordinator
+    timetable: LibrusTimetableCoordinator
+    grades: LibrusGradesCoordinator
+    attendance: LibrusAttendanceCoordinator
+    lucky_number: LibrusLuckyNumberCoordinator
+    scheduler: LibrusRefreshScheduler
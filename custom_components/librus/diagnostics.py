@@ -0,0 +1,49 @@
+"""Diagnostics support for the Librus integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_PASSWORD, CONF_USERNAME, DOMAIN
+from .coordinator import LibrusRuntimeData
+
+TO_REDACT = {CONF_USERNAME, CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the request metrics and refresh state of a config entry.
+
+    Credentials are redacted; the fetched school data is not included.
+    """
+    runtime_data: LibrusRuntimeData = hass.data[DOMAIN][entry.entry_id]
+    session_manager = runtime_data.homework.session_manager
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "circuit_breaker": session_manager.circuit_breaker.state,
+        "rate_limiter": {
+            "active": session_manager.rate_limiter.active,
+            "waiting": session_manager.rate_limiter.waiting,
+        },
+        "homeworks_date_range": session_manager.homeworks_date_range,
+        "metrics": session_manager.metrics.as_dict(),
+        "coordinators": {
+            resource: {
+                "last_update_success": coordinator.last_update_success,
+                "last_exception": (
+                    str(coordinator.last_exception)
+                    if coordinator.last_exception is not None
+                    else None
+                ),
+            }
+            for resource, coordinator in runtime_data.scheduler.coordinators.items()
+        },
+    }
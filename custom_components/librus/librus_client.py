@@ -1,4 +1,4 @@
-"""Librus Synergia OAuth client for credential validation and homework fetching.
+"""Librus Synergia OAuth client for credential validation and data fetching.
 
 Uses the same Synergia OAuth flow as the reference JS implementation
 (https://github.com/Mati365/librus-api). No external Librus library needed.
@@ -6,19 +6,87 @@ Uses the same Synergia OAuth flow as the reference JS implementation
 
 from __future__ import annotations
 
+import asyncio
+import codecs
+import contextlib
+import hashlib
+import heapq
+import itertools
+import json
 import logging
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+)
+from contextlib import AbstractAsyncContextManager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
 from datetime import date, timedelta
-from typing import Any
+from enum import IntEnum
+from functools import partial
+from typing import Any, TypeVar
 
-import requests
+import aiohttp
+
+from .cache import LookupCache
+from .metrics import LibrusMetrics
+from .models import (
+    AttendanceRecord,
+    FreeDays,
+    GradeEntry,
+    HomeworkEntry,
+    LuckyNumber,
+    TimetableLesson,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 LIBRUS_OAUTH_URL = "https://api.librus.pl/OAuth/Authorization"
 LIBRUS_OAUTH_GRANT_URL = "https://api.librus.pl/OAuth/Authorization/Grant"
 LIBRUS_API_URL = "https://synergia.librus.pl/gateway/api/2.0"
 OAUTH_CLIENT_ID = "46"
 REQUEST_TIMEOUT = 30
+CLIENT_TIMEOUT = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+
+# Upper bound on how long an authenticated session is reused before a fresh
+# login is forced, even if Librus still reports it as alive.
+SESSION_MAX_AGE = 6 * 60 * 60
+
+# A session checked (or logged in) this recently is handed out without another
+# liveness check, so the resources refreshed in one tick share a single check.
+SESSION_VERIFIED_FOR = 60
+
+# Response bodies are read and scanned in chunks of this size
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Data responses worth retrying; other statuses fail at once
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Consecutive failed calls (after their retries) that open the circuit breaker,
+# and how long it then stays open before a probe call is let through.
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_OPEN_FOR = 5 * 60
+
+# Librus traffic of every account (see LibrusRateLimiter): sustained requests
+# per second, the burst allowed on top after a quiet spell, and the cap on
+# requests in flight at once.
+REQUEST_RATE = 5.0
+REQUEST_BURST = 10
+MAX_CONCURRENT_REQUESTS = 6
+
+LOOKUP_ENDPOINTS = ("HomeWorks/Categories", "Subjects", "Users")
+HOMEWORK_ENDPOINTS = ("HomeWorks", *LOOKUP_ENDPOINTS)
 
 HEADERS = {
     "User-Agent": (
@@ -40,156 +108,319 @@ class LibrusTimeoutError(LibrusConnectionError):
     """Raised when a request to Librus times out."""
 
 
-def _create_authenticated_session(
-    username: str, password: str
-) -> requests.Session:
-    """Create an authenticated Librus session via the five-step OAuth flow.
+class LibrusSessionExpiredError(LibrusConnectionError):
+    """Raised when Librus rejects a previously authenticated session (401/redirect)."""
 
-    Follows the Postman Auth folder sequence (librus_api.json):
-    1. GET OAuth/Authorization — initiate OAuth session
-    2. POST credentials to OAuth/Authorization — login
-    3. GET OAuth/Authorization/Grant — set session cookies via redirects
-    4. GET Auth/TokenInfo — extract UserIdentifier
-    5. GET Auth/UserInfo/{UserIdentifier} — activate API access
 
-    Returns an authenticated requests.Session on success.
-    Raises LibrusAuthError on invalid credentials.
-    Raises LibrusTimeoutError on request timeout.
-    Raises LibrusConnectionError on other network/connection issues.
-    Fresh session per call (FR-010).
+class LibrusCircuitOpenError(LibrusConnectionError):
+    """Raised without contacting Librus while the circuit breaker is open."""
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """How often and how patiently a GET request is retried.
+
+    A request is made up to attempts times. Before retry n (1-based) the
+    client sleeps a random time between 0 and min(max_delay, base_delay * 2**(n-1))
+    seconds ("full jitter"), so clients failing together do not retry in step.
+    Only transient failures are retried (see _is_transient).
     """
-    session = requests.Session()
-    session.headers.update(HEADERS)
 
-    # Step 1: OAuth Init
-    _LOGGER.debug("Librus auth step 1: initiating OAuth flow")
-    response = session.get(
-        LIBRUS_OAUTH_URL,
-        params={
-            "client_id": OAUTH_CLIENT_ID,
-            "response_type": "code",
-            "scope": "mydata",
-        },
-        timeout=REQUEST_TIMEOUT,
-    )
-    _LOGGER.debug(
-        "Librus auth step 1: HTTP %s, URL: %s",
-        response.status_code,
-        response.url,
-    )
+    attempts: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 8.0
 
-    # Step 2: OAuth Login
-    _LOGGER.debug("Librus auth step 2: submitting credentials")
-    response = session.post(
-        f"{LIBRUS_OAUTH_URL}?client_id={OAUTH_CLIENT_ID}",
-        data={
-            "action": "login",
-            "login": username,
-            "pass": password,
-        },
-        timeout=REQUEST_TIMEOUT,
-    )
-    _LOGGER.debug(
-        "Librus auth step 2: HTTP %s, URL: %s",
-        response.status_code,
-        response.url,
-    )
+    def backoff(self, retry: int) -> float:
+        """Return the delay in seconds before retry (1-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry - 1)))
 
-    body_text = response.text
-    if "error" in body_text or "Nieprawidłowy" in body_text:
-        _LOGGER.debug("Librus auth step 2: invalid credentials detected")
-        raise LibrusAuthError("Invalid login or password")
 
-    # Step 3: OAuth Grant (sets session cookies via redirects)
-    _LOGGER.debug("Librus auth step 3: OAuth Grant")
-    response = session.get(
-        LIBRUS_OAUTH_GRANT_URL,
-        params={"client_id": OAUTH_CLIENT_ID},
-        timeout=REQUEST_TIMEOUT,
-    )
-    _LOGGER.debug(
-        "Librus auth step 3: HTTP %s, URL: %s",
-        response.status_code,
-        response.url,
-    )
+DEFAULT_RETRY = RetryPolicy()
+NO_RETRY = RetryPolicy(attempts=1)
 
-    # Step 4: Get TokenInfo — extract UserIdentifier
-    _LOGGER.debug("Librus auth step 4: getting TokenInfo")
-    response = session.get(
-        f"{LIBRUS_API_URL}/Auth/TokenInfo",
-        timeout=REQUEST_TIMEOUT,
-    )
-    _LOGGER.debug(
-        "Librus auth step 4: HTTP %s",
-        response.status_code,
-    )
 
-    if not response.ok:
-        _LOGGER.debug(
-            "Librus auth step 4: TokenInfo failed with HTTP %s",
-            response.status_code,
-        )
-        raise LibrusAuthError("Failed to obtain token info")
+def _is_transient(err: BaseException | None) -> bool:
+    """Return True for failures worth retrying: timeouts, dropped or refused
+    connections and RETRY_STATUSES responses."""
+    if isinstance(
+        err, (TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)
+    ):
+        return True
+    if isinstance(err, aiohttp.ClientResponseError):
+        return err.status in RETRY_STATUSES
+    return False
 
-    try:
-        token_data = response.json()
-        user_identifier = token_data["UserIdentifier"]
-    except (ValueError, KeyError) as err:
-        _LOGGER.debug("Librus auth step 4: failed to parse UserIdentifier")
-        raise LibrusAuthError("Failed to parse UserIdentifier") from err
 
-    # Step 5: Activate API Access via UserInfo
-    _LOGGER.debug("Librus auth step 5: activating API access")
-    response = session.get(
-        f"{LIBRUS_API_URL}/Auth/UserInfo/{user_identifier}",
-        timeout=REQUEST_TIMEOUT,
-    )
-    _LOGGER.debug(
-        "Librus auth step 5: HTTP %s",
-        response.status_code,
-    )
+async def _async_with_retry(
+    request: Callable[[], Awaitable[_T]],
+    retry: RetryPolicy,
+    description: str,
+    metrics: LibrusMetrics | None = None,
+) -> _T:
+    """Run an idempotent aiohttp request, retrying transient failures per retry."""
+    for attempt in range(1, retry.attempts):
+        try:
+            return await request()
+        except Exception as err:
+            if not _is_transient(err):
+                raise
+            if metrics is not None:
+                metrics.count("retries")
+            delay = retry.backoff(attempt)
+            _LOGGER.debug(
+                "Librus %s failed (%r), retry %d in %.1f s", description, err, attempt, delay
+            )
+        await asyncio.sleep(delay)
+    return await request()
 
-    if not response.ok:
-        _LOGGER.debug(
-            "Librus auth step 5: UserInfo failed with HTTP %s",
-            response.status_code,
-        )
-        raise LibrusAuthError("Failed to activate API access")
 
-    _LOGGER.debug("Librus auth: all five steps completed successfully")
-    return session
+class _RequestTimer:
+    """Time one request (attempt) of phase into metrics, if any.
 
+    The caller fills in status, size and parse_time as the response arrives;
+    the request is recorded on exit, also when it failed.
+    """
 
-def validate_credentials(username: str, password: str) -> bool:
-    """Validate Librus credentials using the full five-step OAuth flow.
+    __slots__ = ("_metrics", "_phase", "_started", "parse_time", "size", "status")
 
-    Returns True if all five steps succeed, False on auth failure.
-    Raises LibrusTimeoutError on request timeout.
-    Raises LibrusConnectionError on other network/connection issues.
-    Does not retry on failure (FR-009). Fresh session per call (FR-010).
+    def __init__(self, metrics: LibrusMetrics | None, phase: str) -> None:
+        """Initialize the timer."""
+        self._metrics = metrics
+        self._phase = phase
+        self._started = 0.0
+        self.status: int | None = None
+        self.size = 0
+        self.parse_time = 0.0
+
+    async def __aenter__(self) -> _RequestTimer:
+        """Start timing."""
+        self._started = time.perf_counter()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Record the request."""
+        if self._metrics is not None:
+            self._metrics.record_request(
+                self._phase,
+                time.perf_counter() - self._started,
+                self.status,
+                self.size,
+                self.parse_time,
+            )
+
+
+class CircuitBreaker:
+    """Stop calling Librus for a while after repeated transient failures.
+
+    Closed: calls run; failure_threshold consecutive calls failing with a
+    transient error open the breaker. Open: calls fail at once with
+    LibrusCircuitOpenError for open_for seconds. Half-open: then a single
+    probe call is let through; if Librus answers at all the breaker closes,
+    otherwise it opens again. May be shared by several session managers.
     """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        open_for: float = CIRCUIT_OPEN_FOR,
+    ) -> None:
+        """Initialize a closed breaker."""
+        self._failure_threshold = failure_threshold
+        self._open_for = open_for
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """Return "closed", "open" or "half_open"."""
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self._open_for:
+            return "open"
+        return "half_open"
+
+    def before_call(self) -> None:
+        """Admit a call, as the probe when half-open.
+
+        Raises LibrusCircuitOpenError while open or while a probe is running.
+        """
+        if self._opened_at is None:
+            return
+        retry_in = self._opened_at + self._open_for - time.monotonic()
+        if retry_in > 0 or self._probing:
+            raise LibrusCircuitOpenError(
+                f"Librus unavailable, next attempt in {max(retry_in, 0):.0f} s"
+            )
+        _LOGGER.debug("Librus circuit half-open, sending a probe")
+        self._probing = True
+
+    def after_call(self, reached: bool | None) -> None:
+        """Record whether an admitted call reached Librus (None: no verdict)."""
+        self._probing = False
+        if reached is None:
+            return
+        if reached:
+            if self._opened_at is not None:
+                _LOGGER.info("Librus reachable again, resuming requests")
+            self._failures = 0
+            self._opened_at = None
+            return
+        self._failures += 1
+        if self._opened_at is not None or self._failures >= self._failure_threshold:
+            if self._opened_at is None:
+                _LOGGER.warning(
+                    "Librus unreachable after %d failed calls, pausing requests for %d s",
+                    self._failures,
+                    self._open_for,
+                )
+            self._opened_at = time.monotonic()
+
+
+class RequestPriority(IntEnum):
+    """Queue position of requests waiting for LibrusRateLimiter; lower goes first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+# Priority of the requests made by the current task and the tasks it starts
+_REQUEST_PRIORITY: ContextVar[RequestPriority] = ContextVar(
+    "librus_request_priority", default=RequestPriority.INTERACTIVE
+)
+
+
+@contextlib.contextmanager
+def request_priority(priority: RequestPriority) -> Iterator[None]:
+    """Make the Librus requests of the enclosed code (and the tasks it starts)
+    wait with priority; requests are INTERACTIVE unless marked otherwise."""
+    token = _REQUEST_PRIORITY.set(priority)
     try:
-        _create_authenticated_session(username, password)
+        yield
+    finally:
+        _REQUEST_PRIORITY.reset(token)
+
+
+def current_request_priority() -> RequestPriority:
+    """Return the priority requests made here would wait with."""
+    return _REQUEST_PRIORITY.get()
+
+
+class LibrusRateLimiter:
+    """Bound the rate and concurrency of requests to Librus.
+
+    A token bucket refilled at rate per second, holding up to burst tokens,
+    paces request starts; at most max_concurrent requests run at once.
+    Requests that cannot start wait in priority order (see request_priority),
+    first come first served within a priority. One limiter is meant to be
+    shared by every account and the config flow (see LibrusClientRegistry).
+    """
+
+    def __init__(
+        self,
+        rate: float = REQUEST_RATE,
+        burst: int = REQUEST_BURST,
+        max_concurrent: int = MAX_CONCURRENT_REQUESTS,
+    ) -> None:
+        """Initialize the limiter with a full bucket."""
+        self._rate = rate
+        self._burst = burst
+        self._max_concurrent = max_concurrent
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._active = 0
+        self._waiters: list[tuple[RequestPriority, int, asyncio.Future[None]]] = []
+        self._order = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+
+    @property
+    def active(self) -> int:
+        """Return the number of requests holding a slot."""
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        """Return the number of requests waiting for a slot."""
+        return sum(not future.done() for _, _, future in self._waiters)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: RequestPriority | None = None) -> AsyncIterator[None]:
+        """Hold a request slot for the enclosed request.
+
+        priority defaults to the current one (see request_priority).
+        """
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: RequestPriority | None = None) -> None:
+        """Wait until a request may start; pair with release."""
+        if not self._waiters and self._take():
+            return
+        if priority is None:
+            priority = _REQUEST_PRIORITY.get()
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as the waiter was cancelled; hand the slot on
+                self.release()
+            else:
+                self._dispatch()
+            raise
+
+    def release(self) -> None:
+        """Free the slot of a finished request."""
+        self._active -= 1
+        self._dispatch()
+
+    def _take(self) -> bool:
+        """Start a request now if a slot and a token are free."""
+        if self._active >= self._max_concurrent:
+            return False
+        now = time.monotonic()
+        elapsed = max(now - self._refilled_at, 0)
+        self._tokens = min(self._burst, self._tokens + elapsed * self._rate)
+        self._refilled_at = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        self._active += 1
         return True
-    except LibrusAuthError:
-        return False
-    except requests.exceptions.Timeout as err:
-        raise LibrusTimeoutError("Connection to Librus timed out") from err
-    except requests.exceptions.ConnectionError as err:
-        raise LibrusConnectionError("Could not connect to Librus") from err
-    except requests.exceptions.RequestException as err:
-        raise LibrusConnectionError(f"Librus request failed: {err}") from err
 
+    def _dispatch(self) -> None:
+        """Start the waiters that may run; wake up again when a token is due."""
+        while self._waiters:
+            future = self._waiters[0][2]
+            if future.done():
+                heapq.heappop(self._waiters)
+            elif self._take():
+                heapq.heappop(self._waiters)
+                future.set_result(None)
+            else:
+                break
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+        if self._waiters and self._active < self._max_concurrent:
+            # Out of tokens: retry once the next one has been refilled
+            self._wakeup = asyncio.get_running_loop().call_later(
+                (1 - self._tokens) / self._rate, self._on_wakeup
+            )
 
-def _fetch_api_data(
-    session: requests.Session, endpoint: str
-) -> dict[str, Any]:
-    """Fetch JSON data from a Librus API endpoint using an authenticated session."""
-    url = f"{LIBRUS_API_URL}/{endpoint}"
-    _LOGGER.debug("Fetching Librus API: %s", url)
-    response = session.get(url, timeout=REQUEST_TIMEOUT)
-    response.raise_for_status()
-    return response.json()
+    def _on_wakeup(self) -> None:
+        self._wakeup = None
+        self._dispatch()
+
+
+def _slot(limiter: LibrusRateLimiter | None) -> AbstractAsyncContextManager[None]:
+    """Return a slot of limiter, or a no-op without one."""
+    return limiter.slot() if limiter is not None else contextlib.nullcontext()
 
 
 def _build_category_map(categories_data: dict[str, Any]) -> dict[int, str]:
@@ -212,6 +443,15 @@ def _build_subject_map(subjects_data: dict[str, Any]) -> dict[int, str]:
     return result
 
 
+def _format_user_name(user: Mapping[str, Any]) -> str:
+    """Return 'FirstName LastName', falling back to either part or 'Unknown'."""
+    first = user.get("FirstName")
+    last = user.get("LastName")
+    if first and last:
+        return f"{first} {last}"
+    return last or first or "Unknown"
+
+
 def _build_user_map(users_data: dict[str, Any]) -> dict[int, str]:
     """Build User ID → 'FirstName LastName' lookup from GET /Users response."""
     result: dict[int, str] = {}
@@ -219,21 +459,93 @@ def _build_user_map(users_data: dict[str, Any]) -> dict[int, str]:
         user_id = user.get("Id")
         if user_id is None:
             continue
-        first = user.get("FirstName")
-        last = user.get("LastName")
-        if first and last:
-            result[user_id] = f"{first} {last}"
-        elif last:
-            result[user_id] = last
-        elif first:
-            result[user_id] = first
-        else:
-            result[user_id] = "Unknown"
+        result[user_id] = _format_user_name(user)
+    return result
+
+
+def _build_grade_category_map(categories_data: dict[str, Any]) -> dict[int, dict[str, Any]]:
+    """Build Category ID → {name, weight} lookup from GET /Grades/Categories response."""
+    result: dict[int, dict[str, Any]] = {}
+    for cat in categories_data.get("Categories", []):
+        cat_id = cat.get("Id")
+        if cat_id is not None:
+            result[cat_id] = {
+                "name": cat.get("Name", "Unknown"),
+                "weight": cat.get("Weight"),
+            }
+    return result
+
+
+def _build_grade_comment_map(comments_data: dict[str, Any]) -> dict[int, str]:
+    """Build Comment ID → Text lookup from GET /Grades/Comments response."""
+    result: dict[int, str] = {}
+    for comment in comments_data.get("Comments", []):
+        comment_id = comment.get("Id")
+        if comment_id is not None:
+            result[comment_id] = comment.get("Text") or ""
+    return result
+
+
+def _build_lesson_subject_map(lessons_data: dict[str, Any]) -> dict[int, int]:
+    """Build Lesson ID → Subject ID lookup from GET /Lessons response."""
+    result: dict[int, int] = {}
+    for lesson in lessons_data.get("Lessons", []):
+        lesson_id = lesson.get("Id")
+        subject = lesson.get("Subject")
+        if lesson_id is not None and isinstance(subject, dict) and subject.get("Id") is not None:
+            result[lesson_id] = subject["Id"]
     return result
 
 
+# Librus standard attendance types (custom types name one in StandardType)
+# mapped to the AttendanceCounts field they are counted in
+_STANDARD_ATTENDANCE_KINDS = {
+    1: "absent",
+    2: "late",
+    3: "excused",
+    4: "released",
+    100: "present",
+}
+
+
+def _attendance_kind(attendance_type: Mapping[str, Any]) -> str:
+    """Return the AttendanceCounts field an attendance type is counted in."""
+    standard_id = attendance_type.get("Id")
+    if not attendance_type.get("Standard"):
+        standard_ref = attendance_type.get("StandardType")
+        standard_id = standard_ref.get("Id") if isinstance(standard_ref, dict) else None
+    if (kind := _STANDARD_ATTENDANCE_KINDS.get(standard_id)) is not None:
+        return kind
+    return "present" if attendance_type.get("IsPresenceKind") else "other"
+
+
+def _build_attendance_type_map(types_data: dict[str, Any]) -> dict[int, dict[str, str]]:
+    """Build Type ID → {name, kind} lookup from GET /Attendances/Types response."""
+    result: dict[int, dict[str, str]] = {}
+    for attendance_type in types_data.get("Types", []):
+        type_id = attendance_type.get("Id")
+        if type_id is not None:
+            result[type_id] = {
+                "name": attendance_type.get("Name", "Unknown"),
+                "kind": _attendance_kind(attendance_type),
+            }
+    return result
+
+
+# Builders for the slow-changing lookup resources, keyed by API endpoint
+_LOOKUP_BUILDERS: dict[str, Callable[[dict[str, Any]], dict[int, Any]]] = {
+    "HomeWorks/Categories": _build_category_map,
+    "Subjects": _build_subject_map,
+    "Users": _build_user_map,
+    "Grades/Categories": _build_grade_category_map,
+    "Grades/Comments": _build_grade_comment_map,
+    "Lessons": _build_lesson_subject_map,
+    "Attendances/Types": _build_attendance_type_map,
+}
+
+
 def _filter_by_date(
-    homeworks: list[dict[str, Any]],
+    homeworks: Iterable[dict[str, Any]],
     past_days: int = 7,
     future_days: int = 14,
 ) -> list[dict[str, Any]]:
@@ -261,8 +573,8 @@ def _resolve_homework_entry(
     category_map: dict[int, str],
     subject_map: dict[int, str],
     user_map: dict[int, str],
-) -> dict[str, Any]:
-    """Transform a raw HomeWorks API entry into a resolved HomeworkEntry dict."""
+) -> HomeworkEntry:
+    """Transform a raw HomeWorks API entry into a resolved HomeworkEntry."""
     # Resolve Category
     category_ref = hw.get("Category")
     category_id = category_ref.get("Id") if isinstance(category_ref, dict) else None
@@ -278,88 +590,1331 @@ def _resolve_homework_entry(
     creator_id = creator_ref.get("Id") if isinstance(creator_ref, dict) else None
     creator_name = user_map.get(creator_id, "Unknown") if creator_id else "Unknown"
 
-    entry: dict[str, Any] = {
-        "id": hw.get("Id"),
-        "date": hw.get("Date"),
-        "subject": subject_name,
-        "creator": creator_name,
-        "category": category_name,
-    }
+    lesson_no = hw.get("LessonNo")
+    return HomeworkEntry(
+        id=hw.get("Id"),
+        date=sys.intern(hw.get("Date")),
+        subject=sys.intern(subject_name),
+        creator=sys.intern(creator_name),
+        category=sys.intern(category_name),
+        # Optional fields — None when not available
+        lesson_no=str(lesson_no) if lesson_no is not None else None,
+        time_from=hw.get("TimeFrom"),
+        time_to=hw.get("TimeTo"),
+        content=hw.get("Content"),
+        add_date=hw.get("AddDate"),
+    )
+
+
+def _build_homework_entries(
+    raw_homeworks: Iterable[dict[str, Any]],
+    lookup_maps: Mapping[str, dict[int, str]],
+    past_days: int,
+    future_days: int,
+) -> list[HomeworkEntry]:
+    """Resolve and date-filter raw HomeWorks entries using LOOKUP_ENDPOINTS maps.
+
+    raw_homeworks may be a lazy iterator (see _JsonArrayItems); it is consumed once.
+    """
+    category_map = lookup_maps["HomeWorks/Categories"]
+    subject_map = lookup_maps["Subjects"]
+    user_map = lookup_maps["Users"]
+
+    # Filter by date window (FR-005a)
+    filtered = _filter_by_date(raw_homeworks, past_days, future_days)
+
+    # Resolve IDs and build structured entries
+    entries = [
+        _resolve_homework_entry(hw, category_map, subject_map, user_map)
+        for hw in filtered
+    ]
+
+    _LOGGER.debug("Fetched %d homework entries in date window", len(entries))
+    return entries
+
+
+class _JsonDocument:
+    """Collect a response body and parse it as a single JSON document."""
+
+    def __init__(self) -> None:
+        """Initialize an empty body buffer."""
+        self._chunks: list[bytes] = []
+
+    def feed(self, chunk: bytes) -> None:
+        """Append a chunk of the response body."""
+        self._chunks.append(chunk)
+
+    def result(self) -> Any:
+        """Return the parsed document."""
+        return json.loads(b"".join(self._chunks))
+
+
+_JSON_SCAN_RE = re.compile(r'[{}\[\]"\\]')
+
+
+class _JsonArrayItems:
+    """Incrementally extract the elements of one top-level JSON array.
+
+    Response chunks are scanned as they arrive, tracking only nesting depth and
+    string boundaries; the buffer never holds more than the element being read.
+    Completed elements are kept as raw text (and only when keep() accepts it),
+    so neither the whole body nor a full dict tree is materialized. result()
+    returns a payload shaped like the original document, {key: iterator}, with
+    elements parsed lazily as the consumer iterates.
+    """
+
+    def __init__(self, key: str, keep: Callable[[str], bool] | None = None) -> None:
+        """Initialize the scanner for the array stored under key."""
+        self._key = key
+        self._keep = keep
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._string_start = -1
+        self._last_key: str | None = None
+        self._in_array = False
+        self._item_start = -1
+        self._done = False
+        self._items: list[str] = []
+
+    def feed(self, chunk: bytes) -> None:
+        """Scan the next chunk of the response body."""
+        if self._done:
+            return
+        self._buffer += self._decoder.decode(chunk)
+        self._scan()
+
+    def _scan(self) -> None:
+        buffer = self._buffer
+        pos = self._pos
+        while True:
+            if self._escaped:
+                if pos >= len(buffer):
+                    break
+                pos += 1
+                self._escaped = False
+            match = _JSON_SCAN_RE.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            char = match.group()
+            index = match.start()
+            pos = index + 1
+            if self._in_string:
+                if char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_key = buffer[self._string_start + 1 : index]
+            elif char == '"':
+                self._in_string = True
+                self._string_start = index
+            elif char in "{[":
+                if self._in_array and self._depth == 2 and char == "{":
+                    self._item_start = index
+                elif char == "[" and self._depth == 1 and self._last_key == self._key:
+                    self._in_array = True
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._in_array and self._depth == 2 and char == "}":
+                    raw = buffer[self._item_start : pos]
+                    if self._keep is None or self._keep(raw):
+                        self._items.append(raw)
+                    self._item_start = -1
+                elif self._in_array and self._depth == 1:
+                    self._done = True
+                    self._buffer = ""
+                    return
+
+        # Drop everything that is no longer needed
+        if self._item_start >= 0:
+            keep_from = self._item_start
+        elif self._in_string and self._depth == 1:
+            keep_from = self._string_start
+        else:
+            keep_from = pos
+        self._buffer = buffer[keep_from:]
+        self._pos = pos - keep_from
+        self._item_start -= keep_from if self._item_start >= 0 else 0
+        self._string_start -= keep_from
+
+    def result(self) -> dict[str, Iterator[dict[str, Any]]]:
+        """Return {key: lazily parsed elements}.
+
+        Raises ValueError when the body ended inside the document.
+        """
+        self._decoder.decode(b"", final=True)
+        if not self._done and (self._depth or self._in_string):
+            raise ValueError(f"Truncated JSON document while reading {self._key}")
+        return {self._key: (json.loads(raw) for raw in self._items)}
+
+
+# Collections streamed element by element instead of parsed as one document
+STREAMED_COLLECTIONS: dict[str, str] = {
+    "HomeWorks": "HomeWorks",
+    "Users": "Users",
+    "Grades": "Grades",
+    "Grades/Comments": "Comments",
+    "Attendances": "Attendances",
+}
+
+
+def _body_collector(endpoint: str) -> _JsonDocument | _JsonArrayItems:
+    """Return the response body collector for endpoint."""
+    if (key := STREAMED_COLLECTIONS.get(endpoint)) is not None:
+        return _JsonArrayItems(key)
+    return _JsonDocument()
+
+
+_HOMEWORK_DATE_RE = re.compile(r'"Date"\s*:\s*"(\d{4}-\d{2}-\d{2})"')
+
+
+def _homework_date_filter(date_from: date, date_to: date) -> Callable[[str], bool]:
+    """Return a keep() predicate accepting raw HomeWorks elements dated in the window.
+
+    Entries are checked on their raw text, so out-of-window history is never
+    parsed; exact validation still happens in _filter_by_date.
+    """
+    low = date_from.isoformat()
+    high = date_to.isoformat()
+
+    def keep(raw: str) -> bool:
+        match = _HOMEWORK_DATE_RE.search(raw)
+        return match is not None and low <= match.group(1) <= high
+
+    return keep
+
+
+async def _async_create_authenticated_session(
+    session: aiohttp.ClientSession,
+    username: str,
+    password: str,
+    retry: RetryPolicy = DEFAULT_RETRY,
+    metrics: LibrusMetrics | None = None,
+    limiter: LibrusRateLimiter | None = None,
+) -> aiohttp.ClientSession:
+    """Authenticate an aiohttp session via the five-step OAuth flow.
+
+    Async variant of _create_authenticated_session. The caller owns the session,
+    which must have a dedicated cookie jar since the Librus session lives in
+    cookies. Returns the same session once all five steps succeed.
+    The GET steps are retried on timeouts and connection errors per retry;
+    the credentials POST is never repeated. Each step is timed into metrics
+    and, with limiter, waits for a request slot.
+    Raises LibrusAuthError on invalid credentials.
+    Raises aiohttp/timeout exceptions on network issues (mapped by callers).
+    """
+
+    async def get(step: int, url: str, *, read: bool = False, **kwargs: Any) -> tuple[int, str]:
+        """GET an auth step; returns the status and, with read, the body."""
+
+        async def request() -> tuple[int, str]:
+            async with (
+                _slot(limiter),
+                _RequestTimer(metrics, f"auth step {step}") as timing,
+                session.get(
+                    url, headers=HEADERS, timeout=CLIENT_TIMEOUT, **kwargs
+                ) as response,
+            ):
+                timing.status = response.status
+                _LOGGER.debug(
+                    "Librus auth step %d: HTTP %s, URL: %s",
+                    step,
+                    response.status,
+                    response.url,
+                )
+                return response.status, await response.text() if read else ""
+
+        return await _async_with_retry(request, retry, f"auth step {step}", metrics)
+
+    # Step 1: OAuth Init
+    _LOGGER.debug("Librus auth step 1: initiating OAuth flow")
+    await get(
+        1,
+        LIBRUS_OAUTH_URL,
+        params={
+            "client_id": OAUTH_CLIENT_ID,
+            "response_type": "code",
+            "scope": "mydata",
+        },
+    )
+
+    # Step 2: OAuth Login
+    _LOGGER.debug("Librus auth step 2: submitting credentials")
+    async with (
+        _slot(limiter),
+        _RequestTimer(metrics, "auth step 2") as timing,
+        session.post(
+            f"{LIBRUS_OAUTH_URL}?client_id={OAUTH_CLIENT_ID}",
+            data={
+                "action": "login",
+                "login": username,
+                "pass": password,
+            },
+            headers=HEADERS,
+            timeout=CLIENT_TIMEOUT,
+        ) as response,
+    ):
+        timing.status = response.status
+        _LOGGER.debug(
+            "Librus auth step 2: HTTP %s, URL: %s", response.status, response.url
+        )
+        body_text = await response.text()
+
+    if "error" in body_text or "Nieprawidłowy" in body_text:
+        _LOGGER.debug("Librus auth step 2: invalid credentials detected")
+        raise LibrusAuthError("Invalid login or password")
+
+    # Step 3: OAuth Grant (sets session cookies via redirects)
+    _LOGGER.debug("Librus auth step 3: OAuth Grant")
+    await get(3, LIBRUS_OAUTH_GRANT_URL, params={"client_id": OAUTH_CLIENT_ID})
+
+    # Step 4: Get TokenInfo — extract UserIdentifier
+    _LOGGER.debug("Librus auth step 4: getting TokenInfo")
+    status, body_text = await get(4, f"{LIBRUS_API_URL}/Auth/TokenInfo", read=True)
+    if status >= 400:
+        _LOGGER.debug("Librus auth step 4: TokenInfo failed with HTTP %s", status)
+        raise LibrusAuthError("Failed to obtain token info")
+    try:
+        user_identifier = json.loads(body_text)["UserIdentifier"]
+    except (ValueError, KeyError, TypeError) as err:
+        _LOGGER.debug("Librus auth step 4: failed to parse UserIdentifier")
+        raise LibrusAuthError("Failed to parse UserIdentifier") from err
 
-    # Optional fields — include when present
-    if hw.get("LessonNo") is not None:
-        entry["lesson_no"] = str(hw["LessonNo"])
-    if hw.get("TimeFrom") is not None:
-        entry["time_from"] = hw["TimeFrom"]
-    if hw.get("TimeTo") is not None:
-        entry["time_to"] = hw["TimeTo"]
-    if hw.get("Content") is not None:
-        entry["content"] = hw["Content"]
-    if hw.get("AddDate") is not None:
-        entry["add_date"] = hw["AddDate"]
+    # Step 5: Activate API Access via UserInfo
+    _LOGGER.debug("Librus auth step 5: activating API access")
+    status, _ = await get(5, f"{LIBRUS_API_URL}/Auth/UserInfo/{user_identifier}")
+    if status >= 400:
+        _LOGGER.debug("Librus auth step 5: UserInfo failed with HTTP %s", status)
+        raise LibrusAuthError("Failed to activate API access")
 
-    return entry
+    _LOGGER.debug("Librus auth: all five steps completed successfully")
+    return session
 
 
-def fetch_homework_data(
+async def async_validate_credentials(
+    session: aiohttp.ClientSession,
     username: str,
     password: str,
+    rate_limiter: LibrusRateLimiter | None = None,
+) -> bool:
+    """Validate Librus credentials on an aiohttp session (async validate_credentials).
+
+    Returns True if all five steps succeed, False on auth failure.
+    Raises LibrusTimeoutError on request timeout.
+    Raises LibrusConnectionError on other network/connection issues.
+    Transient failures of the GET steps are retried per DEFAULT_RETRY; with
+    rate_limiter, each step waits for a request slot.
+    """
+    try:
+        await _async_create_authenticated_session(
+            session, username, password, limiter=rate_limiter
+        )
+        return True
+    except LibrusAuthError:
+        return False
+    except TimeoutError as err:
+        raise LibrusTimeoutError("Connection to Librus timed out") from err
+    except aiohttp.ClientError as err:
+        raise LibrusConnectionError(f"Could not connect to Librus: {err}") from err
+
+
+class AsyncLibrusSessionManager:
+    """Keep an authenticated aiohttp session alive between refreshes.
+
+    The aiohttp session (with its dedicated cookie jar) is owned by the
+    caller and lives for the whole config entry; re-login only clears its
+    cookies and re-runs the OAuth flow.
+    With login_limiter, the OAuth flow only runs while holding the semaphore,
+    which may be shared to cap concurrent logins across accounts. Calls made
+    through the manager (see _async_call) pass circuit_breaker, by default
+    one of its own, and are timed into metrics. Every request waits for a
+    slot of rate_limiter, likewise its own unless one is shared.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        username: str,
+        password: str,
+        max_age: float = SESSION_MAX_AGE,
+        login_limiter: asyncio.Semaphore | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        rate_limiter: LibrusRateLimiter | None = None,
+    ) -> None:
+        """Initialize the session manager."""
+        self._session = session
+        self._username = username
+        self._password = password
+        self._max_age = max_age
+        self._login_limiter = login_limiter
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.rate_limiter = rate_limiter or LibrusRateLimiter()
+        self.metrics = LibrusMetrics()
+        self._authenticated_at: float | None = None
+        # When the login was last made or confirmed alive
+        self._verified_at = 0.0
+        self._lock = asyncio.Lock()
+        # Whether HomeWorks honours dateFrom/dateTo (None until first tried)
+        self.homeworks_date_range: bool | None = None
+        # Per-endpoint validators; data-level state, kept across re-logins
+        self.response_validators: defaultdict[str, ResponseValidators] = defaultdict(
+            ResponseValidators
+        )
+        self._listeners: list[Callable[[], None]] = []
+
+    @property
+    def session(self) -> aiohttp.ClientSession | None:
+        """Return the session while its login is recent, else None.
+
+        Neither checks the session with Librus nor logs in; for fetches that
+        should only piggyback on a login made for other data.
+        """
+        if (
+            self._authenticated_at is None
+            or time.monotonic() - self._authenticated_at > self._max_age
+        ):
+            return None
+        return self._session
+
+    def async_add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call listener each time async_get_session hands out a session.
+
+        Returns a function that removes the listener.
+        """
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    async def async_get_session(self) -> aiohttp.ClientSession:
+        """Return the authenticated session, logging in only when needed.
+
+        Listeners are notified once the session is available.
+        Raises LibrusAuthError on invalid credentials.
+        Raises aiohttp/timeout exceptions on network issues (mapped by callers).
+        """
+        async with self._lock:
+            session = await self._async_ensure_session()
+        for listener in list(self._listeners):
+            listener()
+        return session
+
+    async def _async_ensure_session(self) -> aiohttp.ClientSession:
+        if self._authenticated_at is not None:
+            now = time.monotonic()
+            if now - self._authenticated_at > self._max_age:
+                _LOGGER.debug("Librus session expired, logging in again")
+            elif now - self._verified_at < SESSION_VERIFIED_FOR:
+                # Checked moments ago, e.g. by another resource in this tick
+                return self._session
+            elif await _async_is_session_alive(
+                self._session, self.metrics, self.rate_limiter
+            ):
+                _LOGGER.debug("Reusing authenticated Librus session")
+                self._verified_at = time.monotonic()
+                return self._session
+            else:
+                _LOGGER.debug("Librus session no longer valid, logging in again")
+            self.invalidate()
+
+        if self._login_limiter is None:
+            await self._async_login()
+        else:
+            async with self._login_limiter:
+                await self._async_login()
+        self._authenticated_at = self._verified_at = time.monotonic()
+        return self._session
+
+    async def _async_login(self) -> None:
+        async with _RequestTimer(self.metrics, "login"):
+            await _async_create_authenticated_session(
+                self._session,
+                self._username,
+                self._password,
+                metrics=self.metrics,
+                limiter=self.rate_limiter,
+            )
+        self.metrics.count("logins")
+
+    def invalidate(self) -> None:
+        """Forget the current login so the next call performs the full OAuth flow."""
+        self._authenticated_at = None
+        self._session.cookie_jar.clear()
+
+
+async def _async_is_session_alive(
+    session: aiohttp.ClientSession,
+    metrics: LibrusMetrics | None = None,
+    limiter: LibrusRateLimiter | None = None,
+) -> bool:
+    """Cheaply check whether an aiohttp session is still authenticated."""
+
+    async def request() -> bool:
+        async with (
+            _slot(limiter),
+            _RequestTimer(metrics, "session check") as timing,
+            session.get(
+                f"{LIBRUS_API_URL}/Auth/TokenInfo",
+                headers=HEADERS,
+                timeout=CLIENT_TIMEOUT,
+                allow_redirects=False,
+            ) as response,
+        ):
+            timing.status = response.status
+            _LOGGER.debug("Librus session liveness check: HTTP %s", response.status)
+            return response.status == 200
+
+    return await _async_with_retry(request, DEFAULT_RETRY, "session check", metrics)
+
+
+@dataclass(slots=True)
+class ResponseValidators:
+    """Validators remembered from the last response of one endpoint.
+
+    Used for conditional requests (ETag/Last-Modified) and, when Librus sends
+    neither, to detect an unchanged payload by hashing the raw body.
+    """
+
+    etag: str | None = None
+    last_modified: str | None = None
+    digest: str | None = None
+
+
+@contextlib.contextmanager
+def _restore_on_failure(validators: ResponseValidators) -> Iterator[None]:
+    """Put validators back as they were when the enclosed fetch fails.
+
+    A response's validators are only kept once its payload has been resolved;
+    otherwise the next if_changed call would skip a body that was never
+    processed (e.g. when a lookup download failed after it was read).
+    """
+    saved = replace(validators)
+    try:
+        yield
+    except BaseException:
+        validators.etag = saved.etag
+        validators.last_modified = saved.last_modified
+        validators.digest = saved.digest
+        raise
+
+
+async def _async_fetch_api_data(
+    session: aiohttp.ClientSession,
+    endpoint: str,
+    validators: ResponseValidators | None = None,
+    *,
+    if_changed: bool = False,
+    params: Mapping[str, str] | None = None,
+    collector: Callable[[], _JsonDocument | _JsonArrayItems] | None = None,
+    retry: RetryPolicy = DEFAULT_RETRY,
+    metrics: LibrusMetrics | None = None,
+    limiter: LibrusRateLimiter | None = None,
+) -> Any:
+    """Fetch JSON data from a Librus API endpoint using an authenticated aiohttp session.
+
+    The body is streamed chunk by chunk into a collector made by collector
+    (by default chosen per endpoint, see STREAMED_COLLECTIONS) and hashed on
+    the way. Transient failures (see _is_transient) are retried per retry,
+    each attempt with a fresh collector. Each attempt waits for a slot of
+    limiter, if any, and is timed into metrics as phase endpoint, with the
+    time spent parsing.
+    When validators are given they are updated from the response. With
+    if_changed, If-None-Match/If-Modified-Since are sent and None is returned
+    (before any element is parsed) on 304 or when the body hash is unchanged.
+    Raises LibrusSessionExpiredError when Librus answers 401 or redirects to login.
+    """
+    url = f"{LIBRUS_API_URL}/{endpoint}"
+    headers = HEADERS
+    if if_changed and validators is not None:
+        headers = {**HEADERS}
+        if validators.etag:
+            headers["If-None-Match"] = validators.etag
+        if validators.last_modified:
+            headers["If-Modified-Since"] = validators.last_modified
+
+    async def fetch() -> tuple[aiohttp.ClientResponse, Any, str] | None:
+        """Return the response, its filled collector and body hash (None on 304)."""
+        body = collector() if collector is not None else _body_collector(endpoint)
+        _LOGGER.debug("Fetching Librus API: %s", url)
+        async with (
+            _slot(limiter),
+            _RequestTimer(metrics, endpoint) as timing,
+            session.get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=CLIENT_TIMEOUT,
+                allow_redirects=False,
+            ) as response,
+        ):
+            timing.status = response.status
+            if response.status == 304 and if_changed:
+                _LOGGER.debug("Librus API %s: not modified", endpoint)
+                return None
+            if response.status == 401 or 300 <= response.status < 400:
+                raise LibrusSessionExpiredError(
+                    f"Librus rejected session for {endpoint} (HTTP {response.status})"
+                )
+            response.raise_for_status()
+            hasher = hashlib.blake2b(digest_size=16)
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                timing.size += len(chunk)
+                hasher.update(chunk)
+                parse_started = time.perf_counter()
+                body.feed(chunk)
+                timing.parse_time += time.perf_counter() - parse_started
+        return response, body, hasher.hexdigest()
+
+    def result(body: _JsonDocument | _JsonArrayItems) -> Any:
+        parse_started = time.perf_counter()
+        payload = body.result()
+        if metrics is not None:
+            metrics.add_parse_time(endpoint, time.perf_counter() - parse_started)
+        return payload
+
+    fetched = await _async_with_retry(fetch, retry, endpoint, metrics)
+    if fetched is None:
+        return None
+    response, body, digest = fetched
+    if validators is None:
+        return result(body)
+
+    unchanged = if_changed and digest == validators.digest
+    validators.etag = response.headers.get("ETag")
+    validators.last_modified = response.headers.get("Last-Modified")
+    validators.digest = digest
+    if unchanged:
+        _LOGGER.debug("Librus API %s: payload unchanged (hash match)", endpoint)
+        return None
+    return result(body)
+
+
+async def _async_fetch_many(
+    session: aiohttp.ClientSession,
+    endpoints: Iterable[str],
+    validators: defaultdict[str, ResponseValidators] | None = None,
+    *,
+    if_changed: bool = False,
+    retry: RetryPolicy = DEFAULT_RETRY,
+    metrics: LibrusMetrics | None = None,
+    limiter: LibrusRateLimiter | None = None,
+) -> dict[str, dict[str, Any] | None]:
+    """Fetch independent API endpoints concurrently on the event loop.
+
+    Validators are looked up per endpoint; see _async_fetch_api_data for the
+    meaning of if_changed, retry, metrics, limiter and None results.
+    The first failure (in endpoint order) is re-raised once all calls finish.
+    """
+    endpoints = list(endpoints)
+    results = await asyncio.gather(
+        *(
+            _async_fetch_api_data(
+                session,
+                endpoint,
+                validators[endpoint] if validators is not None else None,
+                if_changed=if_changed,
+                retry=retry,
+                metrics=metrics,
+                limiter=limiter,
+            )
+            for endpoint in endpoints
+        ),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return dict(zip(endpoints, results))
+
+
+async def _async_fetch_homeworks(
+    session: aiohttp.ClientSession,
+    session_manager: AsyncLibrusSessionManager,
+    date_from: date,
+    date_to: date,
+    if_changed: bool,
+) -> Iterator[dict[str, Any]] | None:
+    """Fetch the raw HomeWorks entries dated within [date_from, date_to].
+
+    Asks Librus for the window via dateFrom/dateTo (as documented for
+    Timetables/OtherActivitiesRegister). If the endpoint rejects the range
+    parameters the manager remembers it and plain requests are used from then
+    on; either way out-of-window entries are dropped while streaming, before
+    they are parsed.
+    Returns None when unchanged (see _async_fetch_api_data).
+    """
+    keep = _homework_date_filter(date_from, date_to)
+    validators = session_manager.response_validators["HomeWorks"]
+
+    async def fetch(
+        params: Mapping[str, str] | None,
+    ) -> Iterator[dict[str, Any]] | None:
+        payload = await _async_fetch_api_data(
+            session,
+            "HomeWorks",
+            validators,
+            if_changed=if_changed,
+            params=params,
+            collector=partial(_JsonArrayItems, "HomeWorks", keep),
+            metrics=session_manager.metrics,
+            limiter=session_manager.rate_limiter,
+        )
+        return None if payload is None else payload["HomeWorks"]
+
+    if session_manager.homeworks_date_range is False:
+        return await fetch(None)
+
+    try:
+        result = await fetch(
+            {"dateFrom": date_from.isoformat(), "dateTo": date_to.isoformat()}
+        )
+    except aiohttp.ClientResponseError as err:
+        if err.status not in (400, 404, 422):
+            raise
+        _LOGGER.debug(
+            "Librus HomeWorks rejected date range (HTTP %s), using full collection",
+            err.status,
+        )
+        session_manager.homeworks_date_range = False
+        return await fetch(None)
+    session_manager.homeworks_date_range = True
+    return result
+
+
+async def _async_fetch_homework_payloads(
+    session: aiohttp.ClientSession,
+    session_manager: AsyncLibrusSessionManager,
+    lookup_endpoints: list[str],
+    date_from: date,
+    date_to: date,
+    if_changed: bool,
+) -> tuple[Iterator[dict[str, Any]] | None, dict[str, Any]]:
+    """Fetch windowed HomeWorks and the missing lookup payloads concurrently."""
+    homeworks, payloads = await asyncio.gather(
+        _async_fetch_homeworks(
+            session, session_manager, date_from, date_to, if_changed
+        ),
+        _async_fetch_many(
+            session,
+            lookup_endpoints,
+            metrics=session_manager.metrics,
+            limiter=session_manager.rate_limiter,
+        ),
+        return_exceptions=True,
+    )
+    for result in (homeworks, payloads):
+        if isinstance(result, BaseException):
+            raise result
+    return homeworks, payloads
+
+
+async def async_fetch_homework_data(
+    session_manager: AsyncLibrusSessionManager,
     past_days: int = 7,
     future_days: int = 14,
-) -> list[dict[str, Any]]:
-    """Authenticate and fetch homework data from Librus API.
+    cache: LookupCache | None = None,
+    if_changed: bool = False,
+) -> list[HomeworkEntry] | None:
+    """Fetch homework data over the managed aiohttp session (async fetch_homework_data).
+
+    Reuses the authenticated session when it is still alive; a session rejected
+    by Librus is invalidated and the data calls are repeated once after a fresh
+    login. Lookup maps still valid in cache are not downloaded again, so a
+    typical refresh only fetches HomeWorks; the remaining calls overlap on the
+    event loop. HomeWorks is requested for the date window only and entries
+    outside it are dropped before being parsed.
 
-    Performs the full five-step OAuth flow to create an authenticated session,
-    then bulk-fetches HomeWorks, Categories, Subjects, and Users (4 API calls).
-    Resolves IDs and filters by date window.
+    With if_changed and every lookup map served from cache, HomeWorks is
+    requested conditionally and None is returned when it has not changed since
+    the previous call, skipping parsing and resolution entirely.
 
-    Returns a list of HomeworkEntry dicts per data-model.md.
+    Returns a list of HomeworkEntry per data-model.md, or None (see above).
     Raises LibrusAuthError on invalid credentials.
     Raises LibrusTimeoutError on request timeout.
     Raises LibrusConnectionError on network/connection issues.
-    Does not retry on failure (FR-009). Fresh session per call (FR-010).
+    Transient failures of each GET are retried per DEFAULT_RETRY.
     """
-    try:
-        session = _create_authenticated_session(username, password)
-
-        # Bulk fetch all required data (4 API calls per research.md)
-        _LOGGER.debug("Fetching homework data from Librus API")
-        homeworks_data = _fetch_api_data(session, "HomeWorks")
-        categories_data = _fetch_api_data(session, "HomeWorks/Categories")
-        subjects_data = _fetch_api_data(session, "Subjects")
-        users_data = _fetch_api_data(session, "Users")
-
-        # Build lookup maps
-        category_map = _build_category_map(categories_data)
-        subject_map = _build_subject_map(subjects_data)
-        user_map = _build_user_map(users_data)
-
-        # Filter by date window (FR-005a)
-        raw_homeworks = homeworks_data.get("HomeWorks", [])
-        filtered = _filter_by_date(raw_homeworks, past_days, future_days)
-
-        # Resolve IDs and build structured entries
-        entries = [
-            _resolve_homework_entry(hw, category_map, subject_map, user_map)
-            for hw in filtered
-        ]
+    lookup_maps: dict[str, dict[int, str]] = {}
+    if cache is not None:
+        for endpoint in LOOKUP_ENDPOINTS:
+            if (cached := cache.get(endpoint)) is not None:
+                lookup_maps[endpoint] = cached
+    lookup_endpoints = [
+        endpoint for endpoint in LOOKUP_ENDPOINTS if endpoint not in lookup_maps
+    ]
+    session_manager.metrics.count("cache_hits", len(lookup_maps))
+    session_manager.metrics.count("cache_misses", len(lookup_endpoints))
+    # Freshly downloaded lookups may resolve differently, so only a refresh
+    # that needs nothing but HomeWorks can be skipped as unchanged.
+    if_changed = if_changed and not lookup_endpoints
+    today = date.today()
+    date_from = today - timedelta(days=past_days)
+    date_to = today + timedelta(days=future_days)
+    validators = session_manager.response_validators["HomeWorks"]
 
+    async def resolve(session: aiohttp.ClientSession) -> list[HomeworkEntry] | None:
         _LOGGER.debug(
-            "Fetched %d homework entries (%d total, %d after date filter)",
-            len(entries),
-            len(raw_homeworks),
-            len(filtered),
+            "Fetching homework data from Librus API: HomeWorks %s..%s, %s",
+            date_from,
+            date_to,
+            lookup_endpoints,
         )
-        return entries
+        homeworks, payloads = await _async_fetch_homework_payloads(
+            session, session_manager, lookup_endpoints, date_from, date_to, if_changed
+        )
+        if homeworks is None:
+            return None
+        for endpoint in lookup_endpoints:
+            lookup_maps[endpoint] = _LOOKUP_BUILDERS[endpoint](payloads[endpoint])
+            if cache is not None:
+                cache.set(endpoint, lookup_maps[endpoint])
+        return _build_homework_entries(homeworks, lookup_maps, past_days, future_days)
 
-    except (LibrusAuthError, LibrusTimeoutError, LibrusConnectionError):
+    async def fetch(session: aiohttp.ClientSession) -> list[HomeworkEntry] | None:
+        with _restore_on_failure(validators):
+            return await resolve(session)
+
+    return await _async_call(session_manager, fetch, "homework")
+
+
+async def _async_call(
+    session_manager: AsyncLibrusSessionManager,
+    operation: Callable[[aiohttp.ClientSession], Awaitable[_T]],
+    description: str,
+    *,
+    allow_login: bool = True,
+) -> _T:
+    """Run operation on the managed session, logging in again once if rejected.
+
+    A session rejected by Librus is invalidated and operation is repeated once
+    after a fresh login. Without allow_login, operation only runs on a session
+    that is already logged in (see AsyncLibrusSessionManager.session) and is
+    never retried. Transport and parsing errors are mapped to the Librus*
+    exceptions. The call is admitted by the manager's circuit breaker, which
+    counts it as failed when it ends in a transient error (see _is_transient),
+    and its duration and outcome are recorded in the manager's metrics under
+    description.
+    Raises LibrusAuthError on invalid credentials.
+    Raises LibrusSessionExpiredError without allow_login when there is no
+    logged-in session or Librus rejects it.
+    Raises LibrusCircuitOpenError while the circuit breaker is open.
+    Raises LibrusTimeoutError on request timeout.
+    Raises LibrusConnectionError on network/connection issues.
+    """
+    breaker = session_manager.circuit_breaker
+    metrics = session_manager.metrics
+    try:
+        breaker.before_call()
+    except LibrusCircuitOpenError:
+        metrics.count("rejected")
+        raise
+    started = time.perf_counter()
+    try:
+        result = await _async_call_once(
+            session_manager, operation, description, allow_login=allow_login
+        )
+    except (LibrusAuthError, LibrusConnectionError) as err:
+        breaker.after_call(not _is_transient(err.__cause__))
+        metrics.count("failures")
+        metrics.record_call(description, time.perf_counter() - started, False)
+        raise
+    except BaseException:
+        breaker.after_call(None)
         raise
-    except requests.exceptions.Timeout as err:
-        _LOGGER.debug("Librus homework fetch: timeout - %s", err)
+    breaker.after_call(True)
+    metrics.record_call(description, time.perf_counter() - started, True)
+    return result
+
+
+async def _async_call_once(
+    session_manager: AsyncLibrusSessionManager,
+    operation: Callable[[aiohttp.ClientSession], Awaitable[_T]],
+    description: str,
+    *,
+    allow_login: bool,
+) -> _T:
+    """Run operation for _async_call, without the circuit breaker."""
+    try:
+        if not allow_login:
+            if (session := session_manager.session) is None:
+                raise LibrusSessionExpiredError("No logged-in Librus session")
+            return await operation(session)
+        session = await session_manager.async_get_session()
+        try:
+            return await operation(session)
+        except LibrusSessionExpiredError:
+            _LOGGER.debug("Librus session rejected by API, logging in again")
+            session_manager.invalidate()
+            session = await session_manager.async_get_session()
+            return await operation(session)
+
+    except (LibrusAuthError, LibrusConnectionError):
+        raise
+    except TimeoutError as err:
+        _LOGGER.debug("Librus %s fetch: timeout - %s", description, err)
         raise LibrusTimeoutError("Connection to Librus timed out") from err
-    except requests.exceptions.ConnectionError as err:
-        _LOGGER.debug("Librus homework fetch: connection error - %s", err)
-        raise LibrusConnectionError("Could not connect to Librus") from err
-    except requests.exceptions.RequestException as err:
-        _LOGGER.debug("Librus homework fetch: request error - %s", err)
+    except aiohttp.ClientResponseError as err:
+        _LOGGER.debug("Librus %s fetch: request error - %s", description, err)
         raise LibrusConnectionError(f"Librus request failed: {err}") from err
+    except aiohttp.ClientError as err:
+        _LOGGER.debug("Librus %s fetch: connection error - %s", description, err)
+        raise LibrusConnectionError("Could not connect to Librus") from err
+    except ValueError as err:
+        _LOGGER.debug("Librus %s fetch: invalid JSON - %s", description, err)
+        raise LibrusConnectionError(f"Invalid response from Librus: {err}") from err
+
+
+def _parse_timetable(payload: Mapping[str, Any]) -> list[TimetableLesson]:
+    """Build lessons from a GET /Timetables response.
+
+    Timetable maps each date to its lesson slots; a slot is a list of lessons
+    (empty for a free period), or a single lesson object in older responses.
+    Lessons without both HourFrom and HourTo are skipped.
+    """
+    lessons: list[TimetableLesson] = []
+    for day, slots in (payload.get("Timetable") or {}).items():
+        for slot in slots or []:
+            for lesson in slot if isinstance(slot, list) else [slot]:
+                time_from = lesson.get("HourFrom") if lesson else None
+                time_to = lesson.get("HourTo") if lesson else None
+                if not time_from or not time_to:
+                    # Nothing to place on the calendar without both times
+                    continue
+                subject = lesson.get("Subject") or {}
+                lessons.append(
+                    TimetableLesson(
+                        date=sys.intern(day),
+                        lesson_no=int(lesson.get("LessonNo") or 0),
+                        time_from=sys.intern(time_from),
+                        time_to=sys.intern(time_to),
+                        subject=sys.intern(subject.get("Name") or "Unknown"),
+                        teacher=sys.intern(_format_user_name(lesson.get("Teacher") or {})),
+                        is_substitution=bool(lesson.get("IsSubstitutionClass")),
+                        is_canceled=bool(lesson.get("IsCanceled")),
+                    )
+                )
+    lessons.sort(key=lambda lesson: (lesson.date, lesson.time_from, lesson.lesson_no))
+    return lessons
+
+
+async def async_fetch_timetable_week(
+    session_manager: AsyncLibrusSessionManager, week_start: date
+) -> list[TimetableLesson]:
+    """Fetch the timetable of the week starting on week_start (a Monday).
+
+    Returns lessons sorted by date and start time.
+    Raises LibrusAuthError, LibrusTimeoutError or LibrusConnectionError as
+    async_fetch_homework_data does.
+    """
+
+    async def fetch(session: aiohttp.ClientSession) -> list[TimetableLesson]:
+        payload = await _async_fetch_api_data(
+            session,
+            "Timetables",
+            params={"weekStart": week_start.isoformat()},
+            metrics=session_manager.metrics,
+            limiter=session_manager.rate_limiter,
+        )
+        return _parse_timetable(payload)
+
+    return await _async_call(session_manager, fetch, "timetable")
+
+
+# Librus writes Id as the first member of each collection element
+_LEADING_ID_RE = re.compile(r'\{\s*"Id"\s*:\s*(\d+)')
+
+
+def _grade_id_filter(after_id: int) -> Callable[[str], bool]:
+    """Return a keep() predicate accepting raw Grades elements with Id > after_id.
+
+    Elements whose Id cannot be read from the raw text are kept and checked
+    after parsing.
+    """
+
+    def keep(raw: str) -> bool:
+        match = _LEADING_ID_RE.match(raw)
+        return match is None or int(match.group(1)) > after_id
+
+    return keep
+
+
+async def _async_get_lookups(
+    session: aiohttp.ClientSession,
+    references: Mapping[str, set[int]],
+    cache: LookupCache | None,
+    metrics: LibrusMetrics | None = None,
+    limiter: LibrusRateLimiter | None = None,
+) -> dict[str, dict[int, Any]]:
+    """Return the lookup maps for references (lookup endpoint → Ids needed).
+
+    A cached map is used when it knows every referenced Id; otherwise the
+    endpoint is downloaded (concurrently with the others) and cached. Nothing
+    is downloaded for an endpoint with no referenced Ids.
+    """
+    lookup_maps: dict[str, dict[int, Any]] = {}
+    missing: list[str] = []
+    for endpoint, ids in references.items():
+        cached = cache.get(endpoint) if cache is not None else None
+        if cached is not None and ids <= cached.keys():
+            lookup_maps[endpoint] = cached
+            if metrics is not None:
+                metrics.count("cache_hits")
+        elif ids:
+            missing.append(endpoint)
+        else:
+            lookup_maps[endpoint] = cached or {}
+    if metrics is not None:
+        metrics.count("cache_misses", len(missing))
+    if missing:
+        _LOGGER.debug("Downloading Librus lookups: %s", missing)
+    payloads = await _async_fetch_many(session, missing, metrics=metrics, limiter=limiter)
+    for endpoint in missing:
+        lookup_maps[endpoint] = _LOOKUP_BUILDERS[endpoint](payloads[endpoint])
+        if cache is not None:
+            cache.set(endpoint, lookup_maps[endpoint])
+    return lookup_maps
+
+
+def _ref_id(item: Mapping[str, Any], key: str) -> int | None:
+    """Return the Id of the {"Id": ...} reference stored under key, if any."""
+    ref = item.get(key)
+    return ref.get("Id") if isinstance(ref, dict) else None
+
+
+def _grade_references(grades: list[dict[str, Any]]) -> dict[str, set[int]]:
+    """Return the lookup Ids referenced by raw grades, per lookup endpoint."""
+    references: dict[str, set[int]] = {
+        "Subjects": set(),
+        "Users": set(),
+        "Grades/Categories": set(),
+        "Grades/Comments": set(),
+    }
+    for grade in grades:
+        for endpoint, key in (
+            ("Subjects", "Subject"),
+            ("Users", "AddedBy"),
+            ("Grades/Categories", "Category"),
+        ):
+            if (ref_id := _ref_id(grade, key)) is not None:
+                references[endpoint].add(ref_id)
+        for comment in grade.get("Comments") or ():
+            if isinstance(comment, dict) and comment.get("Id") is not None:
+                references["Grades/Comments"].add(comment["Id"])
+    return references
+
+
+def _resolve_grade(
+    grade: dict[str, Any], lookup_maps: Mapping[str, Mapping[int, Any]]
+) -> GradeEntry:
+    """Transform a raw Grades API entry into a resolved GradeEntry."""
+    category = lookup_maps["Grades/Categories"].get(_ref_id(grade, "Category")) or {}
+    comments = lookup_maps["Grades/Comments"]
+    texts = [
+        comments[comment["Id"]]
+        for comment in grade.get("Comments") or ()
+        if isinstance(comment, dict) and comment.get("Id") in comments
+    ]
+    return GradeEntry(
+        id=grade["Id"],
+        date=grade.get("Date") or "",
+        add_date=grade.get("AddDate") or "",
+        subject=sys.intern(
+            lookup_maps["Subjects"].get(_ref_id(grade, "Subject"), "Unknown")
+        ),
+        grade=sys.intern(str(grade.get("Grade", ""))),
+        category=sys.intern(category.get("name", "Unknown")),
+        teacher=sys.intern(lookup_maps["Users"].get(_ref_id(grade, "AddedBy"), "Unknown")),
+        semester=int(grade.get("Semester") or 0),
+        weight=category.get("weight"),
+        comment="\n".join(texts) or None,
+        is_semester=bool(grade.get("IsSemester")),
+        is_final=bool(grade.get("IsFinal")),
+    )
+
+
+async def async_fetch_grades(
+    session_manager: AsyncLibrusSessionManager,
+    after_id: int = 0,
+    cache: LookupCache | None = None,
+    if_changed: bool = False,
+) -> list[GradeEntry] | None:
+    """Fetch the grades added since the grade with Id after_id.
+
+    Grades is streamed and elements with Id <= after_id are dropped before
+    being parsed, so a refresh only resolves new grades however long the
+    history is. Subjects, Users, Grades/Categories and Grades/Comments are
+    taken from cache and downloaded only when a new grade references an Id
+    the cached map does not know (comments only when a new grade has any).
+
+    With if_changed, None is returned when the Grades body has not changed
+    since the previous successful call; after a failed lookup download the
+    same new grades are resolved again.
+    Returns the new grades ordered by Id, or None (see above).
+    Raises LibrusAuthError, LibrusTimeoutError or LibrusConnectionError as
+    async_fetch_homework_data does.
+    """
+    validators = session_manager.response_validators["Grades"]
+
+    async def resolve(session: aiohttp.ClientSession) -> list[GradeEntry] | None:
+        payload = await _async_fetch_api_data(
+            session,
+            "Grades",
+            validators,
+            if_changed=if_changed,
+            collector=partial(_JsonArrayItems, "Grades", _grade_id_filter(after_id)),
+            metrics=session_manager.metrics,
+            limiter=session_manager.rate_limiter,
+        )
+        if payload is None:
+            return None
+        grades = [grade for grade in payload["Grades"] if grade.get("Id", 0) > after_id]
+        if not grades:
+            return []
+
+        _LOGGER.debug("Resolving %d new Librus grades", len(grades))
+        lookup_maps = await _async_get_lookups(
+            session,
+            _grade_references(grades),
+            cache,
+            session_manager.metrics,
+            session_manager.rate_limiter,
+        )
+        entries = [_resolve_grade(grade, lookup_maps) for grade in grades]
+        entries.sort(key=lambda entry: entry.id)
+        return entries
+
+    async def fetch(session: aiohttp.ClientSession) -> list[GradeEntry] | None:
+        with _restore_on_failure(validators):
+            return await resolve(session)
+
+    return await _async_call(session_manager, fetch, "grades")
+
+
+_TYPE_REF_RE = re.compile(r'"Type"\s*:\s*\{\s*"Id"\s*:\s*(\d+)')
+
+
+def _attendance_filter(
+    known: Mapping[int, int], seen: set[int]
+) -> Callable[[str], bool]:
+    """Return a keep() predicate for raw Attendances elements.
+
+    Adds every Id read from the raw text to seen, and accepts only elements
+    that are not in known (record Id → type Id) with the same type. Elements
+    whose Id or type cannot be read from the raw text are kept.
+    """
+
+    def keep(raw: str) -> bool:
+        id_match = _LEADING_ID_RE.match(raw)
+        if id_match is None:
+            return True
+        record_id = int(id_match.group(1))
+        seen.add(record_id)
+        type_match = _TYPE_REF_RE.search(raw)
+        return type_match is None or known.get(record_id) != int(type_match.group(1))
+
+    return keep
+
+
+def _resolve_attendance(
+    attendance: dict[str, Any], lookup_maps: Mapping[str, Mapping[int, Any]]
+) -> AttendanceRecord:
+    """Transform a raw Attendances API entry into a resolved AttendanceRecord."""
+    type_id = _ref_id(attendance, "Type")
+    attendance_type = lookup_maps["Attendances/Types"].get(type_id) or {}
+    subject_id = lookup_maps["Lessons"].get(_ref_id(attendance, "Lesson"))
+    return AttendanceRecord(
+        id=attendance["Id"],
+        date=sys.intern(attendance.get("Date") or ""),
+        lesson_no=int(attendance.get("LessonNo") or 0),
+        subject=sys.intern(lookup_maps["Subjects"].get(subject_id, "Unknown")),
+        type_id=type_id or 0,
+        type_name=sys.intern(attendance_type.get("name", "Unknown")),
+        kind=sys.intern(attendance_type.get("kind", "other")),
+        semester=int(attendance.get("Semester") or 0),
+    )
+
+
+async def async_fetch_attendances(
+    session_manager: AsyncLibrusSessionManager,
+    known: Mapping[int, int] | None = None,
+    cache: LookupCache | None = None,
+    if_changed: bool = False,
+) -> tuple[list[AttendanceRecord], set[int]] | None:
+    """Fetch the attendance records that are new or changed since known.
+
+    known maps the record Ids already held to their attendance type Id.
+    Attendances is streamed and elements already known with the same type are
+    dropped on their raw text, so only new records and records whose type
+    changed (e.g. an absence excused later) are parsed and resolved.
+    Lessons (lesson → subject), Subjects and Attendances/Types come from
+    cache and are downloaded only when a record references an unknown Id.
+
+    With if_changed, None is returned when the Attendances body has not
+    changed since the previous successful call; after a failed lookup
+    download the same records are resolved again.
+    Returns (new or changed records, Ids of every record in the response).
+    Raises LibrusAuthError, LibrusTimeoutError or LibrusConnectionError as
+    async_fetch_homework_data does.
+    """
+    known = known or {}
+    validators = session_manager.response_validators["Attendances"]
+
+    async def resolve(
+        session: aiohttp.ClientSession,
+    ) -> tuple[list[AttendanceRecord], set[int]] | None:
+        seen: set[int] = set()
+        payload = await _async_fetch_api_data(
+            session,
+            "Attendances",
+            validators,
+            if_changed=if_changed,
+            collector=partial(
+                _JsonArrayItems, "Attendances", _attendance_filter(known, seen)
+            ),
+            metrics=session_manager.metrics,
+            limiter=session_manager.rate_limiter,
+        )
+        if payload is None:
+            return None
+        attendances = [
+            attendance
+            for attendance in payload["Attendances"]
+            if known.get(attendance.get("Id")) != _ref_id(attendance, "Type")
+        ]
+        seen.update(attendance["Id"] for attendance in attendances)
+        if not attendances:
+            return [], seen
+
+        _LOGGER.debug("Resolving %d new or changed Librus attendances", len(attendances))
+        lookup_maps = await _async_get_lookups(
+            session,
+            {
+                "Lessons": {
+                    ref_id
+                    for attendance in attendances
+                    if (ref_id := _ref_id(attendance, "Lesson")) is not None
+                },
+                "Attendances/Types": {
+                    ref_id
+                    for attendance in attendances
+                    if (ref_id := _ref_id(attendance, "Type")) is not None
+                },
+            },
+            cache,
+            session_manager.metrics,
+            session_manager.rate_limiter,
+        )
+        lessons = lookup_maps["Lessons"]
+        lookup_maps |= await _async_get_lookups(
+            session,
+            {
+                "Subjects": {
+                    lessons[ref_id]
+                    for attendance in attendances
+                    if (ref_id := _ref_id(attendance, "Lesson")) in lessons
+                }
+            },
+            cache,
+            session_manager.metrics,
+            session_manager.rate_limiter,
+        )
+        records = [_resolve_attendance(attendance, lookup_maps) for attendance in attendances]
+        return records, seen
+
+    async def fetch(
+        session: aiohttp.ClientSession,
+    ) -> tuple[list[AttendanceRecord], set[int]] | None:
+        with _restore_on_failure(validators):
+            return await resolve(session)
+
+    return await _async_call(session_manager, fetch, "attendance")
+
+
+async def async_fetch_lucky_number(
+    session_manager: AsyncLibrusSessionManager, *, allow_login: bool = True
+) -> LuckyNumber:
+    """Fetch today's lucky number (GET /LuckyNumbers).
+
+    Without allow_login the request is only made on an already logged-in
+    session (see _async_call).
+    Raises LibrusAuthError, LibrusTimeoutError or LibrusConnectionError as
+    async_fetch_homework_data does.
+    """
+
+    async def fetch(session: aiohttp.ClientSession) -> LuckyNumber:
+        payload = await _async_fetch_api_data(
+            session,
+            "LuckyNumbers",
+            metrics=session_manager.metrics,
+            limiter=session_manager.rate_limiter,
+        )
+        lucky_number = payload.get("LuckyNumber") or {}
+        return LuckyNumber(
+            number=lucky_number.get("LuckyNumber"),
+            day=lucky_number.get("LuckyNumberDay"),
+        )
+
+    return await _async_call(
+        session_manager, fetch, "lucky number", allow_login=allow_login
+    )
+
+
+def _parse_free_days(payload: Mapping[str, Any]) -> list[FreeDays]:
+    """Build free day ranges from a GET /SchoolFreeDays response, by start date."""
+    ranges = [
+        FreeDays(
+            name=item.get("Name") or "",
+            date_from=item["DateFrom"],
+            date_to=item.get("DateTo") or item["DateFrom"],
+        )
+        for item in payload.get("SchoolFreeDays") or []
+        if item.get("DateFrom")
+    ]
+    ranges.sort(key=lambda free_days: free_days.date_from)
+    return ranges
+
+
+async def async_fetch_school_free_days(
+    session_manager: AsyncLibrusSessionManager,
+) -> list[FreeDays]:
+    """Fetch the school's free day ranges (holidays, breaks).
+
+    Raises LibrusAuthError, LibrusTimeoutError or LibrusConnectionError as
+    async_fetch_homework_data does.
+    """
+
+    async def fetch(session: aiohttp.ClientSession) -> list[FreeDays]:
+        return _parse_free_days(
+            await _async_fetch_api_data(
+                session,
+                "SchoolFreeDays",
+                metrics=session_manager.metrics,
+                limiter=session_manager.rate_limiter,
+            )
+        )
+
+    return await _async_call(session_manager, fetch, "school free days")
+
+
+async def async_fetch_school_id(session_manager: AsyncLibrusSessionManager) -> int | None:
+    """Fetch the Id of the account's school (GET /Schools), None if not given.
+
+    Raises LibrusAuthError, LibrusTimeoutError or LibrusConnectionError as
+    async_fetch_homework_data does.
+    """
+
+    async def fetch(session: aiohttp.ClientSession) -> int | None:
+        payload = await _async_fetch_api_data(
+            session,
+            "Schools",
+            metrics=session_manager.metrics,
+            limiter=session_manager.rate_limiter,
+        )
+        school = payload.get("School")
+        return school.get("Id") if isinstance(school, dict) else None
+
+    return await _async_call(session_manager, fetch, "school")
@@ -0,0 +1,120 @@
+"""Timings and counters of the requests made to Librus."""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+# logins: OAuth flows completed; cache_hits/cache_misses: lookup maps served
+# from the lookup cache or downloaded; retries: requests repeated after a
+# transient failure; failures: calls (e.g. one resource refresh) that failed;
+# rejected: calls refused while the circuit breaker was open.
+COUNTERS = ("logins", "cache_hits", "cache_misses", "retries", "failures", "rejected")
+
+
+@dataclass(slots=True)
+class PhaseTiming:
+    """The latest request of one phase (an OAuth step or an API endpoint).
+
+    duration is the wall time from sending the request to the end of the
+    body, parse_time the part of it spent in the JSON collector, size the
+    body bytes read. status is None when no response arrived (and for the
+    "login" phase, which spans the five OAuth steps). count and
+    total_duration cover every request of the phase since startup.
+    """
+
+    duration: float = 0.0
+    status: int | None = None
+    size: int = 0
+    parse_time: float = 0.0
+    count: int = 0
+    total_duration: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the timing as a JSON-serializable dict."""
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class CallTiming:
+    """The latest call of one kind (e.g. "homework"): duration and outcome."""
+
+    duration: float = 0.0
+    success: bool = True
+    count: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the timing as a JSON-serializable dict."""
+        return asdict(self)
+
+
+class LibrusMetrics:
+    """Per-phase request timings and COUNTERS of one Librus account.
+
+    Filled in by the client (see librus_client) without any logging, so the
+    figures are available in production. Listeners are called after each
+    call (a group of requests such as one resource refresh) has finished,
+    not for every request.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.phases: dict[str, PhaseTiming] = {}
+        self.calls: dict[str, CallTiming] = {}
+        self.counters: Counter[str] = Counter(dict.fromkeys(COUNTERS, 0))
+        self.last_call: str | None = None
+        self._listeners: list[Callable[[], None]] = []
+
+    def async_add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call listener each time a call finishes.
+
+        Returns a function that removes the listener.
+        """
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        """Increment one of COUNTERS."""
+        self.counters[counter] += amount
+
+    def record_request(
+        self,
+        phase: str,
+        duration: float,
+        status: int | None,
+        size: int = 0,
+        parse_time: float = 0.0,
+    ) -> None:
+        """Record a finished request (or attempt) of phase."""
+        timing = self.phases.setdefault(phase, PhaseTiming())
+        timing.duration = duration
+        timing.status = status
+        timing.size = size
+        timing.parse_time = parse_time
+        timing.count += 1
+        timing.total_duration += duration
+
+    def add_parse_time(self, phase: str, parse_time: float) -> None:
+        """Add parsing done after phase's latest request was read."""
+        if (timing := self.phases.get(phase)) is not None:
+            timing.parse_time += parse_time
+
+    def record_call(self, description: str, duration: float, success: bool) -> None:
+        """Record a finished call and notify the listeners."""
+        timing = self.calls.setdefault(description, CallTiming())
+        timing.duration = duration
+        timing.success = success
+        timing.count += 1
+        self.last_call = description
+        for listener in list(self._listeners):
+            listener()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return every figure as a JSON-serializable dict."""
+        return {
+            "counters": dict(self.counters),
+            "calls": {name: timing.as_dict() for name, timing in self.calls.items()},
+            "phases": {name: timing.as_dict() for name, timing in self.phases.items()},
+        }
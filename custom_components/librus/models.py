@@ -0,0 +1,407 @@
+"""Data models for the Librus integration."""
+
+from __future__ import annotations
+
+import sys
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, replace
+from datetime import date, datetime, time, tzinfo
+from typing import Any
+
+# Optional HomeworkEntry fields, omitted from as_dict() when not available
+_OPTIONAL_FIELDS = ("lesson_no", "time_from", "time_to", "content", "add_date")
+
+
+@dataclass(frozen=True, slots=True)
+class HomeworkEntry:
+    """A resolved homework entry per data-model.md HomeworkEntry.
+
+    Immutable and slotted; subject/creator/category (shared by most entries)
+    are interned by from_dict() and the client, so entries reference a single
+    copy of each name. Exposed to Home Assistant through as_dict().
+    """
+
+    id: int
+    date: str
+    subject: str
+    creator: str
+    category: str
+    lesson_no: str | None = None
+    time_from: str | None = None
+    time_to: str | None = None
+    content: str | None = None
+    add_date: str | None = None
+
+    def as_dict(self, content_length: int | None = None) -> dict[str, Any]:
+        """Return the attribute/event shape; optional fields only when present.
+
+        With content_length, longer content is cut to that many characters
+        and ends with an ellipsis.
+        """
+        result: dict[str, Any] = {
+            "id": self.id,
+            "date": self.date,
+            "subject": self.subject,
+            "creator": self.creator,
+            "category": self.category,
+        }
+        for field in _OPTIONAL_FIELDS:
+            if (value := getattr(self, field)) is not None:
+                result[field] = value
+        content = self.content
+        if content_length is not None and content and len(content) > content_length:
+            result["content"] = f"{content[: content_length - 1]}…"
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> HomeworkEntry:
+        """Build an entry from the as_dict() shape (e.g. a persisted snapshot)."""
+        return cls(
+            id=data["id"],
+            date=sys.intern(data["date"]),
+            subject=sys.intern(data["subject"]),
+            creator=sys.intern(data["creator"]),
+            category=sys.intern(data["category"]),
+            **{field: data.get(field) for field in _OPTIONAL_FIELDS},
+        )
+
+
+class HomeworkIndex:
+    """Homework entries sorted by due date, for range lookups by bisection."""
+
+    __slots__ = ("_dates", "_entries")
+
+    def __init__(self, entries: Iterable[HomeworkEntry]) -> None:
+        """Index entries by (date, time_from)."""
+        self._entries = sorted(
+            entries, key=lambda entry: (entry.date, entry.time_from or "")
+        )
+        self._dates = [entry.date for entry in self._entries]
+
+    def __len__(self) -> int:
+        """Return the number of indexed entries."""
+        return len(self._entries)
+
+    def between(self, first: str, last: str) -> list[HomeworkEntry]:
+        """Return entries due within [first, last] (ISO dates), in date order."""
+        return self._entries[
+            bisect_left(self._dates, first) : bisect_right(self._dates, last)
+        ]
+
+    def since(self, first: str) -> list[HomeworkEntry]:
+        """Return entries due on or after first (ISO date), in date order."""
+        return self._entries[bisect_left(self._dates, first) :]
+
+
+@dataclass(frozen=True, slots=True)
+class TimetableLesson:
+    """A lesson from the Librus timetable (GET /Timetables).
+
+    time_from/time_to are local "HH:MM" times on date; names are interned.
+    """
+
+    date: str
+    lesson_no: int
+    time_from: str
+    time_to: str
+    subject: str
+    teacher: str
+    is_substitution: bool = False
+    is_canceled: bool = False
+
+    def start(self, tz: tzinfo) -> datetime:
+        """Return when the lesson starts, in time zone tz."""
+        return datetime.combine(
+            date.fromisoformat(self.date), time.fromisoformat(self.time_from), tz
+        )
+
+    def end(self, tz: tzinfo) -> datetime:
+        """Return when the lesson ends, in time zone tz."""
+        return datetime.combine(
+            date.fromisoformat(self.date), time.fromisoformat(self.time_to), tz
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the attribute/persistence shape."""
+        return {
+            "date": self.date,
+            "lesson_no": self.lesson_no,
+            "time_from": self.time_from,
+            "time_to": self.time_to,
+            "subject": self.subject,
+            "teacher": self.teacher,
+            "is_substitution": self.is_substitution,
+            "is_canceled": self.is_canceled,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> TimetableLesson:
+        """Build a lesson from the as_dict() shape (e.g. a persisted snapshot)."""
+        return cls(
+            date=sys.intern(data["date"]),
+            lesson_no=data["lesson_no"],
+            time_from=sys.intern(data["time_from"]),
+            time_to=sys.intern(data["time_to"]),
+            subject=sys.intern(data["subject"]),
+            teacher=sys.intern(data["teacher"]),
+            is_substitution=data.get("is_substitution", False),
+            is_canceled=data.get("is_canceled", False),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class GradeEntry:
+    """A resolved grade from GET /Grades.
+
+    Subject, teacher and category names are interned; weight and comment are
+    None when the category has no weight or the grade no comment.
+    """
+
+    id: int
+    date: str
+    add_date: str
+    subject: str
+    grade: str
+    category: str
+    teacher: str
+    semester: int
+    weight: int | None = None
+    comment: str | None = None
+    is_semester: bool = False
+    is_final: bool = False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the attribute/event/persistence shape."""
+        return {
+            "id": self.id,
+            "date": self.date,
+            "add_date": self.add_date,
+            "subject": self.subject,
+            "grade": self.grade,
+            "category": self.category,
+            "teacher": self.teacher,
+            "semester": self.semester,
+            "weight": self.weight,
+            "comment": self.comment,
+            "is_semester": self.is_semester,
+            "is_final": self.is_final,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> GradeEntry:
+        """Build a grade from the as_dict() shape (e.g. a persisted snapshot)."""
+        return cls(
+            id=data["id"],
+            date=data["date"],
+            add_date=data["add_date"],
+            subject=sys.intern(data["subject"]),
+            grade=sys.intern(data["grade"]),
+            category=sys.intern(data["category"]),
+            teacher=sys.intern(data["teacher"]),
+            semester=data["semester"],
+            weight=data.get("weight"),
+            comment=data.get("comment"),
+            is_semester=data.get("is_semester", False),
+            is_final=data.get("is_final", False),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class AttendanceRecord:
+    """A resolved attendance entry from GET /Attendances.
+
+    kind is the AttendanceCounts field the entry is counted in; type_name is
+    the school's own name for the attendance type. Names are interned.
+    """
+
+    id: int
+    date: str
+    lesson_no: int
+    subject: str
+    type_id: int
+    type_name: str
+    kind: str
+    semester: int
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the persistence shape."""
+        return {
+            "id": self.id,
+            "date": self.date,
+            "lesson_no": self.lesson_no,
+            "subject": self.subject,
+            "type_id": self.type_id,
+            "type_name": self.type_name,
+            "kind": self.kind,
+            "semester": self.semester,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> AttendanceRecord:
+        """Build a record from the as_dict() shape (e.g. a persisted snapshot)."""
+        return cls(
+            id=data["id"],
+            date=sys.intern(data["date"]),
+            lesson_no=data["lesson_no"],
+            subject=sys.intern(data["subject"]),
+            type_id=data["type_id"],
+            type_name=sys.intern(data["type_name"]),
+            kind=sys.intern(data["kind"]),
+            semester=data["semester"],
+        )
+
+
+@dataclass(slots=True)
+class AttendanceCounts:
+    """Attendance counters for one subject (or all subjects).
+
+    absent counts unexcused absences only; released covers lessons the
+    student was excused from attending (zwolnienie).
+    """
+
+    present: int = 0
+    absent: int = 0
+    excused: int = 0
+    late: int = 0
+    released: int = 0
+    other: int = 0
+
+    def add(self, kind: str, count: int = 1) -> None:
+        """Add count (negative to remove) to the counter for kind."""
+        setattr(self, kind, getattr(self, kind) + count)
+
+    @property
+    def absences(self) -> int:
+        """Return all absences, excused or not."""
+        return self.absent + self.excused
+
+    @property
+    def attendance_percent(self) -> float | None:
+        """Return the share of lessons attended (late counts as attended)."""
+        attended = self.present + self.late
+        total = attended + self.absences
+        return round(100 * attended / total, 1) if total else None
+
+    @property
+    def excused_percent(self) -> float | None:
+        """Return the share of absences that are excused."""
+        return round(100 * self.excused / self.absences, 1) if self.absences else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters and derived percentages."""
+        return {
+            "present": self.present,
+            "absent": self.absent,
+            "excused": self.excused,
+            "late": self.late,
+            "released": self.released,
+            "other": self.other,
+            "absences": self.absences,
+            "attendance_percent": self.attendance_percent,
+            "excused_percent": self.excused_percent,
+        }
+
+
+class AttendanceSummary:
+    """Attendance aggregates, maintained incrementally from record deltas.
+
+    Holds the counters for all subjects, per subject and per attendance type
+    name, plus the records they were built from (by Id), so a record whose
+    type changed (e.g. an absence excused later) or that disappeared can be
+    taken back out. Reading the counters never scans the records.
+    Instances are treated as immutable: apply() returns an updated copy.
+    """
+
+    __slots__ = ("by_subject", "by_type", "records", "total")
+
+    def __init__(self, records: Iterable[AttendanceRecord] = ()) -> None:
+        """Build the aggregates from records."""
+        self.records: dict[int, AttendanceRecord] = {}
+        self.total = AttendanceCounts()
+        self.by_subject: dict[str, AttendanceCounts] = {}
+        self.by_type: dict[str, int] = {}
+        for record in records:
+            self._add(record, 1)
+
+    def _add(self, record: AttendanceRecord, count: int) -> None:
+        if count > 0:
+            self.records[record.id] = record
+        self.total.add(record.kind, count)
+        subject = self.by_subject.get(record.subject)
+        if subject is None:
+            subject = self.by_subject[record.subject] = AttendanceCounts()
+        subject.add(record.kind, count)
+        self.by_type[record.type_name] = self.by_type.get(record.type_name, 0) + count
+        if not self.by_type[record.type_name]:
+            del self.by_type[record.type_name]
+
+    def type_ids(self) -> dict[int, int]:
+        """Return record Id → attendance type Id for the records held."""
+        return {record_id: record.type_id for record_id, record in self.records.items()}
+
+    def apply(
+        self, changed: Iterable[AttendanceRecord], removed: Iterable[int] = ()
+    ) -> AttendanceSummary:
+        """Return a copy with new/changed records counted and removed Ids dropped.
+
+        Counters are adjusted for the affected records only; nothing is
+        recounted from the records already held.
+        """
+        summary = AttendanceSummary()
+        summary.records = dict(self.records)
+        summary.total = replace(self.total)
+        summary.by_subject = {
+            name: replace(counts) for name, counts in self.by_subject.items()
+        }
+        summary.by_type = dict(self.by_type)
+        for record_id in removed:
+            if (old := summary.records.pop(record_id, None)) is not None:
+                summary._add(old, -1)
+        for record in changed:
+            if (old := summary.records.get(record.id)) is not None:
+                summary._add(old, -1)
+            summary._add(record, 1)
+        return summary
+
+
+@dataclass(frozen=True, slots=True)
+class LuckyNumber:
+    """The school's lucky number (GET /LuckyNumbers) and the day it applies to.
+
+    Both are None when the school has not published one.
+    """
+
+    number: int | None
+    day: str | None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the persistence shape."""
+        return {"number": self.number, "day": self.day}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> LuckyNumber:
+        """Build a lucky number from the as_dict() shape."""
+        return cls(number=data.get("number"), day=data.get("day"))
+
+
+@dataclass(frozen=True, slots=True)
+class FreeDays:
+    """A range of school free days (GET /SchoolFreeDays), inclusive ISO dates."""
+
+    name: str
+    date_from: str
+    date_to: str
+
+    def includes(self, day: date) -> bool:
+        """Return True when day falls within the range."""
+        return self.date_from <= day.isoformat() <= self.date_to
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the persistence shape."""
+        return {"name": self.name, "date_from": self.date_from, "date_to": self.date_to}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> FreeDays:
+        """Build a range from the as_dict() shape."""
+        return cls(name=data["name"], date_from=data["date_from"], date_to=data["date_to"])
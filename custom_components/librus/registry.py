@@ -0,0 +1,137 @@
+"""Librus clients shared by all config entries (accounts)."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar
+
+import aiohttp
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from .cache import LookupCache
+from .const import (
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    DATA_CLIENT_REGISTRY,
+    LOOKUP_CACHE_TTLS,
+    MAX_CONCURRENT_LOGINS,
+)
+from .librus_client import AsyncLibrusSessionManager, CircuitBreaker, LibrusRateLimiter
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+@dataclass(slots=True)
+class _Shared(Generic[_T]):
+    """A shared client object and the config entries using it."""
+
+    value: _T
+    entry_ids: set[str] = field(default_factory=set)
+
+
+class LibrusClientRegistry:
+    """Session managers and lookup caches shared between config entries.
+
+    Entries logging in with the same username share one
+    AsyncLibrusSessionManager, and so one login. Entries whose accounts
+    belong to the same school (e.g. siblings) share one LookupCache, so the
+    Subjects/Users/category maps are downloaded once per school. Logins of
+    all entries are capped at MAX_CONCURRENT_LOGINS at a time, and all
+    entries share one CircuitBreaker, so an outage pauses every account's
+    requests, and one LibrusRateLimiter, which also paces the config flow's
+    credential checks. A shared object is dropped when the last entry using it is
+    released.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty registry."""
+        self.hass = hass
+        self.login_limiter = asyncio.Semaphore(MAX_CONCURRENT_LOGINS)
+        self.circuit_breaker = CircuitBreaker()
+        self.rate_limiter = LibrusRateLimiter()
+        # Casefolded username → session manager
+        self._session_managers: dict[str, _Shared[AsyncLibrusSessionManager]] = {}
+        # School key (see _school_key) → lookup cache
+        self._lookup_caches: dict[str, _Shared[LookupCache]] = {}
+
+    @callback
+    def async_session_manager(self, entry: ConfigEntry) -> AsyncLibrusSessionManager:
+        """Return the session manager for entry's username, creating it if needed."""
+        key = entry.data[CONF_USERNAME].casefold()
+        shared = self._session_managers.get(key)
+        if shared is None:
+            # Dedicated cookie jar on Home Assistant's pooled connector
+            shared = self._session_managers[key] = _Shared(
+                AsyncLibrusSessionManager(
+                    async_create_clientsession(self.hass, cookie_jar=aiohttp.CookieJar()),
+                    entry.data[CONF_USERNAME],
+                    entry.data[CONF_PASSWORD],
+                    login_limiter=self.login_limiter,
+                    circuit_breaker=self.circuit_breaker,
+                    rate_limiter=self.rate_limiter,
+                )
+            )
+        else:
+            _LOGGER.debug("Sharing Librus session of %s", entry.data[CONF_USERNAME])
+        shared.entry_ids.add(entry.entry_id)
+        return shared.value
+
+    @callback
+    def async_lookup_cache(self, entry: ConfigEntry, school_id: int | None) -> LookupCache:
+        """Return the lookup cache of entry's school, creating it if needed.
+
+        Without a school_id the cache is private to entry's username.
+        """
+        key = _school_key(entry, school_id)
+        shared = self._lookup_caches.get(key)
+        if shared is None:
+            shared = self._lookup_caches[key] = _Shared(LookupCache(LOOKUP_CACHE_TTLS))
+        shared.entry_ids.add(entry.entry_id)
+        return shared.value
+
+    @callback
+    def async_move_to_school(self, entry: ConfigEntry, school_id: int) -> LookupCache:
+        """Move entry from its private lookup cache to its school's, once learned.
+
+        When the school has no cache yet, the private one (with the maps it
+        already holds) becomes the school's, unless another entry of the same
+        username still uses it.
+        """
+        private_key = _school_key(entry, None)
+        school_key = _school_key(entry, school_id)
+        if (private := self._lookup_caches.get(private_key)) is not None:
+            private.entry_ids.discard(entry.entry_id)
+            if not private.entry_ids:
+                del self._lookup_caches[private_key]
+                self._lookup_caches.setdefault(school_key, _Shared(private.value))
+        return self.async_lookup_cache(entry, school_id)
+
+    @callback
+    def async_release(self, entry_id: str) -> None:
+        """Stop sharing with entry_id; drop what no other entry uses."""
+        for shared_objects in (self._session_managers, self._lookup_caches):
+            for key, shared in list(shared_objects.items()):
+                shared.entry_ids.discard(entry_id)
+                if not shared.entry_ids:
+                    del shared_objects[key]
+
+
+def _school_key(entry: ConfigEntry, school_id: int | None) -> str:
+    if school_id is None:
+        return f"user:{entry.data[CONF_USERNAME].casefold()}"
+    return f"school:{school_id}"
+
+
+@callback
+def async_get_client_registry(hass: HomeAssistant) -> LibrusClientRegistry:
+    """Return the registry shared by all Librus config entries."""
+    if (registry := hass.data.get(DATA_CLIENT_REGISTRY)) is None:
+        registry = hass.data[DATA_CLIENT_REGISTRY] = LibrusClientRegistry(hass)
+    return registry
@@ -0,0 +1,344 @@
+"""Per-resource refresh scheduling for the Librus integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    FIRST_REFRESH_RETRY,
+    FREE_DAY_REFRESH_INTERVAL,
+    FREE_DAYS_RETRY,
+    FREE_DAYS_STORAGE_KEY,
+    REFRESH_INTERVALS,
+    REFRESHED_STORAGE_KEY,
+    SCHEDULER_TICK,
+    SCHOOL_HOURS,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    SUMMER_BREAK_MONTHS,
+    SUMMER_BREAK_REFRESH_INTERVAL,
+    TERM_STARTS,
+)
+from .librus_client import (
+    AsyncLibrusSessionManager,
+    LibrusAuthError,
+    LibrusConnectionError,
+    RequestPriority,
+    async_fetch_school_free_days,
+    current_request_priority,
+    request_priority,
+)
+from .models import FreeDays
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _school_term(day: date) -> str:
+    """Return the term day belongs to, e.g. "2025-09-01" (per TERM_STARTS)."""
+    starts = sorted(
+        date(year, month, start_day)
+        for year in (day.year - 1, day.year)
+        for month, start_day in TERM_STARTS
+    )
+    return max(start for start in starts if start <= day).isoformat()
+
+
+@dataclass(slots=True)
+class _RefreshBatch:
+    """Resources refreshed together and the future resolved with their results.
+
+    priority is the most urgent of the requests merged into the batch.
+    """
+
+    resources: set[str]
+    priority: RequestPriority = RequestPriority.BACKGROUND
+    future: asyncio.Future[dict[str, dict[str, Any]]] = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+class LibrusRefreshScheduler:
+    """Refresh each resource's coordinator on its own cadence.
+
+    Every SCHEDULER_TICK the resources that are due (per REFRESH_INTERVALS:
+    frequent during SCHOOL_HOURS on school days, rare otherwise; once per
+    FREE_DAY_REFRESH_INTERVAL on SchoolFreeDays and once per
+    SUMMER_BREAK_REFRESH_INTERVAL in the summer break) are refreshed
+    together, so they share one session check or login (see
+    SESSION_VERIFIED_FOR). The school free days are downloaded in the same
+    tick once per term (TERM_STARTS) and persisted, so restarts do not repeat it.
+    The times of successful refreshes are persisted too, so a restart does not
+    download again data restored from a recent snapshot.
+
+    Ticks and on-demand requests (async_request_refresh) share one in-flight
+    refresh per entry: a request covered by the running refresh waits for its
+    result, and the others made meanwhile are merged into a single follow-up.
+    Ticks refresh with RequestPriority.BACKGROUND, so the requests of an
+    on-demand refresh (INTERACTIVE unless the caller says otherwise) are let
+    through the rate limiter first.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        session_manager: AsyncLibrusSessionManager,
+        coordinators: Mapping[str, DataUpdateCoordinator],
+    ) -> None:
+        """Initialize the scheduler for coordinators keyed by REFRESH_INTERVALS resource."""
+        self.hass = hass
+        self.entry = entry
+        self.session_manager = session_manager
+        self.coordinators = coordinators
+        self.free_days: list[FreeDays] = []
+        # Resource → when it was last refreshed (UTC)
+        self._last_refresh: dict[str, datetime] = {}
+        # Term the free days were downloaded for and the last attempt (UTC)
+        self._free_days_term: str | None = None
+        self._free_days_attempt: datetime | None = None
+        self._running = False
+        # The task running refreshes, the refresh in flight and the one queued
+        # behind it
+        self._runner: asyncio.Task[None] | None = None
+        self._current: _RefreshBatch | None = None
+        self._queued: _RefreshBatch | None = None
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, FREE_DAYS_STORAGE_KEY.format(entry_id=entry.entry_id)
+        )
+        self._refreshed_store: Store[dict[str, str]] = Store(
+            hass, STORAGE_VERSION, REFRESHED_STORAGE_KEY.format(entry_id=entry.entry_id)
+        )
+
+    async def async_restore_snapshot(self) -> bool:
+        """Use the persisted free days and refresh times, if any.
+
+        Must run after the coordinators restored their snapshots: a resource
+        keeps its last successful refresh time only when it holds data, so
+        the first tick refreshes just what is due or missing.
+        Returns True when the free days were restored.
+        """
+        if refreshed := await self._refreshed_store.async_load():
+            for resource, when in refreshed.items():
+                coordinator = self.coordinators.get(resource)
+                if coordinator is not None and coordinator.data is not None:
+                    self._last_refresh[resource] = dt_util.parse_datetime(when)
+        snapshot = await self._store.async_load()
+        if not snapshot:
+            return False
+        self._free_days_term = snapshot["term"]
+        self.free_days = [FreeDays.from_dict(item) for item in snapshot["free_days"]]
+        return True
+
+    @callback
+    def _snapshot(self) -> dict[str, Any]:
+        """Build the data persisted after the free days were downloaded."""
+        return {
+            "term": self._free_days_term,
+            "free_days": [free_days.as_dict() for free_days in self.free_days],
+        }
+
+    @callback
+    def _refreshed_snapshot(self) -> dict[str, str]:
+        """Build resource → time of its last refresh, for successful ones."""
+        return {
+            resource: when.isoformat()
+            for resource, when in self._last_refresh.items()
+            if self.coordinators[resource].last_update_success
+        }
+
+    @callback
+    def async_start(self) -> None:
+        """Run the first tick now and then every SCHEDULER_TICK until unload."""
+        self.entry.async_on_unload(
+            async_track_time_interval(self.hass, self._async_schedule_tick, SCHEDULER_TICK)
+        )
+        self._async_schedule_tick()
+
+    @callback
+    def _async_schedule_tick(self, now: datetime | None = None) -> None:
+        if self._running:
+            return
+        self._running = True
+        self.entry.async_create_background_task(
+            self.hass, self._async_tick(), f"{DOMAIN}_scheduler_tick"
+        )
+
+    def is_free_day(self, now: datetime) -> bool:
+        """Return True when now's local day is a school free day."""
+        day = dt_util.as_local(now).date()
+        return any(free_days.includes(day) for free_days in self.free_days)
+
+    def is_school_time(self, now: datetime) -> bool:
+        """Return True during SCHOOL_HOURS on a weekday that is not a free day."""
+        local = dt_util.as_local(now)
+        start, end = SCHOOL_HOURS
+        return (
+            local.weekday() < 5
+            and start <= local.time() < end
+            and not self.is_free_day(now)
+        )
+
+    def is_summer_break(self, now: datetime) -> bool:
+        """Return True when now's local month is in SUMMER_BREAK_MONTHS."""
+        return dt_util.as_local(now).month in SUMMER_BREAK_MONTHS
+
+    def interval(self, resource: str, now: datetime) -> timedelta:
+        """Return resource's refresh interval at now."""
+        if self.is_summer_break(now):
+            return SUMMER_BREAK_REFRESH_INTERVAL
+        if self.is_free_day(now):
+            return FREE_DAY_REFRESH_INTERVAL
+        school, other = REFRESH_INTERVALS[resource]
+        return school if self.is_school_time(now) else other
+
+    def due(self, now: datetime) -> list[str]:
+        """Return the resources due for a refresh at now.
+
+        A resource without data yet is due at least every FIRST_REFRESH_RETRY.
+        """
+        due = []
+        for resource, coordinator in self.coordinators.items():
+            last = self._last_refresh.get(resource)
+            interval = self.interval(resource, now)
+            if coordinator.data is None:
+                interval = min(interval, FIRST_REFRESH_RETRY)
+            if last is None or now - last >= interval:
+                due.append(resource)
+        return due
+
+    def free_days_stale(self, now: datetime) -> bool:
+        """Return True when the free days should be downloaded at now.
+
+        They are downloaded once per term; a failed attempt is retried after
+        FREE_DAYS_RETRY.
+        """
+        if self._free_days_term == _school_term(dt_util.as_local(now).date()):
+            return False
+        return (
+            self._free_days_attempt is None
+            or now - self._free_days_attempt >= FREE_DAYS_RETRY
+        )
+
+    async def _async_tick(self) -> None:
+        """Refresh the free days when stale, then every due resource at once."""
+        try:
+            with request_priority(RequestPriority.BACKGROUND):
+                now = dt_util.utcnow()
+                if self.free_days_stale(now):
+                    await self._async_update_free_days(now)
+                if due := self.due(now):
+                    await self.async_request_refresh(due)
+        finally:
+            self._running = False
+
+    async def async_request_refresh(
+        self, resources: Iterable[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Refresh resources, joining the refresh in flight where possible.
+
+        Returns resource → {"success", "error"} as of the refresh that
+        covered the request, or as failed when the entry was unloaded first.
+        A queued refresh runs with the most urgent priority (see
+        request_priority) of the requests merged into it.
+        """
+        wanted = set(resources)
+        current = self._current
+        if current is not None and wanted <= current.resources:
+            batch = current
+        else:
+            if self._queued is None:
+                self._queued = _RefreshBatch(set())
+            batch = self._queued
+            batch.resources |= wanted
+            batch.priority = min(batch.priority, current_request_priority())
+            if self._runner is None or self._runner.done():
+                self._runner = self.entry.async_create_background_task(
+                    self.hass, self._async_run_batches(), f"{DOMAIN}_refresh"
+                )
+        try:
+            results = await asyncio.shield(batch.future)
+        except asyncio.CancelledError:
+            if not batch.future.cancelled() or asyncio.current_task().cancelling():
+                raise
+            return {
+                resource: {"success": False, "error": "Refresh cancelled"}
+                for resource in wanted
+            }
+        return {resource: results[resource] for resource in wanted}
+
+    async def _async_run_batches(self) -> None:
+        """Run the queued refresh, and any queued while it runs.
+
+        Only one runner is active at a time (see _runner). Coordinators record
+        their refresh errors themselves (see _async_refresh), so only
+        cancellation on unload (or a bug) ends the loop early; the refresh it
+        took and the one queued for it are then cancelled so that nobody keeps
+        waiting for them.
+        """
+        taken: _RefreshBatch | None = None
+        try:
+            while (taken := self._queued) is not None:
+                self._queued = None
+                self._current = taken
+                with request_priority(taken.priority):
+                    refreshed = await self._async_refresh(taken.resources)
+                taken.future.set_result(refreshed)
+                self._current = None
+        finally:
+            for batch in (taken, self._queued):
+                if batch is not None and not batch.future.done():
+                    batch.future.cancel()
+            self._current = self._queued = None
+            self._runner = None
+
+    async def _async_refresh(self, resources: set[str]) -> dict[str, dict[str, Any]]:
+        """Refresh resources together; they share one session check or login."""
+        _LOGGER.debug("Refreshing Librus resources: %s", sorted(resources))
+        now = dt_util.utcnow()
+        for resource in resources:
+            self._last_refresh[resource] = now
+        await asyncio.gather(
+            *(self.coordinators[resource].async_refresh() for resource in resources)
+        )
+        results = {}
+        for resource in resources:
+            coordinator = self.coordinators[resource]
+            success = coordinator.last_update_success
+            error = coordinator.last_exception
+            results[resource] = {
+                "success": success,
+                "error": str(error) if not success and error is not None else None,
+            }
+        self._refreshed_store.async_delay_save(
+            self._refreshed_snapshot, STORAGE_SAVE_DELAY
+        )
+        return results
+
+    async def _async_update_free_days(self, now: datetime) -> None:
+        """Download the school free days; failures keep the previous list."""
+        self._free_days_attempt = now
+        try:
+            self.free_days = await async_fetch_school_free_days(self.session_manager)
+        except (LibrusAuthError, LibrusConnectionError) as err:
+            _LOGGER.debug("Librus school free days unavailable: %s", err)
+            return
+        self._free_days_term = _school_term(dt_util.as_local(now).date())
+        _LOGGER.debug(
+            "Librus school free days for term %s: %s ranges",
+            self._free_days_term,
+            len(self.free_days),
+        )
+        self._store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
@@ -1,60 +1,339 @@
-"""Homework sensor for the Librus integration."""
+"""Sensors for the Librus integration."""
 
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import (
+    async_track_point_in_time,
+    async_track_time_change,
+)
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, SENSOR_HOMEWORK_KEY
-from .coordinator import LibrusDataUpdateCoordinator
+from .const import (
+    ATTRIBUTE_MODE_COMPACT,
+    COMPACT_CONTENT_LENGTH,
+    COMPACT_MAX_ENTRIES,
+    CONF_ATTRIBUTE_MODE,
+    DEFAULT_ATTRIBUTE_MODE,
+    DOMAIN,
+    SENSOR_ABSENCES_KEY,
+    SENSOR_ATTENDANCE_KEY,
+    SENSOR_CACHE_HITS_KEY,
+    SENSOR_CALL_TIME_KEY,
+    SENSOR_EXCUSED_KEY,
+    SENSOR_FAILURES_KEY,
+    SENSOR_HOMEWORK_KEY,
+    SENSOR_HOMEWORK_TODAY_KEY,
+    SENSOR_HOMEWORK_TOMORROW_KEY,
+    SENSOR_HOMEWORK_WEEK_KEY,
+    SENSOR_LATES_KEY,
+    SENSOR_LATEST_GRADE_KEY,
+    SENSOR_LOGIN_TIME_KEY,
+    SENSOR_LOGINS_KEY,
+    SENSOR_LUCKY_NUMBER_KEY,
+    SENSOR_NEXT_LESSON_KEY,
+    SENSOR_RETRIES_KEY,
+)
+from .coordinator import (
+    LibrusAttendanceCoordinator,
+    LibrusDataUpdateCoordinator,
+    LibrusGradesCoordinator,
+    LibrusLuckyNumberCoordinator,
+    LibrusRuntimeData,
+    LibrusTimetableCoordinator,
+)
+from .metrics import LibrusMetrics
+from .models import AttendanceCounts, HomeworkEntry, TimetableLesson
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, kw_only=True)
+class LibrusHomeworkSensorEntityDescription(SensorEntityDescription):
+    """Describes a Librus homework sensor.
+
+    date_range maps today to the inclusive (first, last) due dates shown;
+    None shows the whole fetched window.
+    """
+
+    date_range: Callable[[date], tuple[date, date]] | None = None
+
+
+HOMEWORK_SENSOR = LibrusHomeworkSensorEntityDescription(
+    key=SENSOR_HOMEWORK_KEY,
+    translation_key=SENSOR_HOMEWORK_KEY,
+    icon="mdi:book-open-variant",
+)
+
+DAY_SENSORS: tuple[LibrusHomeworkSensorEntityDescription, ...] = (
+    LibrusHomeworkSensorEntityDescription(
+        key=SENSOR_HOMEWORK_TODAY_KEY,
+        translation_key=SENSOR_HOMEWORK_TODAY_KEY,
+        icon="mdi:calendar-today",
+        date_range=lambda today: (today, today),
+    ),
+    LibrusHomeworkSensorEntityDescription(
+        key=SENSOR_HOMEWORK_TOMORROW_KEY,
+        translation_key=SENSOR_HOMEWORK_TOMORROW_KEY,
+        icon="mdi:calendar-arrow-right",
+        date_range=lambda today: (today + timedelta(days=1), today + timedelta(days=1)),
+    ),
+    LibrusHomeworkSensorEntityDescription(
+        key=SENSOR_HOMEWORK_WEEK_KEY,
+        translation_key=SENSOR_HOMEWORK_WEEK_KEY,
+        icon="mdi:calendar-week",
+        # Today until Sunday of the current week
+        date_range=lambda today: (today, today + timedelta(days=6 - today.weekday())),
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class LibrusAttendanceSensorEntityDescription(SensorEntityDescription):
+    """Describes a Librus attendance sensor.
+
+    value_fn reads the sensor's value from a set of attendance counters; it is
+    applied to the overall counters for the state and to each subject's for
+    the by_subject attribute. details adds every overall counter and the
+    per-type counts as attributes.
+    """
+
+    value_fn: Callable[[AttendanceCounts], int | float | None]
+    details: bool = False
+
+
+ATTENDANCE_SENSORS: tuple[LibrusAttendanceSensorEntityDescription, ...] = (
+    LibrusAttendanceSensorEntityDescription(
+        key=SENSOR_ATTENDANCE_KEY,
+        translation_key=SENSOR_ATTENDANCE_KEY,
+        icon="mdi:account-check",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda counts: counts.attendance_percent,
+        details=True,
+    ),
+    LibrusAttendanceSensorEntityDescription(
+        key=SENSOR_ABSENCES_KEY,
+        translation_key=SENSOR_ABSENCES_KEY,
+        icon="mdi:account-off",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda counts: counts.absences,
+    ),
+    LibrusAttendanceSensorEntityDescription(
+        key=SENSOR_LATES_KEY,
+        translation_key=SENSOR_LATES_KEY,
+        icon="mdi:clock-alert",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda counts: counts.late,
+    ),
+    LibrusAttendanceSensorEntityDescription(
+        key=SENSOR_EXCUSED_KEY,
+        translation_key=SENSOR_EXCUSED_KEY,
+        icon="mdi:account-question",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda counts: counts.excused_percent,
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class LibrusMetricsSensorEntityDescription(SensorEntityDescription):
+    """Describes a diagnostic sensor read from the account's LibrusMetrics.
+
+    attributes_fn adds details (e.g. per-request timings) as attributes.
+    """
+
+    value_fn: Callable[[LibrusMetrics], int | float | None]
+    attributes_fn: Callable[[LibrusMetrics], dict[str, Any]] | None = None
+
+
+def _counter_sensor(key: str, icon: str) -> LibrusMetricsSensorEntityDescription:
+    """Describe a sensor showing the metrics counter named key."""
+    return LibrusMetricsSensorEntityDescription(
+        key=key,
+        translation_key=key,
+        icon=icon,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.counters[key],
+    )
+
+
+def _login_time(metrics: LibrusMetrics) -> float | None:
+    login = metrics.phases.get("login")
+    return login.duration if login else None
+
+
+def _login_steps(metrics: LibrusMetrics) -> dict[str, Any]:
+    return {
+        "steps": {
+            phase: timing.as_dict()
+            for phase, timing in metrics.phases.items()
+            if phase.startswith("auth step")
+        }
+    }
+
+
+def _last_call_time(metrics: LibrusMetrics) -> float | None:
+    if metrics.last_call is None:
+        return None
+    return metrics.calls[metrics.last_call].duration
+
+
+def _requests(metrics: LibrusMetrics) -> dict[str, Any]:
+    return {
+        "call": metrics.last_call,
+        "calls": {call: timing.as_dict() for call, timing in metrics.calls.items()},
+        "requests": {
+            phase: timing.as_dict()
+            for phase, timing in metrics.phases.items()
+            if not phase.startswith("auth step")
+        },
+    }
+
+
+METRICS_SENSORS: tuple[LibrusMetricsSensorEntityDescription, ...] = (
+    _counter_sensor(SENSOR_LOGINS_KEY, "mdi:login"),
+    _counter_sensor(SENSOR_RETRIES_KEY, "mdi:refresh"),
+    _counter_sensor(SENSOR_FAILURES_KEY, "mdi:alert-circle-outline"),
+    _counter_sensor(SENSOR_CACHE_HITS_KEY, "mdi:database-check"),
+    LibrusMetricsSensorEntityDescription(
+        key=SENSOR_LOGIN_TIME_KEY,
+        translation_key=SENSOR_LOGIN_TIME_KEY,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=2,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_login_time,
+        attributes_fn=_login_steps,
+    ),
+    LibrusMetricsSensorEntityDescription(
+        key=SENSOR_CALL_TIME_KEY,
+        translation_key=SENSOR_CALL_TIME_KEY,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=2,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_last_call_time,
+        attributes_fn=_requests,
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    """Set up Librus homework sensor from a config entry."""
-    coordinator: LibrusDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-    async_add_entities([HomeworkSensor(coordinator, entry)])
+    """Set up Librus sensors from a config entry."""
+    runtime_data: LibrusRuntimeData = hass.data[DOMAIN][entry.entry_id]
+    coordinator = runtime_data.homework
+    async_add_entities(
+        [
+            HomeworkSensor(coordinator, entry),
+            *(HomeworkSensor(coordinator, entry, description) for description in DAY_SENSORS),
+            NextLessonSensor(runtime_data.timetable, entry),
+            LatestGradeSensor(runtime_data.grades, entry),
+            LuckyNumberSensor(runtime_data.lucky_number, entry),
+            *(
+                AttendanceSensor(runtime_data.attendance, entry, description)
+                for description in ATTENDANCE_SENSORS
+            ),
+            *(
+                MetricsSensor(coordinator.session_manager.metrics, entry, description)
+                for description in METRICS_SENSORS
+            ),
+        ]
+    )
 
 
 class HomeworkSensor(CoordinatorEntity[LibrusDataUpdateCoordinator], SensorEntity):
     """Sensor showing homework entries from Librus.
 
-    State: count of homework entries (int).
-    Attributes: homework_entries list of dicts per data-model.md.
+    State: count of homework entries (int) in the description's date range.
+    Attributes: homework_entries list of dicts per data-model.md, built from
+    the coordinator's HomeworkEntry objects once per data update (and day).
+    In compact mode (options flow) the list is capped at COMPACT_MAX_ENTRIES
+    and content truncated, so state writes stay small; the day sensors only
+    list each entry's id, date and subject, in every mode. The full data is
+    available through the get_homework service. homework_entries is never
+    written to the recorder.
     Distinguishes 'no homework' (state=0, empty list) from
     'unavailable' (refresh failed, coordinator has no data).
     """
 
+    entity_description: LibrusHomeworkSensorEntityDescription
     _attr_has_entity_name = True
-    _attr_icon = "mdi:book-open-variant"
+    _unrecorded_attributes = frozenset({"homework_entries", "omitted_entries"})
 
     def __init__(
         self,
         coordinator: LibrusDataUpdateCoordinator,
         entry: ConfigEntry,
+        description: LibrusHomeworkSensorEntityDescription = HOMEWORK_SENSOR,
     ) -> None:
         """Initialize the homework sensor."""
         super().__init__(coordinator)
-        self._attr_unique_id = f"{entry.entry_id}_{SENSOR_HOMEWORK_KEY}"
-        self._attr_translation_key = SENSOR_HOMEWORK_KEY
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        # Serialized attributes and the data, (day, mode) they were built for
+        self._attributes_source: list[HomeworkEntry] | None = None
+        self._attributes_key: tuple[date, str] | None = None
+        self._attributes: dict[str, Any] = {"homework_entries": []}
+
+    async def async_added_to_hass(self) -> None:
+        """Re-evaluate day-based sensors when the date changes."""
+        await super().async_added_to_hass()
+        if self.entity_description.date_range is not None:
+            self.async_on_remove(
+                async_track_time_change(
+                    self.hass, self._async_handle_midnight, hour=0, minute=0, second=0
+                )
+            )
+
+    @callback
+    def _async_handle_midnight(self, now: datetime) -> None:
+        """Write state for the new day."""
+        self.async_write_ha_state()
+
+    def _entries(self) -> list[HomeworkEntry] | None:
+        """Return the coordinator entries in this sensor's date range."""
+        data = self.coordinator.data
+        date_range = self.entity_description.date_range
+        if data is None or date_range is None:
+            return data
+        first, last = date_range(dt_util.now().date())
+        return self.coordinator.date_index.between(first.isoformat(), last.isoformat())
 
     @property
     def native_value(self) -> int | None:
         """Return the count of homework entries, or None if unavailable."""
-        if self.coordinator.data is None:
+        entries = self._entries()
+        if entries is None:
             return None
-        return len(self.coordinator.data)
+        return len(entries)
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -62,4 +341,267 @@ class HomeworkSensor(CoordinatorEntity[LibrusDataUpdateCoordinator], SensorEntit
         data = self.coordinator.data
         if data is None:
             return {"homework_entries": []}
-        return {"homework_entries": data}
+        mode = self.coordinator.config_entry.options.get(
+            CONF_ATTRIBUTE_MODE, DEFAULT_ATTRIBUTE_MODE
+        )
+        key = (dt_util.now().date(), mode)
+        if data is not self._attributes_source or key != self._attributes_key:
+            self._attributes_source = data
+            self._attributes_key = key
+            entries = self._entries() or []
+            if self.entity_description.date_range is not None:
+                self._attributes = _reference_attributes(entries)
+            else:
+                self._attributes = _entries_attributes(entries, mode)
+        return self._attributes
+
+
+def _entries_attributes(entries: list[HomeworkEntry], mode: str) -> dict[str, Any]:
+    """Serialize entries for the homework_entries attribute in the given mode."""
+    if mode != ATTRIBUTE_MODE_COMPACT:
+        return {"homework_entries": [entry.as_dict() for entry in entries]}
+    upcoming = sorted(entries, key=lambda entry: (entry.date, entry.time_from or ""))
+    return {
+        "homework_entries": [
+            entry.as_dict(COMPACT_CONTENT_LENGTH)
+            for entry in upcoming[:COMPACT_MAX_ENTRIES]
+        ],
+        "omitted_entries": max(len(upcoming) - COMPACT_MAX_ENTRIES, 0),
+    }
+
+
+def _reference_attributes(entries: list[HomeworkEntry]) -> dict[str, Any]:
+    """Serialize entries for the day sensors: what is due when, without content."""
+    return {
+        "homework_entries": [
+            {"id": entry.id, "date": entry.date, "subject": entry.subject}
+            for entry in entries
+        ]
+    }
+
+
+class NextLessonSensor(CoordinatorEntity[LibrusTimetableCoordinator], SensorEntity):
+    """Sensor showing the current or next lesson from the Librus timetable.
+
+    State: subject of the lesson. Evaluated from the coordinator's cached
+    weeks and re-evaluated when that lesson ends, never with an API call.
+    """
+
+    _attr_has_entity_name = True
+    _attr_translation_key = SENSOR_NEXT_LESSON_KEY
+    _attr_icon = "mdi:school"
+
+    def __init__(
+        self,
+        coordinator: LibrusTimetableCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the next lesson sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry.entry_id}_{SENSOR_NEXT_LESSON_KEY}"
+        self._lesson: TimetableLesson | None = None
+        self._unsub_lesson_end: Callable[[], None] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Pick the lesson once added, and stop tracking its end on removal."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._async_cancel_lesson_end)
+        self._async_update_lesson()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Pick the lesson from the updated timetable."""
+        self._async_update_lesson()
+        super()._handle_coordinator_update()
+
+    @callback
+    def _async_cancel_lesson_end(self) -> None:
+        if self._unsub_lesson_end is not None:
+            self._unsub_lesson_end()
+            self._unsub_lesson_end = None
+
+    @callback
+    def _async_update_lesson(self) -> None:
+        """Select the current/next lesson and schedule re-evaluation at its end."""
+        self._async_cancel_lesson_end()
+        self._lesson = self.coordinator.next_lesson()
+        if self._lesson is not None:
+            self._unsub_lesson_end = async_track_point_in_time(
+                self.hass,
+                self._async_handle_lesson_end,
+                self._lesson.end(dt_util.get_default_time_zone()),
+            )
+
+    @callback
+    def _async_handle_lesson_end(self, now: datetime) -> None:
+        """Move on to the following lesson."""
+        self._unsub_lesson_end = None
+        self._async_update_lesson()
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> str | None:
+        """Return the subject of the current or next lesson."""
+        return self._lesson.subject if self._lesson else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the lesson details."""
+        return self._lesson.as_dict() if self._lesson else {}
+
+
+class LatestGradeSensor(CoordinatorEntity[LibrusGradesCoordinator], SensorEntity):
+    """Sensor showing the most recently added grade.
+
+    State: the grade value. Attributes: the grade details and the number of
+    grades held. Use the librus_new_grade event to react to every new grade.
+    """
+
+    _attr_has_entity_name = True
+    _attr_translation_key = SENSOR_LATEST_GRADE_KEY
+    _attr_icon = "mdi:school-outline"
+
+    def __init__(
+        self,
+        coordinator: LibrusGradesCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the latest grade sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry.entry_id}_{SENSOR_LATEST_GRADE_KEY}"
+
+    @property
+    def native_value(self) -> str | None:
+        """Return the value of the latest grade."""
+        return self.coordinator.data[-1].grade if self.coordinator.data else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the latest grade details and the grade count."""
+        if not self.coordinator.data:
+            return {}
+        return {
+            **self.coordinator.data[-1].as_dict(),
+            "grade_count": len(self.coordinator.data),
+        }
+
+
+class AttendanceSensor(CoordinatorEntity[LibrusAttendanceCoordinator], SensorEntity):
+    """Sensor showing one attendance figure, overall and per subject.
+
+    Reads the coordinator's precomputed AttendanceSummary counters, so a
+    state read costs one value per subject however many records are held.
+    """
+
+    entity_description: LibrusAttendanceSensorEntityDescription
+    _attr_has_entity_name = True
+    _unrecorded_attributes = frozenset({"by_subject", "by_type"})
+
+    def __init__(
+        self,
+        coordinator: LibrusAttendanceCoordinator,
+        entry: ConfigEntry,
+        description: LibrusAttendanceSensorEntityDescription,
+    ) -> None:
+        """Initialize the attendance sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+
+    @property
+    def native_value(self) -> int | float | None:
+        """Return the figure for all subjects."""
+        if self.coordinator.data is None:
+            return None
+        return self.entity_description.value_fn(self.coordinator.data.total)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the figure per subject (and all counters for details sensors)."""
+        summary = self.coordinator.data
+        if summary is None:
+            return {}
+        value_fn = self.entity_description.value_fn
+        attributes: dict[str, Any] = {}
+        if self.entity_description.details:
+            attributes.update(summary.total.as_dict())
+            attributes["by_type"] = dict(summary.by_type)
+        attributes["by_subject"] = {
+            subject: value_fn(counts)
+            for subject, counts in sorted(summary.by_subject.items())
+        }
+        return attributes
+
+
+class LuckyNumberSensor(CoordinatorEntity[LibrusLuckyNumberCoordinator], SensorEntity):
+    """Sensor showing the school's lucky number.
+
+    State: the number; the day it applies to is in lucky_number_day.
+    """
+
+    _attr_has_entity_name = True
+    _attr_translation_key = SENSOR_LUCKY_NUMBER_KEY
+    _attr_icon = "mdi:clover"
+
+    def __init__(
+        self,
+        coordinator: LibrusLuckyNumberCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the lucky number sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry.entry_id}_{SENSOR_LUCKY_NUMBER_KEY}"
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the lucky number."""
+        return self.coordinator.data.number if self.coordinator.data else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the day the number applies to."""
+        if not self.coordinator.data:
+            return {}
+        return {"lucky_number_day": self.coordinator.data.day}
+
+
+class MetricsSensor(SensorEntity):
+    """Diagnostic sensor showing one figure of the account's request metrics.
+
+    Written when a call to Librus (e.g. one resource refresh) finishes, so
+    where refresh time goes can be followed without debug logging. Disabled
+    by default; the full figures are also in the config entry diagnostics.
+    """
+
+    entity_description: LibrusMetricsSensorEntityDescription
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _unrecorded_attributes = frozenset({"steps", "calls", "requests"})
+
+    def __init__(
+        self,
+        metrics: LibrusMetrics,
+        entry: ConfigEntry,
+        description: LibrusMetricsSensorEntityDescription,
+    ) -> None:
+        """Initialize the metrics sensor."""
+        self.entity_description = description
+        self._metrics = metrics
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+
+    async def async_added_to_hass(self) -> None:
+        """Write state after each finished call."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._metrics.async_add_listener(self.async_write_ha_state))
+
+    @property
+    def native_value(self) -> int | float | None:
+        """Return the figure."""
+        return self.entity_description.value_fn(self._metrics)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the details, if the sensor has any."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self._metrics)
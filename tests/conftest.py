@@ -6,9 +6,17 @@ from unittest.mock import patch
 
 import pytest
 
+from homeassistant.config_entries import ConfigEntryState
 from homeassistant.core import HomeAssistant
 
 from custom_components.librus.const import CONF_PASSWORD, CONF_USERNAME, DOMAIN
+from custom_components.librus.librus_client import RetryPolicy
+from custom_components.librus.models import (
+    AttendanceRecord,
+    GradeEntry,
+    HomeworkEntry,
+    TimetableLesson,
+)
 
 # ---------------------------------------------------------------------------
 # Sample API response data (based on docs/postman/responses/)
@@ -80,6 +88,196 @@ SAMPLE_USERS_RESPONSE = {
     ]
 }
 
+SAMPLE_TIMETABLE_RESPONSE = {
+    "Timetable": {
+        "2026-02-16": [
+            [],
+            [
+                {
+                    "Lesson": {"Id": "4216953"},
+                    "LessonNo": "1",
+                    "HourFrom": "08:00",
+                    "HourTo": "08:45",
+                    "Subject": {"Id": "25678", "Name": "Historia", "Short": "hi"},
+                    "Teacher": {"Id": "1493507", "FirstName": "Krzysztof", "LastName": "Krupa"},
+                    "IsSubstitutionClass": False,
+                    "IsCanceled": False,
+                }
+            ],
+            [
+                {
+                    "Lesson": {"Id": "4216954"},
+                    "LessonNo": "2",
+                    "HourFrom": "08:55",
+                    "HourTo": "09:40",
+                    "Subject": {"Id": "25683", "Name": "Język polski", "Short": "jp"},
+                    "Teacher": {"Id": "1890192", "FirstName": "Anna", "LastName": "Kowalska"},
+                    "IsSubstitutionClass": True,
+                    "IsCanceled": False,
+                }
+            ],
+        ],
+        "2026-02-17": [
+            [
+                {
+                    "Lesson": {"Id": "4216960"},
+                    "LessonNo": "1",
+                    "HourFrom": "08:00",
+                    "HourTo": "08:45",
+                    "Subject": {"Id": "25678", "Name": "Historia", "Short": "hi"},
+                    "Teacher": {"Id": "1589959", "FirstName": None, "LastName": "Nowak"},
+                    "IsSubstitutionClass": False,
+                    "IsCanceled": True,
+                }
+            ],
+        ],
+        "2026-02-18": [],
+    }
+}
+
+SAMPLE_GRADES_RESPONSE = {
+    "Grades": [
+        {
+            "Id": 31000101,
+            "Lesson": {"Id": 4216953, "Url": "https://api.librus.pl/2.0/Lessons/4216953"},
+            "Subject": {"Id": 25678, "Url": "https://api.librus.pl/2.0/Subjects/25678"},
+            "Student": {"Id": 2501234, "Url": "https://api.librus.pl/2.0/Users/2501234"},
+            "Category": {"Id": 512001, "Url": "https://api.librus.pl/2.0/Grades/Categories/512001"},
+            "AddedBy": {"Id": 1493507, "Url": "https://api.librus.pl/2.0/Users/1493507"},
+            "Grade": "5",
+            "Date": "2026-02-10",
+            "AddDate": "2026-02-10 12:01:44",
+            "Semester": 2,
+            "IsConstituent": True,
+            "IsSemester": False,
+            "IsSemesterProposition": False,
+            "IsFinal": False,
+            "IsFinalProposition": False,
+        },
+        {
+            "Id": 31000245,
+            "Lesson": {"Id": 4216954, "Url": "https://api.librus.pl/2.0/Lessons/4216954"},
+            "Subject": {"Id": 25683, "Url": "https://api.librus.pl/2.0/Subjects/25683"},
+            "Student": {"Id": 2501234, "Url": "https://api.librus.pl/2.0/Users/2501234"},
+            "Category": {"Id": 512002, "Url": "https://api.librus.pl/2.0/Grades/Categories/512002"},
+            "AddedBy": {"Id": 1890192, "Url": "https://api.librus.pl/2.0/Users/1890192"},
+            "Grade": "3+",
+            "Date": "2026-02-17",
+            "AddDate": "2026-02-17 09:15:02",
+            "Semester": 2,
+            "IsConstituent": True,
+            "IsSemester": False,
+            "IsSemesterProposition": False,
+            "IsFinal": False,
+            "IsFinalProposition": False,
+            "Comments": [
+                {"Id": 880011, "Url": "https://api.librus.pl/2.0/Grades/Comments/880011"}
+            ],
+        },
+    ]
+}
+
+SAMPLE_GRADE_CATEGORIES_RESPONSE = {
+    "Categories": [
+        {"Id": 512001, "Name": "Sprawdzian", "Weight": 3, "CountToTheAverage": True},
+        {"Id": 512002, "Name": "Kartkówka", "Weight": 2, "CountToTheAverage": True},
+    ]
+}
+
+SAMPLE_GRADE_COMMENTS_RESPONSE = {
+    "Comments": [
+        {
+            "Id": 880011,
+            "AddedBy": {"Id": 1890192, "Url": "https://api.librus.pl/2.0/Users/1890192"},
+            "Grade": {"Id": 31000245, "Url": "https://api.librus.pl/2.0/Grades/31000245"},
+            "Text": "Poprawa do końca miesiąca",
+        }
+    ]
+}
+
+SAMPLE_LESSONS_RESPONSE = {
+    "Lessons": [
+        {
+            "Id": 4216953,
+            "Teacher": {"Id": 1493507, "Url": "https://api.librus.pl/2.0/Users/1493507"},
+            "Subject": {"Id": 25678, "Url": "https://api.librus.pl/2.0/Subjects/25678"},
+        },
+        {
+            "Id": 4216954,
+            "Teacher": {"Id": 1890192, "Url": "https://api.librus.pl/2.0/Users/1890192"},
+            "Subject": {"Id": 25683, "Url": "https://api.librus.pl/2.0/Subjects/25683"},
+            "Class": {"Id": 69300, "Url": "https://api.librus.pl/2.0/Classes/69300"},
+        },
+    ]
+}
+
+SAMPLE_ATTENDANCE_TYPES_RESPONSE = {
+    "Types": [
+        {"Id": 1, "Name": "Nieobecność", "Short": "nb", "Standard": True, "IsPresenceKind": False, "Order": 1},
+        {"Id": 2, "Name": "Spóźnienie", "Short": "sp", "Standard": True, "IsPresenceKind": True, "Order": 2},
+        {"Id": 3, "Name": "Nieobecność uspr.", "Short": "u", "Standard": True, "IsPresenceKind": False, "Order": 3},
+        {"Id": 100, "Name": "Obecność", "Short": "ob", "Standard": True, "IsPresenceKind": True, "Order": 5},
+        {
+            "Id": 1045,
+            "Name": "wycieczka",
+            "Short": "wy",
+            "Standard": False,
+            "IsPresenceKind": True,
+            "Order": 6,
+            "StandardType": {"Id": 100, "Url": "https://api.librus.pl/2.0/Attendances/Types/100"},
+        },
+    ]
+}
+
+SAMPLE_ATTENDANCES_RESPONSE = {
+    "Attendances": [
+        {
+            "Id": 600001,
+            "Lesson": {"Id": 4216953, "Url": "https://api.librus.pl/2.0/Lessons/4216953"},
+            "Student": {"Id": 2501234, "Url": "https://api.librus.pl/2.0/Users/2501234"},
+            "Date": "2026-02-16",
+            "AddDate": "2026-02-16 11:05:00",
+            "LessonNo": 1,
+            "Semester": 2,
+            "Type": {"Id": 100, "Url": "https://api.librus.pl/2.0/Attendances/Types/100"},
+            "AddedBy": {"Id": 1493507, "Url": "https://api.librus.pl/2.0/Users/1493507"},
+        },
+        {
+            "Id": 600002,
+            "Lesson": {"Id": 4216954, "Url": "https://api.librus.pl/2.0/Lessons/4216954"},
+            "Student": {"Id": 2501234, "Url": "https://api.librus.pl/2.0/Users/2501234"},
+            "Date": "2026-02-16",
+            "AddDate": "2026-02-16 12:05:00",
+            "LessonNo": 2,
+            "Semester": 2,
+            "Type": {"Id": 1, "Url": "https://api.librus.pl/2.0/Attendances/Types/1"},
+            "AddedBy": {"Id": 1493507, "Url": "https://api.librus.pl/2.0/Users/1493507"},
+        },
+        {
+            "Id": 600003,
+            "Lesson": {"Id": 4216953, "Url": "https://api.librus.pl/2.0/Lessons/4216953"},
+            "Student": {"Id": 2501234, "Url": "https://api.librus.pl/2.0/Users/2501234"},
+            "Date": "2026-02-16",
+            "AddDate": "2026-02-16 13:05:00",
+            "LessonNo": 3,
+            "Semester": 2,
+            "Type": {"Id": 2, "Url": "https://api.librus.pl/2.0/Attendances/Types/2"},
+            "AddedBy": {"Id": 1493507, "Url": "https://api.librus.pl/2.0/Users/1493507"},
+        },
+        {
+            "Id": 600004,
+            "Lesson": {"Id": 4216954, "Url": "https://api.librus.pl/2.0/Lessons/4216954"},
+            "Student": {"Id": 2501234, "Url": "https://api.librus.pl/2.0/Users/2501234"},
+            "Date": "2026-02-16",
+            "AddDate": "2026-02-16 14:05:00",
+            "LessonNo": 4,
+            "Semester": 2,
+            "Type": {"Id": 1045, "Url": "https://api.librus.pl/2.0/Attendances/Types/1045"},
+            "AddedBy": {"Id": 1493507, "Url": "https://api.librus.pl/2.0/Users/1493507"},
+        },
+    ]
+}
+
 
 @pytest.fixture
 def sample_homeworks():
@@ -105,6 +303,124 @@ def sample_users():
     return SAMPLE_USERS_RESPONSE
 
 
+@pytest.fixture
+def sample_timetable():
+    """Return sample Timetables API response (week of 2026-02-16)."""
+    return SAMPLE_TIMETABLE_RESPONSE
+
+
+@pytest.fixture
+def mock_timetable_lessons():
+    """Return the lessons parsed from the sample timetable."""
+    return [
+        TimetableLesson("2026-02-16", 1, "08:00", "08:45", "Historia", "Krzysztof Krupa"),
+        TimetableLesson(
+            "2026-02-16", 2, "08:55", "09:40", "Język polski", "Anna Kowalska",
+            is_substitution=True,
+        ),
+        TimetableLesson(
+            "2026-02-17", 1, "08:00", "08:45", "Historia", "Nowak", is_canceled=True
+        ),
+    ]
+
+
+@pytest.fixture
+def sample_grades():
+    """Return sample Grades API response."""
+    return SAMPLE_GRADES_RESPONSE
+
+
+@pytest.fixture
+def sample_grade_categories():
+    """Return sample Grades/Categories API response."""
+    return SAMPLE_GRADE_CATEGORIES_RESPONSE
+
+
+@pytest.fixture
+def sample_grade_comments():
+    """Return sample Grades/Comments API response."""
+    return SAMPLE_GRADE_COMMENTS_RESPONSE
+
+
+@pytest.fixture
+def mock_grade_entries():
+    """Return the grades resolved from the sample responses."""
+    return [
+        GradeEntry(
+            id=31000101,
+            date="2026-02-10",
+            add_date="2026-02-10 12:01:44",
+            subject="Historia",
+            grade="5",
+            category="Sprawdzian",
+            teacher="Krzysztof Krupa",
+            semester=2,
+            weight=3,
+        ),
+        GradeEntry(
+            id=31000245,
+            date="2026-02-17",
+            add_date="2026-02-17 09:15:02",
+            subject="Język polski",
+            grade="3+",
+            category="Kartkówka",
+            teacher="Anna Kowalska",
+            semester=2,
+            weight=2,
+            comment="Poprawa do końca miesiąca",
+        ),
+    ]
+
+
+@pytest.fixture
+def sample_lessons():
+    """Return sample Lessons API response."""
+    return SAMPLE_LESSONS_RESPONSE
+
+
+@pytest.fixture
+def sample_attendance_types():
+    """Return sample Attendances/Types API response."""
+    return SAMPLE_ATTENDANCE_TYPES_RESPONSE
+
+
+@pytest.fixture
+def sample_attendances():
+    """Return sample Attendances API response."""
+    return SAMPLE_ATTENDANCES_RESPONSE
+
+
+@pytest.fixture
+def mock_attendance_records():
+    """Return the records resolved from the sample attendance responses."""
+    return [
+        AttendanceRecord(600001, "2026-02-16", 1, "Historia", 100, "Obecność", "present", 2),
+        AttendanceRecord(600002, "2026-02-16", 2, "Język polski", 1, "Nieobecność", "absent", 2),
+        AttendanceRecord(600003, "2026-02-16", 3, "Historia", 2, "Spóźnienie", "late", 2),
+        AttendanceRecord(600004, "2026-02-16", 4, "Język polski", 1045, "wycieczka", "present", 2),
+    ]
+
+
+@pytest.fixture(autouse=True)
+def no_retry_backoff():
+    """Retry failed Librus requests without sleeping."""
+    with patch.object(RetryPolicy, "backoff", return_value=0):
+        yield
+
+
+@pytest.fixture
+async def unload_entries(hass: HomeAssistant, enable_custom_integrations):
+    """Allow setting Librus entries up; unload them after the test.
+
+    Unloading cancels the timers and tasks the entries started, which would
+    otherwise outlive the test.
+    """
+    yield
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if entry.state is ConfigEntryState.LOADED:
+            assert await hass.config_entries.async_unload(entry.entry_id)
+
+
 @pytest.fixture
 async def mock_config_entry(hass: HomeAssistant):
     """Create a mock config entry."""
@@ -126,28 +442,28 @@ async def mock_config_entry(hass: HomeAssistant):
 def mock_homework_entries():
     """Return expected resolved homework entries (matching sample data, only in-window ones)."""
     return [
-        {
-            "id": 6671271,
-            "date": "2026-02-20",
-            "subject": "Historia",
-            "creator": "Krzysztof Krupa",
-            "category": "inne wydarzenia",
-            "lesson_no": "1",
-            "time_from": "07:45:00",
-            "time_to": "08:30:00",
-            "content": "Kartkówka z chronologii",
-            "add_date": "2026-02-15 11:12:16",
-        },
-        {
-            "id": 6674588,
-            "date": "2026-02-22",
-            "subject": "Unknown",
-            "creator": "Nowak",
-            "category": "inne wydarzenia",
-            "lesson_no": "4",
-            "time_from": "10:30:00",
-            "time_to": "11:15:00",
-            "content": "Zajęcia profilaktyczne DEBATA",
-            "add_date": "2026-02-17 17:45:30",
-        },
+        HomeworkEntry(
+            id=6671271,
+            date="2026-02-20",
+            subject="Historia",
+            creator="Krzysztof Krupa",
+            category="inne wydarzenia",
+            lesson_no="1",
+            time_from="07:45:00",
+            time_to="08:30:00",
+            content="Kartkówka z chronologii",
+            add_date="2026-02-15 11:12:16",
+        ),
+        HomeworkEntry(
+            id=6674588,
+            date="2026-02-22",
+            subject="Unknown",
+            creator="Nowak",
+            category="inne wydarzenia",
+            lesson_no="4",
+            time_from="10:30:00",
+            time_to="11:15:00",
+            content="Zajęcia profilaktyczne DEBATA",
+            add_date="2026-02-17 17:45:30",
+        ),
     ]
@@ -0,0 +1,494 @@
+"""Offline stand-in for the Librus OAuth and Synergia API servers.
+
+Implements the five OAuth steps and serves the sample responses from
+docs/postman/responses, with configurable latency, payload scaling and fault
+injection; it counts the requests and bytes it serves. It runs in its own
+process so its allocations stay out of the client's memory measurements, and
+can be started by hand:
+
+    python -m tests.librus_server --port 8080 --homeworks 10000 --users 5000
+
+Tests start and control it through LibrusMockServer.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import hashlib
+import json
+import secrets
+import subprocess
+import sys
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import aiohttp
+from aiohttp import web
+
+ROOT = Path(__file__).parent.parent
+RESPONSES_DIR = ROOT / "docs" / "postman" / "responses"
+
+OAUTH_PATH = "/OAuth/Authorization"
+API_PATH = "/gateway/api/2.0"
+CONTROL_PATH = "/_mock"
+OAUTH_COOKIE = "oauth_state"
+SESSION_COOKIE = "DZIENNIKSID"
+USERNAME = "user"
+PASSWORD = "pass"
+USER_IDENTIFIER = "u123456"
+
+# API endpoint → sample response file
+RESPONSE_FILES = {
+    "HomeWorks": "Homeworks.json",
+    "HomeWorks/Categories": "Homeworks_Categories.json",
+    "Subjects": "Subjects.json",
+    "Users": "Users.json",
+    "Lessons": "Lessons.json",
+    "LuckyNumbers": "LuckyNumbers.json",
+    "Me": "Me.json",
+    "Schools": "Schools.json",
+    "Classes": "Classes.json",
+    "Classrooms": "Classrooms.json",
+    "UserProfile": "UserProfile.json",
+}
+
+
+def load_payloads() -> dict[str, dict[str, Any]]:
+    """Return the sample responses, by API endpoint."""
+    return {
+        endpoint: json.loads((RESPONSES_DIR / name).read_text(encoding="utf-8"))
+        for endpoint, name in RESPONSE_FILES.items()
+    }
+
+
+def scale_payloads(
+    payloads: dict[str, dict[str, Any]],
+    *,
+    homeworks: int | None = None,
+    users: int | None = None,
+    today: date | None = None,
+) -> None:
+    """Grow (or shrink) HomeWorks and Users to the given sizes in place.
+
+    Items are copies of the samples with new Ids. Homework is spread over the
+    30 days around today and refers to existing categories, subjects and
+    users, so every entry resolves.
+    """
+    if users is not None:
+        samples = payloads["Users"]["Users"]
+        first_id = max(user["Id"] for user in samples) + 1
+        payloads["Users"]["Users"] = [
+            {
+                **samples[index % len(samples)],
+                "Id": first_id + index,
+                "LastName": f"{samples[index % len(samples)].get('LastName', '')} {index}",
+            }
+            for index in range(users)
+        ]
+    if homeworks is not None:
+        today = today or date.today()
+        samples = payloads["HomeWorks"]["HomeWorks"]
+        category_ids = [item["Id"] for item in payloads["HomeWorks/Categories"]["Categories"]]
+        subject_ids = [item["Id"] for item in payloads["Subjects"]["Subjects"]]
+        user_ids = [item["Id"] for item in payloads["Users"]["Users"]]
+        first_id = max(homework["Id"] for homework in samples) + 1
+        payloads["HomeWorks"]["HomeWorks"] = [
+            {
+                **copy.deepcopy(samples[index % len(samples)]),
+                "Id": first_id + index,
+                "Date": (today + timedelta(days=index % 30 - 15)).isoformat(),
+                "Category": {"Id": category_ids[index % len(category_ids)]},
+                "Subject": {"Id": subject_ids[index % len(subject_ids)]},
+                "CreatedBy": {"Id": user_ids[index % len(user_ids)]},
+            }
+            for index in range(homeworks)
+        ]
+
+
+@dataclass(slots=True)
+class Fault:
+    """How requests to one endpoint misbehave.
+
+    status answers with that HTTP status, delay adds latency (seconds) and
+    disconnect drops the connection without answering. count limits the
+    fault to that many requests (None: every request).
+    """
+
+    status: int | None = None
+    delay: float = 0.0
+    disconnect: bool = False
+    count: int | None = None
+
+
+@dataclass(slots=True)
+class ServerStats:
+    """Requests (by endpoint), response body bytes and logins served."""
+
+    requests: Counter[str] = field(default_factory=Counter)
+    bytes_sent: int = 0
+    logins: int = 0
+
+    @property
+    def total_requests(self) -> int:
+        """Return the number of requests over all endpoints."""
+        return sum(self.requests.values())
+
+
+class _ServerState:
+    """Configuration, sessions and counters of a running mock server."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.payloads = load_payloads()
+        self.latency = 0.0
+        # Whether HomeWorks honours dateFrom/dateTo (otherwise HTTP 400)
+        self.date_range = True
+        self.faults: dict[str, Fault] = {}
+        self.stats = ServerStats()
+        # OAuth state cookie → whether the credentials were accepted
+        self.oauth_states: dict[str, bool] = {}
+        # Session cookie → whether API access was activated (step 5)
+        self.sessions: dict[str, bool] = {}
+        self._bodies: dict[tuple[str, str], tuple[bytes, str]] = {}
+
+    def body(self, endpoint: str, query: dict[str, str]) -> tuple[bytes, str]:
+        """Return the serialized response and its ETag, cached per query."""
+        key = (endpoint, json.dumps(query, sort_keys=True))
+        if (cached := self._bodies.get(key)) is None:
+            payload = self.payloads[endpoint]
+            if endpoint == "HomeWorks" and "dateFrom" in query:
+                low, high = query["dateFrom"], query.get("dateTo", "9999-12-31")
+                payload = {
+                    **payload,
+                    "HomeWorks": [
+                        item
+                        for item in payload["HomeWorks"]
+                        if low <= item.get("Date", "") <= high
+                    ],
+                }
+            body = json.dumps(payload, ensure_ascii=False).encode()
+            etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+            cached = self._bodies[key] = (body, etag)
+        return cached
+
+    def configure(self, config: dict[str, Any]) -> None:
+        if "latency" in config:
+            self.latency = config["latency"]
+        if "date_range" in config:
+            self.date_range = config["date_range"]
+        if "faults" in config:
+            self.faults = {
+                endpoint: Fault(**fault) for endpoint, fault in config["faults"].items()
+            }
+        if "scale" in config:
+            scale_payloads(self.payloads, **config["scale"])
+            self._bodies.clear()
+
+
+def _endpoint(path: str) -> str:
+    if path.startswith(API_PATH):
+        return path[len(API_PATH) + 1 :]
+    return path.lstrip("/")
+
+
+@web.middleware
+async def _mock_middleware(
+    request: web.Request,
+    handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+) -> web.StreamResponse:
+    """Apply latency and faults, and count what is served."""
+    if request.path.startswith(CONTROL_PATH):
+        return await handler(request)
+    state: _ServerState = request.app["state"]
+    endpoint = _endpoint(request.path)
+    state.stats.requests[endpoint] += 1
+    fault = state.faults.get(endpoint)
+    if fault is not None and fault.count is not None:
+        if fault.count <= 0:
+            fault = None
+        else:
+            fault.count -= 1
+    delay = state.latency + (fault.delay if fault else 0.0)
+    if delay:
+        await asyncio.sleep(delay)
+    if fault is not None and fault.disconnect:
+        assert request.transport is not None
+        request.transport.close()
+        raise asyncio.CancelledError
+    if fault is not None and fault.status is not None:
+        response: web.StreamResponse = web.Response(status=fault.status, text="fault")
+    else:
+        response = await handler(request)
+    if isinstance(response, web.Response) and response.body is not None:
+        state.stats.bytes_sent += len(response.body)
+    return response
+
+
+async def _oauth_init(request: web.Request) -> web.Response:
+    state: _ServerState = request.app["state"]
+    oauth_state = secrets.token_hex(8)
+    state.oauth_states[oauth_state] = False
+    response = web.Response(text="login form")
+    response.set_cookie(OAUTH_COOKIE, oauth_state)
+    return response
+
+
+async def _oauth_login(request: web.Request) -> web.Response:
+    state: _ServerState = request.app["state"]
+    oauth_state = request.cookies.get(OAUTH_COOKIE)
+    form = await request.post()
+    if (
+        oauth_state not in state.oauth_states
+        or form.get("login") != USERNAME
+        or form.get("pass") != PASSWORD
+    ):
+        return web.json_response(
+            {"errors": [{"message": "Nieprawidłowy login i/lub hasło."}]}
+        )
+    state.oauth_states[oauth_state] = True
+    state.stats.logins += 1
+    return web.json_response({"status": "ok", "goTo": OAUTH_PATH + "/Grant"})
+
+
+async def _oauth_grant(request: web.Request) -> web.Response:
+    state: _ServerState = request.app["state"]
+    if not state.oauth_states.pop(request.cookies.get(OAUTH_COOKIE, ""), False):
+        return web.Response(status=403, text="not logged in")
+    token = secrets.token_hex(16)
+    state.sessions[token] = False
+    response = web.Response(text="granted")
+    response.set_cookie(SESSION_COOKIE, token)
+    return response
+
+
+async def _token_info(request: web.Request) -> web.Response:
+    state: _ServerState = request.app["state"]
+    if request.cookies.get(SESSION_COOKIE) not in state.sessions:
+        return web.json_response({"Code": "TokenIsExpired"}, status=401)
+    return web.json_response({"UserIdentifier": USER_IDENTIFIER})
+
+
+async def _user_info(request: web.Request) -> web.Response:
+    state: _ServerState = request.app["state"]
+    token = request.cookies.get(SESSION_COOKIE, "")
+    if token not in state.sessions or request.match_info["user"] != USER_IDENTIFIER:
+        return web.json_response({"Code": "Unauthorized"}, status=401)
+    state.sessions[token] = True
+    return web.json_response({"User": {"Id": USER_IDENTIFIER}})
+
+
+async def _api(request: web.Request) -> web.Response:
+    state: _ServerState = request.app["state"]
+    if not state.sessions.get(request.cookies.get(SESSION_COOKIE, ""), False):
+        return web.json_response({"Code": "TokenIsExpired"}, status=401)
+    endpoint = request.match_info["endpoint"]
+    if endpoint not in state.payloads:
+        return web.json_response({"Code": "NotFound"}, status=404)
+    query = dict(request.query)
+    if endpoint == "HomeWorks" and query and not state.date_range:
+        return web.json_response({"Code": "InvalidParameter"}, status=400)
+    body, etag = state.body(endpoint, query)
+    if request.headers.get("If-None-Match") == etag:
+        return web.Response(status=304, headers={"ETag": etag})
+    return web.Response(body=body, content_type="application/json", headers={"ETag": etag})
+
+
+async def _control_config(request: web.Request) -> web.Response:
+    request.app["state"].configure(await request.json())
+    return web.json_response({})
+
+
+async def _control_reset(request: web.Request) -> web.Response:
+    request.app["state"].reset()
+    return web.json_response({})
+
+
+async def _control_reset_stats(request: web.Request) -> web.Response:
+    request.app["state"].stats = ServerStats()
+    return web.json_response({})
+
+
+async def _control_expire_sessions(request: web.Request) -> web.Response:
+    request.app["state"].sessions.clear()
+    return web.json_response({})
+
+
+async def _control_stats(request: web.Request) -> web.Response:
+    stats: ServerStats = request.app["state"].stats
+    # asdict() would rebuild the Counter from (key, value) pairs
+    return web.json_response(
+        {
+            "requests": dict(stats.requests),
+            "bytes_sent": stats.bytes_sent,
+            "logins": stats.logins,
+        }
+    )
+
+
+def create_app() -> web.Application:
+    """Create the mock server application."""
+    app = web.Application(middlewares=[_mock_middleware])
+    app["state"] = _ServerState()
+    app.router.add_get(OAUTH_PATH, _oauth_init)
+    app.router.add_post(OAUTH_PATH, _oauth_login)
+    app.router.add_get(f"{OAUTH_PATH}/Grant", _oauth_grant)
+    app.router.add_get(f"{API_PATH}/Auth/TokenInfo", _token_info)
+    app.router.add_get(f"{API_PATH}/Auth/UserInfo/{{user}}", _user_info)
+    app.router.add_get(f"{API_PATH}/{{endpoint:.+}}", _api)
+    app.router.add_post(f"{CONTROL_PATH}/config", _control_config)
+    app.router.add_post(f"{CONTROL_PATH}/reset", _control_reset)
+    app.router.add_post(f"{CONTROL_PATH}/reset_stats", _control_reset_stats)
+    app.router.add_post(f"{CONTROL_PATH}/expire_sessions", _control_expire_sessions)
+    app.router.add_get(f"{CONTROL_PATH}/stats", _control_stats)
+    return app
+
+
+async def _serve(port: int, config: dict[str, Any]) -> None:
+    app = create_app()
+    app["state"].configure(config)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", port)
+    await site.start()
+    # Tell the parent process (LibrusMockServer) where to connect
+    print(f"PORT {runner.addresses[0][1]}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+class LibrusMockServer:
+    """Run the mock server in a subprocess and control it over HTTP."""
+
+    def __init__(self) -> None:
+        """Initialize a stopped server."""
+        self._process: subprocess.Popen[str] | None = None
+        self.base_url = ""
+
+    def start(self) -> None:
+        """Start the server process and wait until it listens."""
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", "tests.librus_server", "--port", "0"],
+            cwd=ROOT,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        assert self._process.stdout is not None
+        line = self._process.stdout.readline()
+        if not line.startswith("PORT "):
+            self.stop()
+            raise RuntimeError(f"Librus mock server failed to start: {line!r}")
+        self.base_url = f"http://127.0.0.1:{line.split()[1]}"
+
+    def stop(self) -> None:
+        """Stop the server process."""
+        if self._process is not None:
+            self._process.terminate()
+            self._process.wait(timeout=10)
+            self._process = None
+
+    @property
+    def oauth_url(self) -> str:
+        """Return the stand-in for LIBRUS_OAUTH_URL."""
+        return f"{self.base_url}{OAUTH_PATH}"
+
+    @property
+    def api_url(self) -> str:
+        """Return the stand-in for LIBRUS_API_URL."""
+        return f"{self.base_url}{API_PATH}"
+
+    @contextmanager
+    def patch_client(self) -> Iterator[None]:
+        """Point librus_client at this server."""
+        with patch.multiple(
+            "custom_components.librus.librus_client",
+            LIBRUS_OAUTH_URL=self.oauth_url,
+            LIBRUS_OAUTH_GRANT_URL=f"{self.oauth_url}/Grant",
+            LIBRUS_API_URL=self.api_url,
+        ):
+            yield
+
+    async def _async_control(
+        self, method: str, action: str, payload: dict[str, Any] | None = None
+    ) -> Any:
+        async with aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=10), raise_for_status=True
+        ) as session, session.request(
+            method, f"{self.base_url}{CONTROL_PATH}/{action}", json=payload
+        ) as response:
+            return await response.json()
+
+    async def async_reset(self) -> None:
+        """Restore the sample payloads and drop faults, sessions and counters."""
+        await self._async_control("POST", "reset")
+
+    async def async_configure(
+        self,
+        *,
+        latency: float | None = None,
+        date_range: bool | None = None,
+        homeworks: int | None = None,
+        users: int | None = None,
+    ) -> None:
+        """Set the per-request latency, HomeWorks date range support or payload sizes."""
+        config: dict[str, Any] = {}
+        if latency is not None:
+            config["latency"] = latency
+        if date_range is not None:
+            config["date_range"] = date_range
+        if homeworks is not None or users is not None:
+            config["scale"] = {"homeworks": homeworks, "users": users}
+        await self._async_control("POST", "config", config)
+
+    async def async_inject_faults(self, faults: dict[str, Fault]) -> None:
+        """Replace the faults, by endpoint (e.g. "Users" or "OAuth/Authorization")."""
+        await self._async_control(
+            "POST",
+            "config",
+            {"faults": {endpoint: asdict(fault) for endpoint, fault in faults.items()}},
+        )
+
+    async def async_expire_sessions(self) -> None:
+        """Invalidate every logged-in session, as Librus does after a while."""
+        await self._async_control("POST", "expire_sessions")
+
+    async def async_reset_stats(self) -> None:
+        """Zero the request, byte and login counters."""
+        await self._async_control("POST", "reset_stats")
+
+    async def async_stats(self) -> ServerStats:
+        """Return the counters since the last reset."""
+        data = await self._async_control("GET", "stats")
+        return ServerStats(Counter(data["requests"]), data["bytes_sent"], data["logins"])
+
+
+def main() -> None:
+    """Run the mock server until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--homeworks", type=int)
+    parser.add_argument("--users", type=int)
+    args = parser.parse_args()
+    config: dict[str, Any] = {"latency": args.latency}
+    if args.homeworks is not None or args.users is not None:
+        config["scale"] = {"homeworks": args.homeworks, "users": args.users}
+    try:
+        asyncio.run(_serve(args.port, config))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
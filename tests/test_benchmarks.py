@@ -0,0 +1,406 @@
+"""End-to-end refresh and startup benchmarks against the offline Librus server.
+
+Each refresh benchmark runs a homework refresh against tests/librus_server.py
+and records its wall time, request count, bytes served and the client's peak
+traced memory; the startup benchmarks time importing the integration and
+setting up a config entry. The figures are printed after the module runs. The budgets
+asserted here are deliberately loose: they catch regressions such as extra
+requests, lost request overlap or a payload held in memory several times,
+not normal machine-to-machine variance.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from dataclasses import dataclass
+from typing import Any, TypeVar
+from unittest.mock import AsyncMock, patch
+
+import aiohttp
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.librus.cache import LookupCache
+from custom_components.librus.const import (
+    CONF_PASSWORD,
+    CONF_SCHOOL_ID,
+    CONF_USERNAME,
+    DOMAIN,
+    LOOKUP_CACHE_TTLS,
+)
+from custom_components.librus.librus_client import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    DEFAULT_RETRY,
+    AsyncLibrusSessionManager,
+    LibrusCircuitOpenError,
+    LibrusConnectionError,
+    async_fetch_homework_data,
+)
+from tests.librus_server import PASSWORD, ROOT, USERNAME, Fault, LibrusMockServer
+
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+_T = TypeVar("_T")
+
+# OAuth steps of one login and data calls of a cold homework refresh
+LOGIN_REQUESTS = 5
+HOMEWORK_REQUESTS = 4
+# Peak traced memory of a refresh of the large school (about 30 MiB today)
+LARGE_REFRESH_MEMORY_BUDGET = 64 * 1024 * 1024
+
+# Home Assistant modules the integration imports: loaded before the timer
+# starts, so only the integration's own modules are measured
+HOME_ASSISTANT_MODULES = (
+    "homeassistant.components.calendar",
+    "homeassistant.components.diagnostics",
+    "homeassistant.components.sensor",
+    "homeassistant.helpers.aiohttp_client",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.event",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.update_coordinator",
+)
+INTEGRATION_MODULES = (
+    "custom_components.librus",
+    "custom_components.librus.calendar",
+    "custom_components.librus.config_flow",
+    "custom_components.librus.diagnostics",
+    "custom_components.librus.sensor",
+)
+# Importing every module of the integration (about 80 ms today)
+IMPORT_TIME_BUDGET = 0.5
+# Run in a fresh interpreter: argv[1] the modules to preload, argv[2] the
+# ones to measure, argv[3] "trace" to trace memory; prints the wall time and
+# the peak traced memory (0 untraced)
+_IMPORT_SCRIPT = """
+import importlib, sys, time, tracemalloc
+for name in sys.argv[1].split(","):
+    importlib.import_module(name)
+if sys.argv[3] == "trace":
+    tracemalloc.start()
+started = time.perf_counter()
+for name in sys.argv[2].split(","):
+    importlib.import_module(name)
+print(time.perf_counter() - started, tracemalloc.get_traced_memory()[1])
+"""
+
+
+@dataclass(slots=True)
+class BenchmarkResult:
+    """What one refresh cost."""
+
+    name: str
+    wall_time: float
+    requests: int
+    bytes_sent: int
+    peak_memory: int
+
+    def __str__(self) -> str:
+        """Return the result as a report line."""
+        return (
+            f"{self.name:<38} {self.wall_time * 1000:>9.1f} ms {self.requests:>5} req "
+            f"{self.bytes_sent / 1024:>10.1f} KiB {self.peak_memory / 1024 / 1024:>8.2f} MiB"
+        )
+
+
+@pytest.fixture(scope="module")
+def librus_server() -> Iterator[LibrusMockServer]:
+    """Run one mock server process for the module."""
+    server = LibrusMockServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope="module")
+def benchmark_results(request: pytest.FixtureRequest) -> Iterator[list[BenchmarkResult]]:
+    """Collect the results and print them once the module is done."""
+    results: list[BenchmarkResult] = []
+    yield results
+    reporter = request.config.pluginmanager.get_plugin("terminalreporter")
+    if reporter is not None and results:
+        reporter.write_sep("-", "Librus refresh benchmarks")
+        for result in results:
+            reporter.write_line(str(result))
+
+
+@pytest.fixture
+async def server(librus_server: LibrusMockServer) -> AsyncIterator[LibrusMockServer]:
+    """Return the mock server reset to the samples, with the client pointed at it."""
+    await librus_server.async_reset()
+    with librus_server.patch_client():
+        yield librus_server
+
+
+@pytest.fixture
+async def session_manager() -> Any:
+    """Return a session manager on a fresh cookie jar (IP hosts allowed)."""
+    async with aiohttp.ClientSession(cookie_jar=aiohttp.CookieJar(unsafe=True)) as session:
+        yield AsyncLibrusSessionManager(session, USERNAME, PASSWORD)
+
+
+async def _measure(
+    name: str,
+    server: LibrusMockServer,
+    results: list[BenchmarkResult],
+    operation: Callable[[], Awaitable[_T]],
+) -> tuple[BenchmarkResult, _T]:
+    """Run operation once and record what it cost."""
+    await server.async_reset_stats()
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        value = await operation()
+        wall_time = time.perf_counter() - started
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    stats = await server.async_stats()
+    result = BenchmarkResult(
+        name, wall_time, stats.total_requests, stats.bytes_sent, peak_memory
+    )
+    results.append(result)
+    return result, value
+
+
+class TestHomeworkRefresh:
+    """Benchmarks for async_fetch_homework_data."""
+
+    async def test_cold_refresh(self, server, session_manager, benchmark_results):
+        await server.async_configure(homeworks=200)
+
+        result, entries = await _measure(
+            "cold refresh",
+            server,
+            benchmark_results,
+            lambda: async_fetch_homework_data(
+                session_manager, cache=LookupCache(LOOKUP_CACHE_TTLS)
+            ),
+        )
+
+        assert entries
+        assert result.requests == LOGIN_REQUESTS + HOMEWORK_REQUESTS
+        assert (await server.async_stats()).logins == 1
+
+    async def test_warm_refresh_only_fetches_homework(
+        self, server, session_manager, benchmark_results
+    ):
+        await server.async_configure(homeworks=200)
+        cache = LookupCache(LOOKUP_CACHE_TTLS)
+        await async_fetch_homework_data(session_manager, cache=cache)
+
+        result, entries = await _measure(
+            "warm refresh",
+            server,
+            benchmark_results,
+            lambda: async_fetch_homework_data(session_manager, cache=cache),
+        )
+
+        assert entries
+        assert (await server.async_stats()).requests == {"HomeWorks": 1}
+
+    async def test_unchanged_refresh_transfers_nothing(
+        self, server, session_manager, benchmark_results
+    ):
+        await server.async_configure(homeworks=200)
+        cache = LookupCache(LOOKUP_CACHE_TTLS)
+        await async_fetch_homework_data(session_manager, cache=cache, if_changed=True)
+
+        result, entries = await _measure(
+            "unchanged refresh",
+            server,
+            benchmark_results,
+            lambda: async_fetch_homework_data(session_manager, cache=cache, if_changed=True),
+        )
+
+        assert entries is None
+        assert result.requests == 1
+        assert result.bytes_sent == 0
+
+    async def test_large_school_refresh(self, server, session_manager, benchmark_results):
+        await server.async_configure(users=5_000, homeworks=10_000)
+
+        result, entries = await _measure(
+            "cold refresh, 10k homework, 5k users",
+            server,
+            benchmark_results,
+            lambda: async_fetch_homework_data(
+                session_manager, cache=LookupCache(LOOKUP_CACHE_TTLS)
+            ),
+        )
+
+        assert len(entries) > 5_000
+        assert result.requests == LOGIN_REQUESTS + HOMEWORK_REQUESTS
+        assert result.wall_time < 10
+        assert result.peak_memory < LARGE_REFRESH_MEMORY_BUDGET
+
+    async def test_data_requests_overlap(self, server, benchmark_results):
+        async def cold_refresh() -> Any:
+            async with aiohttp.ClientSession(
+                cookie_jar=aiohttp.CookieJar(unsafe=True)
+            ) as session:
+                return await async_fetch_homework_data(
+                    AsyncLibrusSessionManager(session, USERNAME, PASSWORD)
+                )
+
+        # The same refresh without latency: what the client itself spends
+        baseline, _ = await _measure("cold refresh, no latency", server, [], cold_refresh)
+        latency = 0.1
+        await server.async_configure(latency=latency)
+
+        result, _ = await _measure(
+            f"cold refresh, {latency * 1000:.0f} ms latency",
+            server,
+            benchmark_results,
+            cold_refresh,
+        )
+
+        # Login steps are sequential; the data calls run concurrently
+        sequential = (LOGIN_REQUESTS + HOMEWORK_REQUESTS) * latency
+        assert result.wall_time - baseline.wall_time < sequential - latency
+
+
+class TestFaults:
+    """The client against injected faults."""
+
+    async def test_expired_session_logs_in_again_once(self, server, session_manager):
+        await async_fetch_homework_data(session_manager)
+        await server.async_expire_sessions()
+        await server.async_reset_stats()
+
+        await async_fetch_homework_data(session_manager)
+
+        assert (await server.async_stats()).logins == 1
+
+    async def test_server_error(self, server, session_manager):
+        await server.async_inject_faults({"Users": Fault(status=500)})
+
+        with pytest.raises(LibrusConnectionError):
+            await async_fetch_homework_data(session_manager)
+        assert (await server.async_stats()).requests["Users"] == DEFAULT_RETRY.attempts
+
+    async def test_dropped_connection(self, server, session_manager):
+        await server.async_inject_faults({"HomeWorks": Fault(disconnect=True)})
+
+        with pytest.raises(LibrusConnectionError):
+            await async_fetch_homework_data(session_manager)
+
+    async def test_transient_fault_is_retried(self, server, session_manager):
+        await server.async_inject_faults(
+            {"HomeWorks": Fault(status=503, count=1), "Users": Fault(disconnect=True, count=1)}
+        )
+
+        assert await async_fetch_homework_data(session_manager) is not None
+        assert (await server.async_stats()).requests["HomeWorks"] == 2
+        assert (await server.async_stats()).requests["Users"] == 2
+
+    async def test_outage_opens_circuit_breaker(self, server, session_manager):
+        await server.async_inject_faults({"HomeWorks": Fault(status=503)})
+        for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+            with pytest.raises(LibrusConnectionError):
+                await async_fetch_homework_data(session_manager)
+        await server.async_reset_stats()
+
+        with pytest.raises(LibrusCircuitOpenError):
+            await async_fetch_homework_data(session_manager)
+        assert (await server.async_stats()).total_requests == 0
+
+    async def test_date_range_not_supported(self, server, session_manager):
+        await server.async_configure(date_range=False, homeworks=200)
+
+        entries = await async_fetch_homework_data(session_manager)
+
+        assert entries
+        assert (await server.async_stats()).requests["HomeWorks"] == 2
+        assert session_manager.homeworks_date_range is False
+
+
+class TestStartup:
+    """Benchmarks for loading the integration and setting up an entry."""
+
+    async def test_import_time(self, benchmark_results):
+        def run(mode: str) -> tuple[float, int]:
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    "-c",
+                    _IMPORT_SCRIPT,
+                    ",".join(HOME_ASSISTANT_MODULES),
+                    ",".join(INTEGRATION_MODULES),
+                    mode,
+                ],
+                cwd=ROOT,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            wall_time, peak_memory = output.split()
+            return float(wall_time), int(peak_memory)
+
+        # The traced run also compiles the bytecode, so the timed run starts
+        # from a warm cache like Home Assistant does
+        _, peak_memory = run("trace")
+        wall_time, _ = run("time")
+
+        result = BenchmarkResult("import integration", wall_time, 0, 0, peak_memory)
+        benchmark_results.append(result)
+
+        assert result.wall_time < IMPORT_TIME_BUDGET
+
+    async def test_setup_does_not_wait_for_librus(
+        self, hass: HomeAssistant, enable_custom_integrations, server, benchmark_results
+    ):
+        latency = 0.2
+        await server.async_configure(latency=latency)
+        entry = MockConfigEntry(
+            version=2,
+            minor_version=2,
+            domain=DOMAIN,
+            data={CONF_USERNAME: USERNAME, CONF_PASSWORD: PASSWORD},
+        )
+        entry.add_to_hass(hass)
+        sessions: list[aiohttp.ClientSession] = []
+
+        def create_session(hass: HomeAssistant, **kwargs: Any) -> aiohttp.ClientSession:
+            """Return a session whose cookie jar accepts the server's IP host."""
+            sessions.append(
+                aiohttp.ClientSession(cookie_jar=aiohttp.CookieJar(unsafe=True))
+            )
+            return sessions[-1]
+
+        try:
+            with patch(
+                "custom_components.librus.registry.async_create_clientsession",
+                side_effect=create_session,
+            ), patch.object(
+                hass.config_entries, "async_forward_entry_setups", new_callable=AsyncMock
+            ):
+                result, loaded = await _measure(
+                    f"setup, no snapshot, {latency * 1000:.0f} ms latency",
+                    server,
+                    benchmark_results,
+                    lambda: hass.config_entries.async_setup(entry.entry_id),
+                )
+                # The first refresh follows in the background
+                await hass.async_block_till_done(wait_background_tasks=True)
+            # The mock server has no grades, attendance or timetable; those
+            # refreshes fail and only the homework one is checked
+            runtime_data = hass.data[DOMAIN][entry.entry_id]
+
+            assert loaded
+            assert result.wall_time < latency
+            assert runtime_data.homework.last_update_success
+            assert runtime_data.homework.data is not None
+            assert entry.data[CONF_SCHOOL_ID]
+            assert (await server.async_stats()).logins == 1
+        finally:
+            await hass.config_entries.async_unload(entry.entry_id)
+            for session in sessions:
+                await session.close()
@@ -0,0 +1,117 @@
+"""Tests for the Librus lookup cache (cache.py)."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+from custom_components.librus.cache import LookupCache, WeekCache
+
+TTLS = {"Subjects": timedelta(days=1), "Users": timedelta(hours=1)}
+
+
+class TestLookupCache:
+    """Tests for per-resource TTL caching."""
+
+    def test_returns_none_when_empty(self):
+        cache = LookupCache(TTLS)
+        assert cache.get("Subjects") is None
+
+    def test_returns_cached_value_within_ttl(self):
+        cache = LookupCache(TTLS)
+        cache.set("Subjects", {1: "Historia"})
+        assert cache.get("Subjects") == {1: "Historia"}
+
+    def test_each_resource_has_own_ttl(self):
+        cache = LookupCache(TTLS)
+        with patch("custom_components.librus.cache.time.time", return_value=1000.0):
+            cache.set("Subjects", {1: "Historia"})
+            cache.set("Users", {2: "Anna Kowalska"})
+
+        two_hours_later = 1000.0 + 2 * 3600
+        with patch("custom_components.librus.cache.time.time", return_value=two_hours_later):
+            assert cache.get("Subjects") == {1: "Historia"}
+            assert cache.get("Users") is None
+
+    def test_resource_without_ttl_is_not_cached(self):
+        cache = LookupCache(TTLS)
+        cache.set("HomeWorks", {"HomeWorks": []})
+        assert cache.get("HomeWorks") is None
+
+    def test_invalidate_single_resource(self):
+        cache = LookupCache(TTLS)
+        cache.set("Subjects", {1: "Historia"})
+        cache.set("Users", {2: "Anna Kowalska"})
+
+        cache.invalidate("Users")
+
+        assert cache.get("Subjects") == {1: "Historia"}
+        assert cache.get("Users") is None
+
+    def test_invalidate_all(self):
+        cache = LookupCache(TTLS)
+        cache.set("Subjects", {1: "Historia"})
+        cache.set("Users", {2: "Anna Kowalska"})
+
+        cache.invalidate()
+
+        assert cache.get("Subjects") is None
+        assert cache.get("Users") is None
+
+    def test_restore_keeps_newer_entry(self):
+        cache = LookupCache(TTLS)
+        with patch("custom_components.librus.cache.time.time", return_value=2000.0):
+            cache.set("Subjects", {1: "Historia"})
+
+        cache.restore(
+            {
+                "Subjects": {"value": {"1": "Stara historia"}, "stored_at": 1000.0},
+                "Users": {"value": {"2": "Anna Kowalska"}, "stored_at": 1000.0},
+            }
+        )
+
+        assert cache.as_dict()["Subjects"]["value"] == {1: "Historia"}
+        assert cache.as_dict()["Users"]["value"] == {2: "Anna Kowalska"}
+
+
+def _timestamp(value: str) -> float:
+    return datetime.fromisoformat(value).timestamp()
+
+
+class TestWeekCache:
+    """Tests for the per-week timetable cache."""
+
+    WEEK = date(2026, 2, 16)
+
+    def test_current_week_expires_after_ttl(self):
+        cache = WeekCache(timedelta(hours=6))
+        with patch("custom_components.librus.cache.time.time", return_value=_timestamp("2026-02-18T08:00")):
+            cache.set(self.WEEK, ["lesson"])
+        with patch("custom_components.librus.cache.time.time", return_value=_timestamp("2026-02-18T13:00")):
+            assert cache.get(self.WEEK) == ["lesson"]
+        with patch("custom_components.librus.cache.time.time", return_value=_timestamp("2026-02-18T15:00")):
+            assert cache.get(self.WEEK) is None
+
+    def test_week_fetched_after_it_ended_never_expires(self):
+        cache = WeekCache(timedelta(hours=6))
+        with patch("custom_components.librus.cache.time.time", return_value=_timestamp("2026-02-23T08:00")):
+            cache.set(self.WEEK, ["lesson"])
+        with patch("custom_components.librus.cache.time.time", return_value=_timestamp("2026-06-01T08:00")):
+            assert cache.get(self.WEEK) == ["lesson"]
+        assert cache.is_final(self.WEEK)
+
+    def test_week_fetched_while_running_is_not_final(self):
+        cache = WeekCache(timedelta(hours=6))
+        with patch("custom_components.librus.cache.time.time", return_value=_timestamp("2026-02-20T08:00")):
+            cache.set(self.WEEK, ["lesson"])
+        assert not cache.is_final(self.WEEK)
+
+    def test_round_trip(self):
+        cache = WeekCache(timedelta(hours=6))
+        cache.set(self.WEEK, [1, 2])
+        restored = WeekCache(timedelta(hours=6))
+
+        restored.restore(cache.as_dict(lambda value: [str(item) for item in value]), lambda value: [int(item) for item in value])
+
+        assert restored.get(self.WEEK) == [1, 2]
+        assert cache.as_dict(list)["2026-02-16"]["value"] == [1, 2]
@@ -0,0 +1,114 @@
+"""Tests for the Librus homework and timetable calendars."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.librus.calendar import HomeworkCalendar, TimetableCalendar
+from custom_components.librus.coordinator import (
+    LibrusDataUpdateCoordinator,
+    LibrusTimetableCoordinator,
+)
+from custom_components.librus.models import HomeworkEntry
+
+
+@pytest.fixture
+async def calendar(hass: HomeAssistant, mock_config_entry, mock_homework_entries):
+    """Create a calendar over the sample homework entries."""
+    coordinator = LibrusDataUpdateCoordinator(hass, mock_config_entry)
+    coordinator.data = [
+        *mock_homework_entries,
+        HomeworkEntry(7000001, "2026-02-24", "Matematyka", "Nowak", "kartkówka"),
+    ]
+    return HomeworkCalendar(coordinator, mock_config_entry)
+
+
+def _local(value: str) -> datetime:
+    return dt_util.as_local(dt_util.parse_datetime(value).replace(tzinfo=dt_util.get_default_time_zone()))
+
+
+class TestHomeworkCalendar:
+    """Tests for the HomeworkCalendar entity."""
+
+    async def test_events_in_range(self, hass: HomeAssistant, calendar):
+        events = await calendar.async_get_events(
+            hass, _local("2026-02-20 00:00:00"), _local("2026-02-23 00:00:00")
+        )
+
+        assert [event.uid for event in events] == ["6671271", "6674588"]
+        first = events[0]
+        assert first.summary == "Historia: inne wydarzenia"
+        assert first.start == _local("2026-02-20 07:45:00")
+        assert first.end == _local("2026-02-20 08:30:00")
+        assert first.description == "Lesson 1\nKartkówka z chronologii"
+
+    async def test_entry_without_times_is_all_day(self, hass: HomeAssistant, calendar):
+        events = await calendar.async_get_events(
+            hass, _local("2026-02-24 00:00:00"), _local("2026-02-25 00:00:00")
+        )
+
+        assert len(events) == 1
+        assert events[0].all_day is True
+        assert events[0].start == date(2026, 2, 24)
+        assert events[0].end == date(2026, 2, 25)
+
+    async def test_excludes_events_ending_before_window(self, hass: HomeAssistant, calendar):
+        events = await calendar.async_get_events(
+            hass, _local("2026-02-20 09:00:00"), _local("2026-02-21 00:00:00")
+        )
+
+        assert events == []
+
+    async def test_event_is_next_upcoming(self, calendar, freezer):
+        freezer.move_to(_local("2026-02-20 09:00:00"))
+
+        assert calendar.event.uid == "6674588"
+
+    async def test_no_event_without_data(self, calendar):
+        calendar.coordinator.data = None
+        assert calendar.event is None
+
+    async def test_unique_id(self, calendar):
+        assert calendar.unique_id == "test_entry_id_homework"
+
+
+@pytest.fixture
+async def timetable_calendar(hass: HomeAssistant, mock_config_entry, mock_timetable_lessons):
+    """Create a timetable calendar over the sample lessons."""
+    coordinator = LibrusTimetableCoordinator(hass, mock_config_entry, Mock())
+    coordinator.async_get_lessons = AsyncMock(return_value=mock_timetable_lessons)
+    return TimetableCalendar(coordinator, mock_config_entry)
+
+
+class TestTimetableCalendar:
+    """Tests for the TimetableCalendar entity."""
+
+    async def test_events_for_lessons(self, hass: HomeAssistant, timetable_calendar):
+        events = await timetable_calendar.async_get_events(
+            hass, _local("2026-02-16 00:00:00"), _local("2026-02-18 00:00:00")
+        )
+
+        assert [event.summary for event in events] == [
+            "Historia",
+            "Język polski (substitution)",
+            "Historia (canceled)",
+        ]
+        assert events[0].start == _local("2026-02-16 08:00:00")
+        assert events[0].end == _local("2026-02-16 08:45:00")
+        assert events[0].description == "Lesson 1, Krzysztof Krupa"
+        timetable_calendar.coordinator.async_get_lessons.assert_awaited_once_with(
+            date(2026, 2, 16), date(2026, 2, 18)
+        )
+
+    async def test_excludes_lessons_outside_window(self, hass: HomeAssistant, timetable_calendar):
+        events = await timetable_calendar.async_get_events(
+            hass, _local("2026-02-16 08:50:00"), _local("2026-02-17 00:00:00")
+        )
+
+        assert [event.summary for event in events] == ["Język polski (substitution)"]
@@ -1,21 +1,46 @@
-"""Tests for the Librus DataUpdateCoordinator."""
+"""Tests for the Librus DataUpdateCoordinators."""
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, patch
+import time
+from dataclasses import replace
+from datetime import date, timedelta
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    async_fire_time_changed,
+)
 
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from custom_components.librus.coordinator import LibrusDataUpdateCoordinator
+from custom_components.librus.const import (
+    DOMAIN,
+    EVENT_HOMEWORK_ADDED,
+    EVENT_HOMEWORK_CHANGED,
+    EVENT_HOMEWORK_REMOVED,
+    EVENT_NEW_GRADE,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    TIMETABLE_MAX_QUERY_WEEKS,
+)
+from custom_components.librus.coordinator import (
+    LibrusAttendanceCoordinator,
+    LibrusDataUpdateCoordinator,
+    LibrusGradesCoordinator,
+    LibrusLuckyNumberCoordinator,
+    LibrusTimetableCoordinator,
+)
 from custom_components.librus.librus_client import (
     LibrusAuthError,
     LibrusConnectionError,
     LibrusTimeoutError,
 )
+from custom_components.librus.models import AttendanceCounts, AttendanceSummary, LuckyNumber
 
 
 @pytest.fixture
@@ -30,19 +55,19 @@ class TestLibrusDataUpdateCoordinator:
     async def test_successful_refresh(self, hass: HomeAssistant, coordinator, mock_homework_entries):
         """Test successful data fetch returns homework entries."""
         with patch(
-            "custom_components.librus.coordinator.fetch_homework_data",
+            "custom_components.librus.coordinator.async_fetch_homework_data",
             return_value=mock_homework_entries,
         ):
             data = await coordinator._async_update_data()
 
         assert len(data) == 2
-        assert data[0]["id"] == 6671271
-        assert data[1]["id"] == 6674588
+        assert data[0].id == 6671271
+        assert data[1].id == 6674588
 
     async def test_auth_error_raises_config_entry_auth_failed(self, hass: HomeAssistant, coordinator):
         """Test that LibrusAuthError maps to ConfigEntryAuthFailed."""
         with patch(
-            "custom_components.librus.coordinator.fetch_homework_data",
+            "custom_components.librus.coordinator.async_fetch_homework_data",
             side_effect=LibrusAuthError("Invalid credentials"),
         ), pytest.raises(ConfigEntryAuthFailed):
             await coordinator._async_update_data()
@@ -50,7 +75,7 @@ class TestLibrusDataUpdateCoordinator:
     async def test_timeout_error_raises_update_failed(self, hass: HomeAssistant, coordinator):
         """Test that LibrusTimeoutError maps to UpdateFailed (preserves previous data)."""
         with patch(
-            "custom_components.librus.coordinator.fetch_homework_data",
+            "custom_components.librus.coordinator.async_fetch_homework_data",
             side_effect=LibrusTimeoutError("timed out"),
         ), pytest.raises(UpdateFailed, match="Timeout"):
             await coordinator._async_update_data()
@@ -58,17 +83,558 @@ class TestLibrusDataUpdateCoordinator:
     async def test_connection_error_raises_update_failed(self, hass: HomeAssistant, coordinator):
         """Test that LibrusConnectionError maps to UpdateFailed."""
         with patch(
-            "custom_components.librus.coordinator.fetch_homework_data",
+            "custom_components.librus.coordinator.async_fetch_homework_data",
             side_effect=LibrusConnectionError("unreachable"),
         ), pytest.raises(UpdateFailed, match="connecting"):
             await coordinator._async_update_data()
 
-    async def test_update_interval_is_one_hour(self, coordinator):
-        """Verify the coordinator uses 1-hour update interval (FR-007)."""
-        from datetime import timedelta
+    async def test_refresh_reuses_session_manager(self, hass: HomeAssistant, coordinator):
+        """Each refresh should go through the coordinator's persistent session manager."""
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_homework_data",
+            return_value=[],
+        ) as mock_fetch:
+            await coordinator._async_update_data()
+            await coordinator._async_update_data()
+
+        for call in mock_fetch.call_args_list:
+            assert call.args[0] is coordinator.session_manager
+
+    async def test_unchanged_homework_keeps_previous_data(
+        self, hass: HomeAssistant, coordinator, mock_homework_entries
+    ):
+        """An unchanged HomeWorks payload should return the previous data object."""
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_homework_data",
+            side_effect=[mock_homework_entries, None],
+        ) as mock_fetch:
+            await coordinator.async_refresh()
+            previous = coordinator.data
+            listener = Mock()
+            coordinator.async_add_listener(listener)
+            await coordinator.async_refresh()
+
+        assert coordinator.data is previous
+        listener.assert_not_called()
+        assert mock_fetch.call_args_list[0].kwargs["if_changed"] is False
+        assert mock_fetch.call_args_list[1].kwargs["if_changed"] is True
+
+    async def test_first_refresh_fires_no_events(
+        self, hass: HomeAssistant, coordinator, mock_homework_entries
+    ):
+        """The first result is the baseline; nothing is reported as added."""
+        added = async_capture_events(hass, EVENT_HOMEWORK_ADDED)
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_homework_data",
+            return_value=mock_homework_entries,
+        ):
+            await coordinator.async_refresh()
+        await hass.async_block_till_done()
 
-        assert coordinator.update_interval == timedelta(hours=1)
+        assert added == []
+
+    async def test_refresh_fires_events_for_delta(
+        self, hass: HomeAssistant, coordinator, mock_homework_entries
+    ):
+        """Added, changed and removed entries should each fire one event."""
+        added = async_capture_events(hass, EVENT_HOMEWORK_ADDED)
+        changed = async_capture_events(hass, EVENT_HOMEWORK_CHANGED)
+        removed = async_capture_events(hass, EVENT_HOMEWORK_REMOVED)
+        first, second = mock_homework_entries
+        edited = replace(first, content="Kartkówka przesunięta")
+        new = replace(second, id=7000001)
+
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_homework_data",
+            side_effect=[[first, second], [edited, new]],
+        ):
+            await coordinator.async_refresh()
+            await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+        assert [event.data["homework"]["id"] for event in added] == [7000001]
+        assert len(changed) == 1
+        assert changed[0].data["homework"] == edited.as_dict()
+        assert changed[0].data["previous"] == first.as_dict()
+        assert [event.data["homework"]["id"] for event in removed] == [6674588]
+        assert added[0].data["entry_id"] == "test_entry_id"
+
+    async def test_unchanged_entries_fire_no_events(
+        self, hass: HomeAssistant, coordinator, mock_homework_entries
+    ):
+        """Identical refreshes should not fire any homework events."""
+        changed = async_capture_events(hass, EVENT_HOMEWORK_CHANGED)
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_homework_data",
+            side_effect=[mock_homework_entries, [replace(entry) for entry in mock_homework_entries]],
+        ):
+            await coordinator.async_refresh()
+            await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+        assert changed == []
+
+    async def test_successful_refresh_persists_snapshot(
+        self, hass: HomeAssistant, coordinator, mock_homework_entries, hass_storage
+    ):
+        """A successful refresh should persist homework and lookup maps."""
+        coordinator.lookup_cache.set("Subjects", {25678: "Historia"})
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_homework_data",
+            return_value=mock_homework_entries,
+        ):
+            await coordinator.async_refresh()
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=STORAGE_SAVE_DELAY + 1))
+        await hass.async_block_till_done()
+
+        saved = hass_storage[f"{DOMAIN}.test_entry_id"]["data"]
+        assert saved["homework"] == [entry.as_dict() for entry in mock_homework_entries]
+        assert saved["lookups"]["Subjects"]["value"] == {"25678": "Historia"}
+
+    async def test_restore_snapshot(
+        self, hass: HomeAssistant, coordinator, mock_homework_entries, hass_storage
+    ):
+        """A persisted snapshot should be served without contacting Librus."""
+        hass_storage[f"{DOMAIN}.test_entry_id"] = {
+            "version": STORAGE_VERSION,
+            "key": f"{DOMAIN}.test_entry_id",
+            "data": {
+                "homework": [entry.as_dict() for entry in mock_homework_entries],
+                "lookups": {
+                    "Subjects": {"value": {"25678": "Historia"}, "stored_at": time.time()},
+                },
+            },
+        }
+
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_homework_data",
+        ) as mock_fetch:
+            assert await coordinator.async_restore_snapshot() is True
+
+        mock_fetch.assert_not_called()
+        assert coordinator.data == mock_homework_entries
+        assert coordinator.last_update_success is True
+        assert coordinator.lookup_cache.get("Subjects") == {25678: "Historia"}
+
+    async def test_restore_snapshot_without_saved_data(self, hass: HomeAssistant, coordinator):
+        """No snapshot should leave the coordinator empty."""
+        assert await coordinator.async_restore_snapshot() is False
+        assert coordinator.data is None
+
+    async def test_refreshed_by_scheduler_only(self, coordinator):
+        """The scheduler owns the refresh cadence (FR-007), not the coordinator."""
+        assert coordinator.update_interval is None
 
     async def test_coordinator_name(self, coordinator):
         """Verify the coordinator name includes domain."""
         assert "librus" in coordinator.name
+
+
+@pytest.fixture
+async def timetable_coordinator(hass: HomeAssistant, mock_config_entry):
+    """Create a timetable coordinator instance for testing."""
+    return LibrusTimetableCoordinator(hass, mock_config_entry, Mock())
+
+
+class TestLibrusTimetableCoordinator:
+    """Tests for LibrusTimetableCoordinator."""
+
+    async def test_refresh_fetches_current_and_next_week(
+        self, hass: HomeAssistant, timetable_coordinator, mock_timetable_lessons, freezer
+    ):
+        freezer.move_to("2026-02-18 12:00")
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_timetable_week",
+            side_effect=[mock_timetable_lessons, []],
+        ) as mock_fetch:
+            data = await timetable_coordinator._async_update_data()
+
+        assert data == mock_timetable_lessons
+        weeks = [call.args[1] for call in mock_fetch.call_args_list]
+        assert weeks == [date(2026, 2, 16), date(2026, 2, 23)]
+
+    async def test_auth_error_raises_config_entry_auth_failed(
+        self, hass: HomeAssistant, timetable_coordinator
+    ):
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_timetable_week",
+            side_effect=LibrusAuthError("Invalid credentials"),
+        ), pytest.raises(ConfigEntryAuthFailed):
+            await timetable_coordinator._async_update_data()
+
+    async def test_get_lessons_serves_cached_weeks(
+        self, hass: HomeAssistant, timetable_coordinator, mock_timetable_lessons, freezer
+    ):
+        freezer.move_to("2026-02-18 12:00")
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_timetable_week",
+            return_value=mock_timetable_lessons,
+        ) as mock_fetch:
+            first = await timetable_coordinator.async_get_lessons(
+                date(2026, 2, 16), date(2026, 2, 16)
+            )
+            second = await timetable_coordinator.async_get_lessons(
+                date(2026, 2, 17), date(2026, 2, 22)
+            )
+
+        assert [lesson.lesson_no for lesson in first] == [1, 2]
+        assert [lesson.date for lesson in second] == ["2026-02-17"]
+        mock_fetch.assert_awaited_once()
+
+    async def test_finished_weeks_are_never_fetched_again(
+        self, hass: HomeAssistant, timetable_coordinator, freezer
+    ):
+        freezer.move_to("2026-03-10 12:00")
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_timetable_week",
+            return_value=[],
+        ) as mock_fetch:
+            await timetable_coordinator.async_get_lessons(date(2026, 2, 16), date(2026, 2, 22))
+            freezer.move_to("2026-06-10 12:00")
+            await timetable_coordinator.async_get_lessons(date(2026, 2, 16), date(2026, 2, 22))
+
+        mock_fetch.assert_awaited_once()
+
+    async def test_get_lessons_limits_downloads(
+        self, hass: HomeAssistant, timetable_coordinator
+    ):
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_timetable_week",
+            return_value=[],
+        ) as mock_fetch:
+            await timetable_coordinator.async_get_lessons(date(2026, 1, 5), date(2026, 6, 28))
+
+        assert mock_fetch.await_count == TIMETABLE_MAX_QUERY_WEEKS
+
+    async def test_get_lessons_skips_failed_weeks(
+        self, hass: HomeAssistant, timetable_coordinator
+    ):
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_timetable_week",
+            side_effect=LibrusConnectionError("down"),
+        ):
+            assert await timetable_coordinator.async_get_lessons(
+                date(2026, 2, 16), date(2026, 2, 22)
+            ) == []
+
+    async def test_week_cache_persisted_and_restored(
+        self, hass: HomeAssistant, mock_config_entry, mock_timetable_lessons, hass_storage, freezer
+    ):
+        freezer.move_to("2026-02-18 12:00")
+        coordinator = LibrusTimetableCoordinator(hass, mock_config_entry, Mock())
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_timetable_week",
+            side_effect=[mock_timetable_lessons, []],
+        ):
+            await coordinator.async_refresh()
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=STORAGE_SAVE_DELAY + 1))
+        await hass.async_block_till_done()
+        assert f"{DOMAIN}.test_entry_id.timetable" in hass_storage
+
+        restored = LibrusTimetableCoordinator(hass, mock_config_entry, Mock())
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_timetable_week",
+        ) as mock_fetch:
+            assert await restored.async_restore_snapshot() is True
+
+        mock_fetch.assert_not_called()
+        assert restored.data == mock_timetable_lessons
+
+    async def test_next_lesson_skips_finished_and_canceled(
+        self, hass: HomeAssistant, timetable_coordinator, mock_timetable_lessons, freezer
+    ):
+        timetable_coordinator.data = mock_timetable_lessons
+        freezer.move_to(dt_util.as_utc(dt_util.parse_datetime("2026-02-16 08:50:00").replace(tzinfo=dt_util.get_default_time_zone())))
+
+        assert timetable_coordinator.next_lesson() == mock_timetable_lessons[1]
+
+        freezer.move_to(dt_util.as_utc(dt_util.parse_datetime("2026-02-16 10:00:00").replace(tzinfo=dt_util.get_default_time_zone())))
+        # The only remaining lesson is canceled
+        assert timetable_coordinator.next_lesson() is None
+
+
+@pytest.fixture
+async def grades_coordinator(hass: HomeAssistant, mock_config_entry):
+    """Create a grades coordinator instance for testing."""
+    return LibrusGradesCoordinator(hass, mock_config_entry, Mock(), Mock())
+
+
+class TestLibrusGradesCoordinator:
+    """Tests for LibrusGradesCoordinator."""
+
+    async def test_first_sync_fetches_everything_without_events(
+        self, hass: HomeAssistant, grades_coordinator, mock_grade_entries
+    ):
+        new_grade = async_capture_events(hass, EVENT_NEW_GRADE)
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_grades",
+            return_value=mock_grade_entries,
+        ) as mock_fetch:
+            await grades_coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+        assert grades_coordinator.data == mock_grade_entries
+        assert mock_fetch.call_args.kwargs["after_id"] == 0
+        assert mock_fetch.call_args.kwargs["if_changed"] is False
+        assert new_grade == []
+
+    async def test_appends_new_grades_and_fires_events(
+        self, hass: HomeAssistant, grades_coordinator, mock_grade_entries
+    ):
+        grades_coordinator.async_set_updated_data(mock_grade_entries[:1])
+        new_grade = async_capture_events(hass, EVENT_NEW_GRADE)
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_grades",
+            return_value=mock_grade_entries[1:],
+        ) as mock_fetch:
+            await grades_coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+        assert mock_fetch.call_args.kwargs["after_id"] == 31000101
+        assert mock_fetch.call_args.kwargs["if_changed"] is True
+        assert grades_coordinator.data == mock_grade_entries
+        assert len(new_grade) == 1
+        assert new_grade[0].data == {
+            "entry_id": "test_entry_id",
+            "grade": mock_grade_entries[1].as_dict(),
+        }
+
+    @pytest.mark.parametrize("result", [None, []])
+    async def test_no_new_grades_keeps_data_object(
+        self, hass: HomeAssistant, grades_coordinator, mock_grade_entries, result
+    ):
+        grades_coordinator.async_set_updated_data(mock_grade_entries)
+        previous = grades_coordinator.data
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_grades",
+            return_value=result,
+        ):
+            await grades_coordinator.async_refresh()
+
+        assert grades_coordinator.data is previous
+
+    async def test_connection_error_raises_update_failed(
+        self, hass: HomeAssistant, grades_coordinator
+    ):
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_grades",
+            side_effect=LibrusConnectionError("down"),
+        ), pytest.raises(UpdateFailed):
+            await grades_coordinator._async_update_data()
+
+    async def test_auth_error_raises_config_entry_auth_failed(
+        self, hass: HomeAssistant, grades_coordinator
+    ):
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_grades",
+            side_effect=LibrusAuthError("Invalid credentials"),
+        ), pytest.raises(ConfigEntryAuthFailed):
+            await grades_coordinator._async_update_data()
+
+    async def test_grades_persisted_and_restored(
+        self, hass: HomeAssistant, mock_config_entry, mock_grade_entries, hass_storage
+    ):
+        coordinator = LibrusGradesCoordinator(hass, mock_config_entry, Mock(), Mock())
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_grades",
+            return_value=mock_grade_entries,
+        ):
+            await coordinator.async_refresh()
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=STORAGE_SAVE_DELAY + 1))
+        await hass.async_block_till_done()
+        assert f"{DOMAIN}.test_entry_id.grades" in hass_storage
+
+        restored = LibrusGradesCoordinator(hass, mock_config_entry, Mock(), Mock())
+        assert await restored.async_restore_snapshot() is True
+        assert restored.data == mock_grade_entries
+        assert restored.last_grade_id == 31000245
+
+
+@pytest.fixture
+async def attendance_coordinator(hass: HomeAssistant, mock_config_entry):
+    """Create an attendance coordinator instance for testing."""
+    return LibrusAttendanceCoordinator(hass, mock_config_entry, Mock(), Mock())
+
+
+class TestLibrusAttendanceCoordinator:
+    """Tests for LibrusAttendanceCoordinator."""
+
+    async def test_first_sync_builds_summary(
+        self, hass: HomeAssistant, attendance_coordinator, mock_attendance_records
+    ):
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_attendances",
+            return_value=(mock_attendance_records, {r.id for r in mock_attendance_records}),
+        ) as mock_fetch:
+            await attendance_coordinator.async_refresh()
+
+        assert mock_fetch.call_args.kwargs["known"] == {}
+        assert mock_fetch.call_args.kwargs["if_changed"] is False
+        assert attendance_coordinator.data.total == AttendanceCounts(present=2, absent=1, late=1)
+
+    async def test_applies_changes_and_removals(
+        self, hass: HomeAssistant, attendance_coordinator, mock_attendance_records
+    ):
+        attendance_coordinator.async_set_updated_data(
+            AttendanceSummary(mock_attendance_records)
+        )
+        excused = replace(
+            mock_attendance_records[1], type_id=3, type_name="Nieobecność uspr.", kind="excused"
+        )
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_attendances",
+            return_value=([excused], {600001, 600002, 600004}),
+        ) as mock_fetch:
+            await attendance_coordinator.async_refresh()
+
+        assert mock_fetch.call_args.kwargs["known"] == {
+            600001: 100,
+            600002: 1,
+            600003: 2,
+            600004: 1045,
+        }
+        assert attendance_coordinator.data.total == AttendanceCounts(present=2, excused=1)
+
+    @pytest.mark.parametrize("result", [None, ([], {600001, 600002, 600003, 600004})])
+    async def test_unchanged_keeps_data_object(
+        self, hass: HomeAssistant, attendance_coordinator, mock_attendance_records, result
+    ):
+        attendance_coordinator.async_set_updated_data(
+            AttendanceSummary(mock_attendance_records)
+        )
+        previous = attendance_coordinator.data
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_attendances",
+            return_value=result,
+        ):
+            await attendance_coordinator.async_refresh()
+
+        assert attendance_coordinator.data is previous
+
+    async def test_auth_error_raises_config_entry_auth_failed(
+        self, hass: HomeAssistant, attendance_coordinator
+    ):
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_attendances",
+            side_effect=LibrusAuthError("Invalid credentials"),
+        ), pytest.raises(ConfigEntryAuthFailed):
+            await attendance_coordinator._async_update_data()
+
+    async def test_records_persisted_and_restored(
+        self, hass: HomeAssistant, mock_config_entry, mock_attendance_records, hass_storage
+    ):
+        coordinator = LibrusAttendanceCoordinator(hass, mock_config_entry, Mock(), Mock())
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_attendances",
+            return_value=(mock_attendance_records, {r.id for r in mock_attendance_records}),
+        ):
+            await coordinator.async_refresh()
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=STORAGE_SAVE_DELAY + 1))
+        await hass.async_block_till_done()
+        assert f"{DOMAIN}.test_entry_id.attendance" in hass_storage
+
+        restored = LibrusAttendanceCoordinator(hass, mock_config_entry, Mock(), Mock())
+        assert await restored.async_restore_snapshot() is True
+        assert restored.data.total == coordinator.data.total
+        assert restored.data.by_subject == coordinator.data.by_subject
+
+
+@pytest.fixture
+async def lucky_number_coordinator(hass: HomeAssistant, mock_config_entry):
+    """Create a lucky number coordinator with a logged-in session manager."""
+    session_manager = Mock()
+    session_manager.session = Mock()
+    return LibrusLuckyNumberCoordinator(hass, mock_config_entry, session_manager)
+
+
+class TestLibrusLuckyNumberCoordinator:
+    """Tests for LibrusLuckyNumberCoordinator."""
+
+    async def test_fetches_when_due_on_existing_session(
+        self, hass: HomeAssistant, lucky_number_coordinator, freezer
+    ):
+        freezer.move_to("2026-02-17 12:00:00")
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_lucky_number",
+            return_value=LuckyNumber(1, "2026-02-17"),
+        ) as mock_fetch:
+            lucky_number_coordinator.async_refresh_if_due()
+            await hass.async_block_till_done(wait_background_tasks=True)
+
+        mock_fetch.assert_awaited_once_with(
+            lucky_number_coordinator.session_manager, allow_login=False
+        )
+        assert lucky_number_coordinator.data == LuckyNumber(1, "2026-02-17")
+        assert lucky_number_coordinator.is_due() is False
+
+    async def test_waits_without_session(
+        self, hass: HomeAssistant, lucky_number_coordinator
+    ):
+        lucky_number_coordinator.session_manager.session = None
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_lucky_number",
+        ) as mock_fetch:
+            lucky_number_coordinator.async_refresh_if_due()
+            await hass.async_block_till_done(wait_background_tasks=True)
+
+        mock_fetch.assert_not_called()
+
+    async def test_fetches_once_per_day(
+        self, hass: HomeAssistant, lucky_number_coordinator, freezer
+    ):
+        freezer.move_to("2026-02-21 12:00:00")
+        # Saturday: Librus still returns Friday's number
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_lucky_number",
+            return_value=LuckyNumber(1, "2026-02-20"),
+        ) as mock_fetch:
+            lucky_number_coordinator.async_refresh_if_due()
+            await hass.async_block_till_done(wait_background_tasks=True)
+            lucky_number_coordinator.async_refresh_if_due()
+            await hass.async_block_till_done(wait_background_tasks=True)
+            assert mock_fetch.await_count == 1
+
+            freezer.move_to("2026-02-22 12:00:00")
+            assert lucky_number_coordinator.is_due() is True
+
+    async def test_not_due_while_number_applies(
+        self, hass: HomeAssistant, lucky_number_coordinator, freezer
+    ):
+        freezer.move_to("2026-02-16 12:00:00")
+        lucky_number_coordinator.async_set_updated_data(LuckyNumber(7, "2026-02-17"))
+
+        assert lucky_number_coordinator.is_due() is False
+        freezer.move_to("2026-02-17 12:00:00")
+        assert lucky_number_coordinator.is_due() is False
+        freezer.move_to("2026-02-18 12:00:00")
+        assert lucky_number_coordinator.is_due() is True
+
+    async def test_failure_keeps_it_due(
+        self, hass: HomeAssistant, lucky_number_coordinator
+    ):
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_lucky_number",
+            side_effect=LibrusConnectionError("down"),
+        ):
+            lucky_number_coordinator.async_refresh_if_due()
+            await hass.async_block_till_done(wait_background_tasks=True)
+
+        assert lucky_number_coordinator.last_update_success is False
+        assert lucky_number_coordinator.is_due() is True
+
+    async def test_persisted_and_restored(
+        self, hass: HomeAssistant, mock_config_entry, lucky_number_coordinator, hass_storage, freezer
+    ):
+        freezer.move_to("2026-02-17 12:00:00")
+        with patch(
+            "custom_components.librus.coordinator.async_fetch_lucky_number",
+            return_value=LuckyNumber(1, "2026-02-20"),
+        ):
+            await lucky_number_coordinator.async_refresh()
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=STORAGE_SAVE_DELAY + 1))
+        await hass.async_block_till_done()
+
+        restored = LibrusLuckyNumberCoordinator(hass, mock_config_entry, Mock())
+        assert await restored.async_restore_snapshot() is True
+        assert restored.data == LuckyNumber(1, "2026-02-20")
+        assert restored.is_due() is False
@@ -0,0 +1,46 @@
+"""Tests for the Librus config entry diagnostics."""
+
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.librus.const import CONF_PASSWORD, CONF_USERNAME, DOMAIN
+from custom_components.librus.diagnostics import async_get_config_entry_diagnostics
+from custom_components.librus.librus_client import AsyncLibrusSessionManager
+
+
+async def test_diagnostics_redacts_credentials(hass: HomeAssistant, mock_config_entry):
+    session_manager = AsyncLibrusSessionManager(Mock(), "testuser", "testpass")
+    session_manager.metrics.record_request("HomeWorks", 0.5, 200, 1024)
+    session_manager.metrics.record_call("homework", 0.75, True)
+    hass.data[DOMAIN] = {
+        mock_config_entry.entry_id: Mock(
+            homework=Mock(session_manager=session_manager),
+            scheduler=Mock(
+                coordinators={
+                    "homework": Mock(last_update_success=True, last_exception=None),
+                    "grades": Mock(
+                        last_update_success=False, last_exception=UpdateFailed("down")
+                    ),
+                }
+            ),
+        )
+    }
+
+    result = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+
+    assert result["entry"]["data"] == {
+        CONF_USERNAME: "**REDACTED**",
+        CONF_PASSWORD: "**REDACTED**",
+    }
+    assert result["circuit_breaker"] == "closed"
+    assert result["rate_limiter"] == {"active": 0, "waiting": 0}
+    assert result["metrics"]["phases"]["HomeWorks"]["size"] == 1024
+    assert result["metrics"]["calls"]["homework"]["duration"] == 0.75
+    assert result["coordinators"]["grades"] == {
+        "last_update_success": False,
+        "last_exception": "down",
+    }
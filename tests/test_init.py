@@ -2,28 +2,76 @@
 
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import AsyncMock, patch
 
 import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
+from homeassistant.config_entries import ConfigEntryState
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers.update_coordinator import UpdateFailed
 
-from custom_components.librus import async_setup_entry, async_unload_entry
-from custom_components.librus.const import DOMAIN, SERVICE_REFRESH_HOMEWORK
-from custom_components.librus.coordinator import LibrusDataUpdateCoordinator
+from custom_components.librus import async_migrate_entry
+from custom_components.librus.const import (
+    ATTR_CLEAR_CACHE,
+    ATTR_DATE_FROM,
+    ATTR_ENTRY_ID,
+    ATTR_RESOURCES,
+    CONF_PASSWORD,
+    CONF_SCHOOL_ID,
+    CONF_USERNAME,
+    DOMAIN,
+    REFRESH_INTERVALS,
+    SERVICE_GET_HOMEWORK,
+    SERVICE_REFRESH,
+    SERVICE_REFRESH_HOMEWORK,
+    STORAGE_VERSION,
+)
+from custom_components.librus.coordinator import (
+    LibrusAttendanceCoordinator,
+    LibrusDataUpdateCoordinator,
+    LibrusGradesCoordinator,
+    LibrusRuntimeData,
+    LibrusTimetableCoordinator,
+)
+from custom_components.librus.librus_client import LibrusConnectionError
+from custom_components.librus.models import AttendanceSummary
 
+SCHOOL_ID = 4321
 
-async def _setup_integration(hass, mock_config_entry):
+
+pytestmark = pytest.mark.usefixtures("unload_entries")
+
+
+async def _setup_integration(hass, mock_config_entry, school_id=SCHOOL_ID):
     """Helper to set up the integration with mocked I/O."""
     with patch(
+        "custom_components.librus.async_fetch_school_id",
+        return_value=school_id,
+    ), patch(
         "custom_components.librus.coordinator.LibrusDataUpdateCoordinator._async_update_data",
         return_value=[],
+    ), patch(
+        "custom_components.librus.coordinator.LibrusTimetableCoordinator._async_update_data",
+        return_value=[],
+    ), patch(
+        "custom_components.librus.coordinator.LibrusGradesCoordinator._async_update_data",
+        return_value=[],
+    ), patch(
+        "custom_components.librus.coordinator.LibrusAttendanceCoordinator._async_update_data",
+        return_value=AttendanceSummary(),
+    ), patch(
+        "custom_components.librus.scheduler.async_fetch_school_free_days",
+        return_value=[],
     ), patch.object(
         hass.config_entries,
         "async_forward_entry_setups",
         new_callable=AsyncMock,
     ):
-        result = await async_setup_entry(hass, mock_config_entry)
+        result = await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
     return result
 
 
@@ -39,10 +87,14 @@ class TestAsyncSetupEntry:
         assert result is True
         assert DOMAIN in hass.data
         assert mock_config_entry.entry_id in hass.data[DOMAIN]
-        assert isinstance(
-            hass.data[DOMAIN][mock_config_entry.entry_id],
-            LibrusDataUpdateCoordinator,
-        )
+        runtime_data = hass.data[DOMAIN][mock_config_entry.entry_id]
+        assert isinstance(runtime_data, LibrusRuntimeData)
+        assert isinstance(runtime_data.homework, LibrusDataUpdateCoordinator)
+        assert isinstance(runtime_data.timetable, LibrusTimetableCoordinator)
+        assert runtime_data.timetable.session_manager is runtime_data.homework.session_manager
+        assert isinstance(runtime_data.grades, LibrusGradesCoordinator)
+        assert runtime_data.grades.lookup_cache is runtime_data.homework.lookup_cache
+        assert isinstance(runtime_data.attendance, LibrusAttendanceCoordinator)
 
     async def test_setup_registers_refresh_service(
         self, hass: HomeAssistant, mock_config_entry
@@ -51,6 +103,246 @@ class TestAsyncSetupEntry:
         await _setup_integration(hass, mock_config_entry)
         assert hass.services.has_service(DOMAIN, SERVICE_REFRESH_HOMEWORK)
 
+    async def test_setup_serves_snapshot_without_waiting_for_librus(
+        self, hass: HomeAssistant, mock_config_entry, mock_homework_entries, hass_storage
+    ):
+        """With a persisted snapshot, setup should succeed even if Librus is down."""
+        hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}"] = {
+            "version": STORAGE_VERSION,
+            "key": f"{DOMAIN}.{mock_config_entry.entry_id}",
+            "data": {
+                "homework": [entry.as_dict() for entry in mock_homework_entries],
+                "lookups": {},
+            },
+        }
+
+        with patch(
+            "custom_components.librus.async_fetch_school_id",
+            side_effect=LibrusConnectionError("Librus is slow"),
+        ), patch(
+            "custom_components.librus.coordinator.LibrusDataUpdateCoordinator._async_update_data",
+            side_effect=UpdateFailed("Librus is slow"),
+        ), patch(
+            "custom_components.librus.coordinator.LibrusTimetableCoordinator._async_update_data",
+            side_effect=UpdateFailed("Librus is slow"),
+        ), patch(
+            "custom_components.librus.coordinator.LibrusGradesCoordinator._async_update_data",
+            side_effect=UpdateFailed("Librus is slow"),
+        ), patch(
+            "custom_components.librus.coordinator.LibrusAttendanceCoordinator._async_update_data",
+            side_effect=UpdateFailed("Librus is slow"),
+        ), patch(
+            "custom_components.librus.scheduler.async_fetch_school_free_days",
+            side_effect=LibrusConnectionError("Librus is slow"),
+        ), patch.object(
+            hass.config_entries,
+            "async_forward_entry_setups",
+            new_callable=AsyncMock,
+        ):
+            assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+            coordinator = hass.data[DOMAIN][mock_config_entry.entry_id].homework
+            assert coordinator.data == mock_homework_entries
+            await hass.async_block_till_done(wait_background_tasks=True)
+        # The school Id is fetched again at the next setup
+        assert CONF_SCHOOL_ID not in mock_config_entry.data
+
+    async def test_setup_does_not_wait_for_first_refresh(
+        self, hass: HomeAssistant, mock_config_entry
+    ):
+        """Without a snapshot, setup should finish before Librus answers."""
+        librus_answered = asyncio.Event()
+
+        async def fetch_school_id(session_manager):
+            await librus_answered.wait()
+            return SCHOOL_ID
+
+        with patch(
+            "custom_components.librus.async_fetch_school_id", side_effect=fetch_school_id
+        ), patch(
+            "custom_components.librus.coordinator.LibrusDataUpdateCoordinator._async_update_data",
+            return_value=[],
+        ) as mock_homework, patch(
+            "custom_components.librus.coordinator.LibrusTimetableCoordinator._async_update_data",
+            return_value=[],
+        ), patch(
+            "custom_components.librus.coordinator.LibrusGradesCoordinator._async_update_data",
+            return_value=[],
+        ), patch(
+            "custom_components.librus.coordinator.LibrusAttendanceCoordinator._async_update_data",
+            return_value=AttendanceSummary(),
+        ), patch(
+            "custom_components.librus.scheduler.async_fetch_school_free_days",
+            return_value=[],
+        ), patch.object(
+            hass.config_entries,
+            "async_forward_entry_setups",
+            new_callable=AsyncMock,
+        ):
+            assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+            runtime_data = hass.data[DOMAIN][mock_config_entry.entry_id]
+            assert runtime_data.homework.data is None
+            mock_homework.assert_not_awaited()
+
+            librus_answered.set()
+            await hass.async_block_till_done(wait_background_tasks=True)
+
+        assert runtime_data.homework.data == []
+        assert mock_config_entry.data[CONF_SCHOOL_ID] == SCHOOL_ID
+        assert runtime_data.grades.lookup_cache is runtime_data.homework.lookup_cache
+
+    async def test_refresh_service_keeps_lookup_cache_by_default(
+        self, hass: HomeAssistant, mock_config_entry
+    ):
+        """A plain refresh should reuse cached Subjects/Users/Categories."""
+        await _setup_integration(hass, mock_config_entry)
+        runtime_data = hass.data[DOMAIN][mock_config_entry.entry_id]
+        coordinator = runtime_data.homework
+        coordinator.lookup_cache.set("Subjects", {1: "Historia"})
+
+        with patch.object(
+            runtime_data.scheduler, "async_request_refresh", return_value={}
+        ) as mock_refresh:
+            await hass.services.async_call(
+                DOMAIN, SERVICE_REFRESH_HOMEWORK, {}, blocking=True
+            )
+
+        mock_refresh.assert_awaited_once_with(["homework"])
+        assert coordinator.lookup_cache.get("Subjects") == {1: "Historia"}
+
+    async def test_refresh_service_can_clear_lookup_cache(
+        self, hass: HomeAssistant, mock_config_entry
+    ):
+        """clear_cache should invalidate the lookup maps before refreshing."""
+        await _setup_integration(hass, mock_config_entry)
+        runtime_data = hass.data[DOMAIN][mock_config_entry.entry_id]
+        coordinator = runtime_data.homework
+        coordinator.lookup_cache.set("Subjects", {1: "Historia"})
+
+        with patch.object(
+            runtime_data.scheduler, "async_request_refresh", return_value={}
+        ) as mock_refresh:
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_REFRESH_HOMEWORK,
+                {ATTR_CLEAR_CACHE: True},
+                blocking=True,
+            )
+
+        mock_refresh.assert_awaited_once_with(["homework"])
+        assert coordinator.lookup_cache.get("Subjects") is None
+
+    async def test_refresh_service_targets_entry_and_resources(
+        self, hass: HomeAssistant, mock_config_entry
+    ):
+        """refresh should refresh only the chosen resources and return their results."""
+        await _setup_integration(hass, mock_config_entry)
+        scheduler = hass.data[DOMAIN][mock_config_entry.entry_id].scheduler
+        result = {"grades": {"success": True, "error": None}}
+
+        with patch.object(
+            scheduler, "async_request_refresh", return_value=result
+        ) as mock_refresh:
+            response = await hass.services.async_call(
+                DOMAIN,
+                SERVICE_REFRESH,
+                {ATTR_ENTRY_ID: mock_config_entry.entry_id, ATTR_RESOURCES: "grades"},
+                blocking=True,
+                return_response=True,
+            )
+
+        mock_refresh.assert_awaited_once_with(["grades"])
+        assert response == {"entries": {mock_config_entry.entry_id: result}}
+
+    async def test_refresh_service_defaults_to_everything(
+        self, hass: HomeAssistant, mock_config_entry
+    ):
+        await _setup_integration(hass, mock_config_entry)
+        scheduler = hass.data[DOMAIN][mock_config_entry.entry_id].scheduler
+
+        with patch.object(scheduler, "async_request_refresh", return_value={}) as mock_refresh:
+            await hass.services.async_call(DOMAIN, SERVICE_REFRESH, {}, blocking=True)
+
+        mock_refresh.assert_awaited_once_with(list(REFRESH_INTERVALS))
+
+    async def test_refresh_service_rejects_unknown_entry(
+        self, hass: HomeAssistant, mock_config_entry
+    ):
+        await _setup_integration(hass, mock_config_entry)
+
+        with pytest.raises(ServiceValidationError):
+            await hass.services.async_call(
+                DOMAIN, SERVICE_REFRESH, {ATTR_ENTRY_ID: "missing"}, blocking=True
+            )
+
+    async def test_get_homework_service_returns_full_entries(
+        self, hass: HomeAssistant, mock_config_entry, mock_homework_entries
+    ):
+        """get_homework should return complete entries, filtered by due date."""
+        await _setup_integration(hass, mock_config_entry)
+        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id].homework
+        coordinator.async_set_updated_data(mock_homework_entries)
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_HOMEWORK,
+            {ATTR_DATE_FROM: "2026-02-21"},
+            blocking=True,
+            return_response=True,
+        )
+
+        assert response == {"homework": [mock_homework_entries[1].as_dict()]}
+
+
+class TestMultipleAccounts:
+    """Tests for several config entries sharing clients."""
+
+    @pytest.fixture
+    def sibling_entry(self):
+        """Create a config entry for a second account, to add once the first is loaded."""
+        return MockConfigEntry(
+            version=2,
+            minor_version=2,
+            domain=DOMAIN,
+            title="Librus (sibling)",
+            data={CONF_USERNAME: "sibling", CONF_PASSWORD: "pass"},
+            entry_id="sibling_entry_id",
+            unique_id="sibling",
+        )
+
+    async def test_school_id_is_learned_once(self, hass: HomeAssistant, mock_config_entry):
+        await _setup_integration(hass, mock_config_entry)
+
+        assert mock_config_entry.data[CONF_SCHOOL_ID] == SCHOOL_ID
+
+    async def test_same_school_shares_lookup_cache(
+        self, hass: HomeAssistant, mock_config_entry, sibling_entry
+    ):
+        await _setup_integration(hass, mock_config_entry)
+        sibling_entry.add_to_hass(hass)
+        await _setup_integration(hass, sibling_entry)
+        first = hass.data[DOMAIN][mock_config_entry.entry_id].homework
+        second = hass.data[DOMAIN][sibling_entry.entry_id].homework
+
+        assert first.lookup_cache is second.lookup_cache
+        assert first.session_manager is not second.session_manager
+
+    async def test_other_school_has_own_lookup_cache(
+        self, hass: HomeAssistant, mock_config_entry, sibling_entry
+    ):
+        await _setup_integration(hass, mock_config_entry)
+        sibling_entry.add_to_hass(hass)
+        await _setup_integration(hass, sibling_entry, school_id=9999)
+        first = hass.data[DOMAIN][mock_config_entry.entry_id].homework
+        second = hass.data[DOMAIN][sibling_entry.entry_id].homework
+
+        assert first.lookup_cache is not second.lookup_cache
+
+    async def test_migration_sets_unique_id(self, hass: HomeAssistant, mock_config_entry):
+        assert await async_migrate_entry(hass, mock_config_entry)
+
+        assert mock_config_entry.unique_id == "testuser"
+        assert mock_config_entry.minor_version == 2
+
 
 class TestAsyncUnloadEntry:
     """Tests for integration unload."""
@@ -61,15 +353,9 @@ class TestAsyncUnloadEntry:
         """Unload should remove coordinator from hass.data."""
         await _setup_integration(hass, mock_config_entry)
 
-        with patch.object(
-            hass.config_entries,
-            "async_unload_platforms",
-            new_callable=AsyncMock,
-            return_value=True,
-        ):
-            result = await async_unload_entry(hass, mock_config_entry)
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
 
-        assert result is True
+        assert mock_config_entry.state is ConfigEntryState.NOT_LOADED
         assert mock_config_entry.entry_id not in hass.data.get(DOMAIN, {})
 
     async def test_unload_removes_service_when_last_entry(
@@ -79,12 +365,8 @@ class TestAsyncUnloadEntry:
         await _setup_integration(hass, mock_config_entry)
         assert hass.services.has_service(DOMAIN, SERVICE_REFRESH_HOMEWORK)
 
-        with patch.object(
-            hass.config_entries,
-            "async_unload_platforms",
-            new_callable=AsyncMock,
-            return_value=True,
-        ):
-            await async_unload_entry(hass, mock_config_entry)
+        await hass.config_entries.async_unload(mock_config_entry.entry_id)
 
         assert not hass.services.has_service(DOMAIN, SERVICE_REFRESH_HOMEWORK)
+        assert not hass.services.has_service(DOMAIN, SERVICE_REFRESH)
+        assert not hass.services.has_service(DOMAIN, SERVICE_GET_HOMEWORK)
@@ -2,25 +2,58 @@
 
 from __future__ import annotations
 
-from datetime import date, timedelta
-from unittest.mock import MagicMock, patch
+import asyncio
+import json
+from collections import defaultdict
+from datetime import UTC, date, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import aiohttp
 import pytest
-import requests
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
+from custom_components.librus.cache import LookupCache
+from custom_components.librus.const import LOOKUP_CACHE_TTLS
 from custom_components.librus.librus_client import (
+    DEFAULT_RETRY,
+    LIBRUS_API_URL,
+    LIBRUS_OAUTH_GRANT_URL,
+    LIBRUS_OAUTH_URL,
+    NO_RETRY,
+    SESSION_VERIFIED_FOR,
+    AsyncLibrusSessionManager,
+    CircuitBreaker,
     LibrusAuthError,
+    LibrusCircuitOpenError,
     LibrusConnectionError,
+    LibrusRateLimiter,
+    LibrusSessionExpiredError,
     LibrusTimeoutError,
+    RequestPriority,
+    ResponseValidators,
+    RetryPolicy,
+    _async_fetch_api_data,
     _build_category_map,
     _build_subject_map,
+    _async_create_authenticated_session,
     _build_user_map,
-    _create_authenticated_session,
+    _JsonArrayItems,
     _filter_by_date,
+    _homework_date_filter,
     _resolve_homework_entry,
-    fetch_homework_data,
-    validate_credentials,
+    _attendance_kind,
+    _parse_free_days,
+    _parse_timetable,
+    async_fetch_attendances,
+    async_fetch_grades,
+    async_fetch_homework_data,
+    async_fetch_lucky_number,
+    async_fetch_school_id,
+    async_fetch_timetable_week,
+    async_validate_credentials,
+    request_priority,
 )
+from custom_components.librus.models import FreeDays
 
 
 # -----------------------------------------------------------------------
@@ -175,6 +208,73 @@ class TestFilterByDate:
         assert result == []
 
 
+# -----------------------------------------------------------------------
+# _JsonArrayItems / _homework_date_filter
+# -----------------------------------------------------------------------
+def _stream(body, key, keep=None, chunk_size=None):
+    """Feed body to a _JsonArrayItems in chunks and return the parsed elements."""
+    collector = _JsonArrayItems(key, keep)
+    chunk_size = chunk_size or len(body) or 1
+    for start in range(0, len(body), chunk_size):
+        collector.feed(body[start : start + chunk_size])
+    return list(collector.result()[key])
+
+
+class TestJsonArrayItems:
+    """Tests for the incremental array element scanner."""
+
+    def test_yields_elements_of_top_level_key(self):
+        body = b'{"Resources": {"HomeWorks": []}, "HomeWorks": [{"Id": 1, "A": {"B": [2]}}, {"Id": 2}]}'
+        assert _stream(body, "HomeWorks") == [{"Id": 1, "A": {"B": [2]}}, {"Id": 2}]
+
+    def test_ignores_brackets_and_escapes_in_strings(self):
+        body = rb'{"HomeWorks": [{"Content": "a } \" ] {"}, {"Content": "\\"}]}'
+        assert _stream(body, "HomeWorks") == [
+            {"Content": 'a } " ] {'},
+            {"Content": "\\"},
+        ]
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7])
+    def test_elements_split_across_chunks(self, sample_users, chunk_size):
+        users = {"Users": [*sample_users["Users"], {"Id": 1, "LastName": 'Żółć \\"ąę'}]}
+        body = json.dumps(users, ensure_ascii=False).encode()
+
+        assert _stream(body, "Users", chunk_size=chunk_size) == users["Users"]
+
+    def test_buffer_holds_only_current_element(self):
+        collector = _JsonArrayItems("Users")
+        collector.feed(b'{"Users": [{"Id": 1}, {"Id"')
+
+        assert collector._buffer == '{"Id"'
+
+    def test_missing_key_yields_nothing(self):
+        assert _stream(b'{"Other": [{"Id": 1}]}', "HomeWorks") == []
+
+    def test_truncated_document_raises(self):
+        collector = _JsonArrayItems("Users")
+        collector.feed(b'{"Users": [{"Id": 1}, {"Id": 2')
+        with pytest.raises(ValueError):
+            collector.result()
+
+    def test_date_filter_drops_entries_before_parsing(self, sample_homeworks):
+        body = json.dumps(sample_homeworks).encode()
+        keep = _homework_date_filter(date(2026, 2, 21), date(2026, 2, 22))
+
+        with patch(
+            "custom_components.librus.librus_client.json.loads", wraps=json.loads
+        ) as mock_loads:
+            result = _stream(body, "HomeWorks", keep)
+
+        assert [hw["Id"] for hw in result] == [6674588]
+        assert mock_loads.call_count == 1
+
+    def test_date_filter_drops_entries_without_date(self):
+        keep = _homework_date_filter(date(2026, 2, 1), date(2026, 3, 1))
+        body = b'{"HomeWorks": [{"Id": 1}, {"Id": 2, "Date": "2026-02-21"}]}'
+
+        assert [hw["Id"] for hw in _stream(body, "HomeWorks", keep)] == [2]
+
+
 # -----------------------------------------------------------------------
 # _resolve_homework_entry
 # -----------------------------------------------------------------------
@@ -200,16 +300,16 @@ class TestResolveHomeworkEntry:
             "AddDate": "2026-02-15 11:12:16",
         }
         result = _resolve_homework_entry(hw, self.cat_map, self.subj_map, self.user_map)
-        assert result["id"] == 6671271
-        assert result["date"] == "2026-02-20"
-        assert result["subject"] == "Historia"
-        assert result["creator"] == "Krzysztof Krupa"
-        assert result["category"] == "inne wydarzenia"
-        assert result["lesson_no"] == "1"
-        assert result["time_from"] == "07:45:00"
-        assert result["time_to"] == "08:30:00"
-        assert result["content"] == "Test content"
-        assert result["add_date"] == "2026-02-15 11:12:16"
+        assert result.id == 6671271
+        assert result.date == "2026-02-20"
+        assert result.subject == "Historia"
+        assert result.creator == "Krzysztof Krupa"
+        assert result.category == "inne wydarzenia"
+        assert result.lesson_no == "1"
+        assert result.time_from == "07:45:00"
+        assert result.time_to == "08:30:00"
+        assert result.content == "Test content"
+        assert result.add_date == "2026-02-15 11:12:16"
 
     def test_missing_subject_uses_unknown(self):
         hw = {
@@ -219,7 +319,7 @@ class TestResolveHomeworkEntry:
             "CreatedBy": {"Id": 1493507},
         }
         result = _resolve_homework_entry(hw, self.cat_map, self.subj_map, self.user_map)
-        assert result["subject"] == "Unknown"
+        assert result.subject == "Unknown"
 
     def test_unresolvable_category_uses_unknown(self):
         hw = {
@@ -230,7 +330,7 @@ class TestResolveHomeworkEntry:
             "CreatedBy": {"Id": 1493507},
         }
         result = _resolve_homework_entry(hw, self.cat_map, self.subj_map, self.user_map)
-        assert result["category"] == "Unknown"
+        assert result.category == "Unknown"
 
     def test_unresolvable_creator_uses_unknown(self):
         hw = {
@@ -241,7 +341,7 @@ class TestResolveHomeworkEntry:
             "CreatedBy": {"Id": 99999},
         }
         result = _resolve_homework_entry(hw, self.cat_map, self.subj_map, self.user_map)
-        assert result["creator"] == "Unknown"
+        assert result.creator == "Unknown"
 
     def test_optional_fields_omitted_when_absent(self):
         hw = {
@@ -251,11 +351,15 @@ class TestResolveHomeworkEntry:
             "CreatedBy": {"Id": 1493507},
         }
         result = _resolve_homework_entry(hw, self.cat_map, self.subj_map, self.user_map)
-        assert "lesson_no" not in result
-        assert "time_from" not in result
-        assert "time_to" not in result
-        assert "content" not in result
-        assert "add_date" not in result
+        assert result.lesson_no is None
+        assert result.content is None
+        assert result.as_dict() == {
+            "id": 1,
+            "date": "2026-02-20",
+            "subject": "Unknown",
+            "creator": "Krzysztof Krupa",
+            "category": "inne wydarzenia",
+        }
 
     def test_lesson_no_converted_to_string(self):
         hw = {
@@ -266,179 +370,1041 @@ class TestResolveHomeworkEntry:
             "LessonNo": 3,
         }
         result = _resolve_homework_entry(hw, self.cat_map, self.subj_map, self.user_map)
-        assert result["lesson_no"] == "3"
-        assert isinstance(result["lesson_no"], str)
+        assert result.lesson_no == "3"
+        assert isinstance(result.lesson_no, str)
+
+    def test_shared_names_are_interned(self):
+        hw = {"Id": 1, "Date": "2026-02-20", "Subject": {"Id": 25678}}
+        subj_map = {25678: "".join(["Hist", "oria"])}
+
+        first = _resolve_homework_entry(hw, self.cat_map, subj_map, self.user_map)
+        second = _resolve_homework_entry(hw, self.cat_map, {25678: "Historia"}, self.user_map)
+
+        assert first.subject is second.subject
 
 
 # -----------------------------------------------------------------------
-# _create_authenticated_session
+# Async client (aiohttp)
 # -----------------------------------------------------------------------
-class TestCreateAuthenticatedSession:
-    """Tests for the five-step OAuth flow."""
-
-    def _mock_session_responses(self, mock_session_cls, login_body="ok", token_ok=True, userinfo_ok=True):
-        """Set up mock session with configurable responses for each auth step."""
-        session = MagicMock()
-        mock_session_cls.return_value = session
-
-        step1_resp = MagicMock(status_code=200, url="https://api.librus.pl/OAuth/Authorization")
-        step2_resp = MagicMock(status_code=200, url="https://api.librus.pl/OAuth/Authorization", text=login_body)
-        step3_resp = MagicMock(status_code=200, url="https://synergia.librus.pl/")
-        step4_resp = MagicMock(status_code=200 if token_ok else 401, ok=token_ok)
-        step4_resp.json.return_value = {"UserIdentifier": "abc123"} if token_ok else {}
-        step5_resp = MagicMock(status_code=200 if userinfo_ok else 500, ok=userinfo_ok)
-
-        session.get.side_effect = [step1_resp, step3_resp, step4_resp, step5_resp]
-        session.post.return_value = step2_resp
-        session.headers = {}
-
-        return session
-
-    @patch("custom_components.librus.librus_client.requests.Session")
-    def test_returns_session_on_success(self, mock_session_cls):
-        self._mock_session_responses(mock_session_cls)
-        session = _create_authenticated_session("user", "pass")
-        assert session is not None
-
-    @patch("custom_components.librus.librus_client.requests.Session")
-    def test_raises_auth_error_on_invalid_credentials(self, mock_session_cls):
-        self._mock_session_responses(mock_session_cls, login_body="error: Nieprawidłowy login lub hasło")
+def _mock_async_auth(aioclient_mock, login_body="ok", token_status=200, userinfo_status=200):
+    """Register aiohttp mocks for the five OAuth steps."""
+    aioclient_mock.get(LIBRUS_OAUTH_URL, text="login form")
+    aioclient_mock.post(LIBRUS_OAUTH_URL, text=login_body)
+    aioclient_mock.get(LIBRUS_OAUTH_GRANT_URL, text="granted")
+    aioclient_mock.get(
+        f"{LIBRUS_API_URL}/Auth/TokenInfo",
+        status=token_status,
+        json={"UserIdentifier": "abc123"},
+    )
+    aioclient_mock.get(
+        f"{LIBRUS_API_URL}/Auth/UserInfo/abc123", status=userinfo_status, json={}
+    )
+
+
+def _mock_async_homework_endpoints(aioclient_mock, homeworks, categories, subjects, users):
+    """Register aiohttp mocks for the four homework data endpoints."""
+    aioclient_mock.get(f"{LIBRUS_API_URL}/HomeWorks", json=homeworks)
+    aioclient_mock.get(f"{LIBRUS_API_URL}/HomeWorks/Categories", json=categories)
+    aioclient_mock.get(f"{LIBRUS_API_URL}/Subjects", json=subjects)
+    aioclient_mock.get(f"{LIBRUS_API_URL}/Users", json=users)
+
+
+def _full_lookup_cache():
+    """Return a lookup cache holding every map, so only HomeWorks is fetched."""
+    cache = LookupCache(LOOKUP_CACHE_TTLS)
+    for endpoint in LOOKUP_CACHE_TTLS:
+        cache.set(endpoint, {})
+    return cache
+
+
+@pytest.fixture
+async def mock_session(hass, aioclient_mock):
+    """Return an aiohttp session bound to aioclient_mock."""
+    session = aioclient_mock.create_session(hass.loop)
+    yield session
+    await session.close()
+
+
+class TestAsyncCreateAuthenticatedSession:
+    """Tests for the aiohttp five-step OAuth flow."""
+
+    async def test_completes_all_five_steps(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock)
+
+        session = await _async_create_authenticated_session(mock_session, "user", "pass")
+
+        assert session is mock_session
+        assert aioclient_mock.call_count == 5
+
+    async def test_raises_auth_error_on_invalid_credentials(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock, login_body="error: Nieprawidłowy login")
+
         with pytest.raises(LibrusAuthError):
-            _create_authenticated_session("user", "wrongpass")
+            await _async_create_authenticated_session(mock_session, "user", "wrong")
+        assert aioclient_mock.call_count == 2
+
+    async def test_raises_auth_error_on_token_failure(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock, token_status=401)
 
-    @patch("custom_components.librus.librus_client.requests.Session")
-    def test_raises_auth_error_on_token_failure(self, mock_session_cls):
-        self._mock_session_responses(mock_session_cls, token_ok=False)
         with pytest.raises(LibrusAuthError, match="token info"):
-            _create_authenticated_session("user", "pass")
+            await _async_create_authenticated_session(mock_session, "user", "pass")
+
+    async def test_raises_auth_error_on_userinfo_failure(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock, userinfo_status=500)
 
-    @patch("custom_components.librus.librus_client.requests.Session")
-    def test_raises_auth_error_on_userinfo_failure(self, mock_session_cls):
-        self._mock_session_responses(mock_session_cls, userinfo_ok=False)
         with pytest.raises(LibrusAuthError, match="activate API access"):
-            _create_authenticated_session("user", "pass")
+            await _async_create_authenticated_session(mock_session, "user", "pass")
 
-    @patch("custom_components.librus.librus_client.requests.Session")
-    def test_calls_all_five_steps(self, mock_session_cls):
-        session = self._mock_session_responses(mock_session_cls)
-        _create_authenticated_session("user", "pass")
-        assert session.get.call_count == 4  # steps 1, 3, 4, 5
-        assert session.post.call_count == 1  # step 2
 
+class TestAsyncValidateCredentials:
+    """Tests for the async credential validation wrapper."""
 
-# -----------------------------------------------------------------------
-# validate_credentials
-# -----------------------------------------------------------------------
-class TestValidateCredentials:
-    """Tests for the credential validation wrapper."""
-
-    @patch("custom_components.librus.librus_client._create_authenticated_session")
-    def test_returns_true_on_success(self, mock_auth):
-        mock_auth.return_value = MagicMock()
-        assert validate_credentials("user", "pass") is True
-
-    @patch("custom_components.librus.librus_client._create_authenticated_session")
-    def test_returns_false_on_auth_error(self, mock_auth):
-        mock_auth.side_effect = LibrusAuthError("bad creds")
-        assert validate_credentials("user", "wrong") is False
-
-    @patch("custom_components.librus.librus_client._create_authenticated_session")
-    def test_raises_timeout_error(self, mock_auth):
-        mock_auth.side_effect = requests.exceptions.Timeout("timed out")
+    async def test_returns_true_on_success(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock)
+        assert await async_validate_credentials(mock_session, "user", "pass") is True
+
+    async def test_returns_false_on_auth_error(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock, login_body="error")
+        assert await async_validate_credentials(mock_session, "user", "wrong") is False
+
+    async def test_raises_timeout_error(self, aioclient_mock, mock_session):
+        aioclient_mock.get(LIBRUS_OAUTH_URL, exc=TimeoutError())
         with pytest.raises(LibrusTimeoutError):
-            validate_credentials("user", "pass")
+            await async_validate_credentials(mock_session, "user", "pass")
 
-    @patch("custom_components.librus.librus_client._create_authenticated_session")
-    def test_raises_connection_error(self, mock_auth):
-        mock_auth.side_effect = requests.exceptions.ConnectionError("no route")
+    async def test_raises_connection_error(self, aioclient_mock, mock_session):
+        aioclient_mock.get(LIBRUS_OAUTH_URL, exc=aiohttp.ClientConnectionError())
         with pytest.raises(LibrusConnectionError):
-            validate_credentials("user", "pass")
+            await async_validate_credentials(mock_session, "user", "pass")
 
 
-# -----------------------------------------------------------------------
-# fetch_homework_data
-# -----------------------------------------------------------------------
-class TestFetchHomeworkData:
-    """Tests for the full homework fetch flow."""
+class TestAsyncFetchHomeworkData:
+    """Tests for the async homework fetch flow."""
 
-    @patch("custom_components.librus.librus_client._fetch_api_data")
-    @patch("custom_components.librus.librus_client._create_authenticated_session")
-    def test_returns_resolved_filtered_entries(
+    async def test_returns_resolved_entries(
         self,
-        mock_auth,
-        mock_fetch,
+        aioclient_mock,
+        mock_session,
+        freezer,
         sample_homeworks,
         sample_categories,
         sample_subjects,
         sample_users,
-        mock_homework_entries,
     ):
-        mock_auth.return_value = MagicMock()
-        mock_fetch.side_effect = [
-            sample_homeworks,
-            sample_categories,
-            sample_subjects,
-            sample_users,
+        _mock_async_auth(aioclient_mock)
+        _mock_async_homework_endpoints(
+            aioclient_mock, sample_homeworks, sample_categories, sample_subjects, sample_users
+        )
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+        freezer.move_to("2026-02-21")
+
+        result = await async_fetch_homework_data(manager)
+
+        assert [entry.id for entry in result] == [6671271, 6674588]
+        assert result[0].subject == "Historia"
+        assert result[1].creator == "Nowak"
+        assert aioclient_mock.call_count == 9
+
+    async def test_requests_homework_date_window(self, aioclient_mock, mock_session, freezer):
+        _mock_async_auth(aioclient_mock)
+        aioclient_mock.get(f"{LIBRUS_API_URL}/HomeWorks", json={"HomeWorks": []})
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+        freezer.move_to("2026-02-21")
+
+        await async_fetch_homework_data(
+            manager, past_days=7, future_days=14, cache=_full_lookup_cache()
+        )
+
+        url = aioclient_mock.mock_calls[-1][1]
+        assert url.query == {"dateFrom": "2026-02-14", "dateTo": "2026-03-07"}
+        assert manager.homeworks_date_range is True
+
+    async def test_falls_back_when_date_window_rejected(
+        self, aioclient_mock, mock_session, sample_homeworks, freezer
+    ):
+        _mock_async_auth(aioclient_mock)
+        aioclient_mock.get(
+            f"{LIBRUS_API_URL}/HomeWorks",
+            params={"dateFrom": "2026-02-14", "dateTo": "2026-03-07"},
+            status=400,
+        )
+        aioclient_mock.get(f"{LIBRUS_API_URL}/HomeWorks", json=sample_homeworks)
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+        freezer.move_to("2026-02-21")
+
+        result = await async_fetch_homework_data(manager, cache=_full_lookup_cache())
+
+        # The full collection is filtered client-side
+        assert [entry.id for entry in result] == [6671271, 6674588]
+        assert manager.homeworks_date_range is False
+
+        aioclient_mock.mock_calls.clear()
+        await async_fetch_homework_data(manager, cache=_full_lookup_cache())
+        homework_urls = [
+            call[1] for call in aioclient_mock.mock_calls if call[1].path.endswith("/HomeWorks")
         ]
+        assert [url.query for url in homework_urls] == [{}]
 
-        result = fetch_homework_data("user", "pass")
+    async def test_reuses_session_on_next_refresh(self, aioclient_mock, mock_session, freezer):
+        _mock_async_auth(aioclient_mock)
+        _mock_async_homework_endpoints(aioclient_mock, {}, {}, {}, {})
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
 
-        # The old homework (2020-01-01) should be filtered out
-        assert len(result) == 2
-        assert result[0]["id"] == 6671271
-        assert result[0]["subject"] == "Historia"
-        assert result[0]["creator"] == "Krzysztof Krupa"
-        assert result[0]["category"] == "inne wydarzenia"
-
-        # Second entry has no Subject — should be "Unknown"
-        assert result[1]["id"] == 6674588
-        assert result[1]["subject"] == "Unknown"
-        # User 1589959 has FirstName=None, LastName="Nowak"
-        assert result[1]["creator"] == "Nowak"
-
-    @patch("custom_components.librus.librus_client._create_authenticated_session")
-    def test_raises_auth_error_on_invalid_creds(self, mock_auth):
-        mock_auth.side_effect = LibrusAuthError("bad")
+        await async_fetch_homework_data(manager)
+        aioclient_mock.mock_calls.clear()
+        freezer.tick(SESSION_VERIFIED_FOR + 1)
+        await async_fetch_homework_data(manager)
+
+        # Only the TokenInfo liveness check and the four data calls
+        paths = [call[1].path for call in aioclient_mock.mock_calls]
+        assert len(paths) == 5
+        assert paths.count("/gateway/api/2.0/Auth/TokenInfo") == 1
+
+    async def test_recently_verified_session_is_not_checked_again(
+        self, aioclient_mock, mock_session
+    ):
+        _mock_async_auth(aioclient_mock)
+        _mock_async_homework_endpoints(aioclient_mock, {}, {}, {}, {})
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+
+        await async_fetch_homework_data(manager)
+        aioclient_mock.mock_calls.clear()
+        await async_fetch_homework_data(manager)
+
+        paths = [call[1].path for call in aioclient_mock.mock_calls]
+        assert "/gateway/api/2.0/Auth/TokenInfo" not in paths
+        assert len(paths) == 4
+
+    async def test_cached_lookups_are_not_downloaded(
+        self, aioclient_mock, mock_session, sample_homeworks, freezer
+    ):
+        _mock_async_auth(aioclient_mock)
+        aioclient_mock.get(f"{LIBRUS_API_URL}/HomeWorks", json=sample_homeworks)
+        cache = LookupCache(LOOKUP_CACHE_TTLS)
+        cache.set("HomeWorks/Categories", {8556: "inne wydarzenia"})
+        cache.set("Subjects", {25678: "Historia"})
+        cache.set("Users", {1493507: "Krzysztof Krupa"})
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+        freezer.move_to("2026-02-21")
+
+        result = await async_fetch_homework_data(manager, cache=cache)
+
+        assert result[0].subject == "Historia"
+        assert result[0].creator == "Krzysztof Krupa"
+        data_paths = [
+            call[1].path for call in aioclient_mock.mock_calls if "/gateway/" in call[1].path
+        ]
+        # TokenInfo + UserInfo from login, then HomeWorks only
+        assert data_paths[-1] == "/gateway/api/2.0/HomeWorks"
+        assert len(data_paths) == 3
+
+    async def test_downloaded_lookups_are_cached(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock)
+        _mock_async_homework_endpoints(
+            aioclient_mock, {}, {}, {"Subjects": [{"Id": 1, "Name": "Historia"}]}, {}
+        )
+        cache = LookupCache(LOOKUP_CACHE_TTLS)
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+
+        await async_fetch_homework_data(manager, cache=cache)
+
+        assert cache.get("Subjects") == {1: "Historia"}
+        assert cache.get("Users") == {}
+
+    async def test_conditional_request_not_modified(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock)
+        aioclient_mock.get(f"{LIBRUS_API_URL}/HomeWorks", status=304)
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+        manager.response_validators["HomeWorks"].etag = '"v1"'
+
+        result = await async_fetch_homework_data(
+            manager, cache=_full_lookup_cache(), if_changed=True
+        )
+
+        assert result is None
+        headers = aioclient_mock.mock_calls[-1][3]
+        assert headers["If-None-Match"] == '"v1"'
+
+    async def test_unchanged_body_hash_skips_processing(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock)
+        aioclient_mock.get(f"{LIBRUS_API_URL}/HomeWorks", json={"HomeWorks": []})
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+        cache = _full_lookup_cache()
+
+        assert await async_fetch_homework_data(manager, cache=cache, if_changed=True) == []
+        with patch(
+            "custom_components.librus.librus_client._build_homework_entries"
+        ) as mock_build:
+            assert await async_fetch_homework_data(manager, cache=cache, if_changed=True) is None
+        mock_build.assert_not_called()
+
+    async def test_changed_body_is_processed(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock)
+        aioclient_mock.get(f"{LIBRUS_API_URL}/HomeWorks", json={"HomeWorks": []})
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+        manager.response_validators["HomeWorks"].digest = "previous-digest"
+
+        result = await async_fetch_homework_data(
+            manager, cache=_full_lookup_cache(), if_changed=True
+        )
+
+        assert result == []
+
+    async def test_failed_build_does_not_hide_changed_body(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock)
+        aioclient_mock.get(f"{LIBRUS_API_URL}/HomeWorks", json={"HomeWorks": []})
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+        cache = _full_lookup_cache()
+
+        with patch(
+            "custom_components.librus.librus_client._build_homework_entries",
+            side_effect=ValueError("build failed"),
+        ), pytest.raises(LibrusConnectionError):
+            await async_fetch_homework_data(manager, cache=cache, if_changed=True)
+
+        assert await async_fetch_homework_data(manager, cache=cache, if_changed=True) == []
+
+    async def test_if_changed_ignored_when_lookups_downloaded(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock)
+        _mock_async_homework_endpoints(aioclient_mock, {"HomeWorks": []}, {}, {}, {})
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+
+        await async_fetch_homework_data(manager, if_changed=True)
+        result = await async_fetch_homework_data(manager, if_changed=True)
+
+        assert result == []
+        homework_headers = [
+            call[3] for call in aioclient_mock.mock_calls if call[1].path.endswith("/HomeWorks")
+        ]
+        assert all("If-None-Match" not in headers for headers in homework_headers)
+
+    async def test_relogs_once_when_session_rejected(self):
+        manager = MagicMock()
+        manager.async_get_session = AsyncMock(side_effect=["stale", "fresh"])
+        manager.response_validators = defaultdict(ResponseValidators)
+
+        async def fetch(session, endpoint, validators=None, **kwargs):
+            if session == "stale":
+                raise LibrusSessionExpiredError("401")
+            return {"HomeWorks": []} if endpoint == "HomeWorks" else {}
+
+        with patch(
+            "custom_components.librus.librus_client._async_fetch_api_data",
+            side_effect=fetch,
+        ):
+            assert await async_fetch_homework_data(manager) == []
+
+        manager.invalidate.assert_called_once()
+
+    async def test_raises_auth_error_on_invalid_creds(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock, login_body="error")
+        manager = AsyncLibrusSessionManager(mock_session, "user", "wrong")
         with pytest.raises(LibrusAuthError):
-            fetch_homework_data("user", "wrong")
+            await async_fetch_homework_data(manager)
 
-    @patch("custom_components.librus.librus_client._create_authenticated_session")
-    def test_raises_timeout_error(self, mock_auth):
-        mock_auth.side_effect = requests.exceptions.Timeout("timed out")
+    async def test_timeout_maps_to_timeout_error(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock)
+        aioclient_mock.get(f"{LIBRUS_API_URL}/HomeWorks", exc=TimeoutError())
+        _mock_async_homework_endpoints(aioclient_mock, {}, {}, {}, {})
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
         with pytest.raises(LibrusTimeoutError):
-            fetch_homework_data("user", "pass")
+            await async_fetch_homework_data(manager)
 
-    @patch("custom_components.librus.librus_client._create_authenticated_session")
-    def test_raises_connection_error(self, mock_auth):
-        mock_auth.side_effect = requests.exceptions.ConnectionError("unreachable")
+    async def test_server_error_maps_to_connection_error(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock)
+        aioclient_mock.get(f"{LIBRUS_API_URL}/HomeWorks", status=500)
+        _mock_async_homework_endpoints(aioclient_mock, {}, {}, {}, {})
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
         with pytest.raises(LibrusConnectionError):
-            fetch_homework_data("user", "pass")
-
-    @patch("custom_components.librus.librus_client._fetch_api_data")
-    @patch("custom_components.librus.librus_client._create_authenticated_session")
-    def test_makes_four_api_calls(self, mock_auth, mock_fetch):
-        mock_auth.return_value = MagicMock()
-        mock_fetch.return_value = {"HomeWorks": [], "Categories": [], "Subjects": [], "Users": []}
-
-        fetch_homework_data("user", "pass")
-
-        assert mock_fetch.call_count == 4
-        endpoints = [call.args[1] for call in mock_fetch.call_args_list]
-        assert "HomeWorks" in endpoints
-        assert "HomeWorks/Categories" in endpoints
-        assert "Subjects" in endpoints
-        assert "Users" in endpoints
-
-    @patch("custom_components.librus.librus_client._fetch_api_data")
-    @patch("custom_components.librus.librus_client._create_authenticated_session")
-    def test_returns_empty_list_when_no_homeworks(self, mock_auth, mock_fetch):
-        mock_auth.return_value = MagicMock()
-        mock_fetch.side_effect = [
-            {"HomeWorks": []},
-            {"Categories": []},
-            {"Subjects": []},
-            {"Users": []},
+            await async_fetch_homework_data(manager)
+
+
+class TestTimetable:
+    """Tests for timetable parsing and the async week fetch."""
+
+    def test_parse_flattens_slots(self, sample_timetable, mock_timetable_lessons):
+        assert _parse_timetable(sample_timetable) == mock_timetable_lessons
+
+    def test_parse_accepts_lesson_objects_as_slots(self):
+        payload = {
+            "Timetable": {
+                "2026-02-16": [
+                    {"LessonNo": "3", "HourFrom": "09:50", "HourTo": "10:35", "Subject": {"Name": "Biologia"}},
+                    None,
+                ]
+            }
+        }
+
+        [lesson] = _parse_timetable(payload)
+
+        assert lesson.lesson_no == 3
+        assert lesson.subject == "Biologia"
+        assert lesson.teacher == "Unknown"
+
+    def test_parse_empty_payload(self):
+        assert _parse_timetable({}) == []
+
+    def test_parse_skips_lessons_without_times(self):
+        payload = {
+            "Timetable": {
+                "2026-02-16": [
+                    [{"LessonNo": "1", "HourTo": "08:30", "Subject": {"Name": "Chemia"}}],
+                    [{"LessonNo": "2", "HourFrom": "08:35", "HourTo": "", "Subject": {"Name": "Fizyka"}}],
+                    [{"LessonNo": "3", "HourFrom": "09:50", "HourTo": "10:35", "Subject": {"Name": "Biologia"}}],
+                ]
+            }
+        }
+
+        [lesson] = _parse_timetable(payload)
+
+        assert lesson.subject == "Biologia"
+        assert lesson.end(UTC) > lesson.start(UTC)
+
+    async def test_fetches_requested_week(
+        self, aioclient_mock, mock_session, sample_timetable, mock_timetable_lessons
+    ):
+        _mock_async_auth(aioclient_mock)
+        aioclient_mock.get(f"{LIBRUS_API_URL}/Timetables", json=sample_timetable)
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+
+        result = await async_fetch_timetable_week(manager, date(2026, 2, 16))
+
+        assert result == mock_timetable_lessons
+        assert aioclient_mock.mock_calls[-1][1].query == {"weekStart": "2026-02-16"}
+
+    async def test_server_error_maps_to_connection_error(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock)
+        aioclient_mock.get(f"{LIBRUS_API_URL}/Timetables", status=500)
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+
+        with pytest.raises(LibrusConnectionError):
+            await async_fetch_timetable_week(manager, date(2026, 2, 16))
+
+
+def _mock_async_grades_endpoints(aioclient_mock, grades, categories, comments, subjects, users):
+    """Register aiohttp mocks for Grades and the lookups it references."""
+    aioclient_mock.get(f"{LIBRUS_API_URL}/Grades", json=grades)
+    aioclient_mock.get(f"{LIBRUS_API_URL}/Grades/Categories", json=categories)
+    aioclient_mock.get(f"{LIBRUS_API_URL}/Grades/Comments", json=comments)
+    aioclient_mock.get(f"{LIBRUS_API_URL}/Subjects", json=subjects)
+    aioclient_mock.get(f"{LIBRUS_API_URL}/Users", json=users)
+
+
+def _data_calls(aioclient_mock):
+    """Return the data API paths requested, without the OAuth/liveness calls."""
+    paths = [
+        str(call[1]).removeprefix(f"{LIBRUS_API_URL}/")
+        for call in aioclient_mock.mock_calls
+    ]
+    return [path for path in paths if "://" not in path and not path.startswith("Auth/")]
+
+
+class TestAsyncFetchGrades:
+    """Tests for the incremental async grades fetch."""
+
+    @pytest.fixture(autouse=True)
+    def _endpoints(
+        self,
+        aioclient_mock,
+        sample_grades,
+        sample_grade_categories,
+        sample_grade_comments,
+        sample_subjects,
+        sample_users,
+    ):
+        _mock_async_auth(aioclient_mock)
+        _mock_async_grades_endpoints(
+            aioclient_mock,
+            sample_grades,
+            sample_grade_categories,
+            sample_grade_comments,
+            {"Subjects": list(sample_subjects["Subjects"])},
+            {"Users": list(sample_users["Users"])},
+        )
+
+    async def test_resolves_all_grades(self, mock_session, mock_grade_entries):
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+
+        assert await async_fetch_grades(manager) == mock_grade_entries
+
+    async def test_returns_only_grades_after_id(
+        self, aioclient_mock, mock_session, mock_grade_entries
+    ):
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+
+        result = await async_fetch_grades(manager, after_id=31000101)
+
+        assert result == mock_grade_entries[1:]
+
+    async def test_cached_lookups_are_not_downloaded(
+        self, aioclient_mock, mock_session, mock_grade_entries
+    ):
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+        cache = LookupCache(LOOKUP_CACHE_TTLS)
+        await async_fetch_grades(manager, cache=cache)
+        aioclient_mock.mock_calls.clear()
+
+        result = await async_fetch_grades(manager, after_id=31000101, cache=cache)
+
+        assert result == mock_grade_entries[1:]
+        assert _data_calls(aioclient_mock) == ["Grades"]
+
+    async def test_unknown_reference_downloads_lookup_again(
+        self, aioclient_mock, mock_session, mock_grade_entries
+    ):
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+        cache = LookupCache(LOOKUP_CACHE_TTLS)
+        cache.set("Grades/Categories", {512001: {"name": "Sprawdzian", "weight": 3}})
+
+        result = await async_fetch_grades(manager, after_id=31000101, cache=cache)
+
+        assert result == mock_grade_entries[1:]
+        assert "Grades/Categories" in _data_calls(aioclient_mock)
+        assert 512002 in cache.get("Grades/Categories")
+
+    async def test_nothing_resolved_without_new_grades(self, aioclient_mock, mock_session):
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+
+        assert await async_fetch_grades(manager, after_id=31000245) == []
+        assert _data_calls(aioclient_mock) == ["Grades"]
+
+    async def test_comments_not_downloaded_without_commented_grades(
+        self, aioclient_mock, mock_session, sample_grades, mock_grade_entries
+    ):
+        aioclient_mock.clear_requests()
+        _mock_async_auth(aioclient_mock)
+        aioclient_mock.get(
+            f"{LIBRUS_API_URL}/Grades", json={"Grades": sample_grades["Grades"][:1]}
+        )
+        aioclient_mock.get(f"{LIBRUS_API_URL}/Grades/Categories", json={"Categories": []})
+        aioclient_mock.get(f"{LIBRUS_API_URL}/Subjects", json={"Subjects": []})
+        aioclient_mock.get(f"{LIBRUS_API_URL}/Users", json={"Users": []})
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+
+        [grade] = await async_fetch_grades(manager)
+
+        assert grade.comment is None
+        assert "Grades/Comments" not in _data_calls(aioclient_mock)
+
+    async def test_unchanged_body_returns_none(self, mock_session):
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+        await async_fetch_grades(manager)
+
+        assert await async_fetch_grades(manager, after_id=31000245, if_changed=True) is None
+
+    async def test_failed_lookup_does_not_hide_new_grades(
+        self, mock_session, mock_grade_entries
+    ):
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+        with patch(
+            "custom_components.librus.librus_client._async_get_lookups",
+            side_effect=aiohttp.ClientConnectionError("lookup download failed"),
+        ), pytest.raises(LibrusConnectionError):
+            await async_fetch_grades(manager, if_changed=True)
+
+        assert await async_fetch_grades(manager, if_changed=True) == mock_grade_entries
+
+    async def test_server_error_maps_to_connection_error(self, aioclient_mock, mock_session):
+        aioclient_mock.clear_requests()
+        _mock_async_auth(aioclient_mock)
+        aioclient_mock.get(f"{LIBRUS_API_URL}/Grades", status=500)
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+
+        with pytest.raises(LibrusConnectionError):
+            await async_fetch_grades(manager)
+
+
+class TestAsyncFetchAttendances:
+    """Tests for the delta-based async attendance fetch."""
+
+    @pytest.fixture(autouse=True)
+    def _endpoints(
+        self,
+        aioclient_mock,
+        sample_attendances,
+        sample_attendance_types,
+        sample_lessons,
+        sample_subjects,
+    ):
+        _mock_async_auth(aioclient_mock)
+        aioclient_mock.get(f"{LIBRUS_API_URL}/Attendances", json=sample_attendances)
+        aioclient_mock.get(
+            f"{LIBRUS_API_URL}/Attendances/Types", json=sample_attendance_types
+        )
+        aioclient_mock.get(f"{LIBRUS_API_URL}/Lessons", json=sample_lessons)
+        aioclient_mock.get(
+            f"{LIBRUS_API_URL}/Subjects", json={"Subjects": list(sample_subjects["Subjects"])}
+        )
+
+    async def test_resolves_all_records(self, mock_session, mock_attendance_records):
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+
+        records, seen = await async_fetch_attendances(manager)
+
+        assert records == mock_attendance_records
+        assert seen == {600001, 600002, 600003, 600004}
+
+    async def test_returns_only_new_or_changed_records(
+        self, aioclient_mock, mock_session, mock_attendance_records
+    ):
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+        cache = LookupCache(LOOKUP_CACHE_TTLS)
+        await async_fetch_attendances(manager, cache=cache)
+        aioclient_mock.mock_calls.clear()
+        # 600002 was stored with another type (e.g. before being re-typed)
+        known = {600001: 100, 600002: 3, 600003: 2}
+
+        records, seen = await async_fetch_attendances(manager, known=known, cache=cache)
+
+        assert records == [mock_attendance_records[1], mock_attendance_records[3]]
+        assert seen == {600001, 600002, 600003, 600004}
+        assert _data_calls(aioclient_mock) == ["Attendances"]
+
+    async def test_nothing_resolved_when_all_known(self, aioclient_mock, mock_session):
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+        known = {600001: 100, 600002: 1, 600003: 2, 600004: 1045}
+
+        records, seen = await async_fetch_attendances(manager, known=known)
+
+        assert records == []
+        assert seen == set(known)
+        assert _data_calls(aioclient_mock) == ["Attendances"]
+
+    async def test_unchanged_body_returns_none(self, mock_session):
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+        await async_fetch_attendances(manager)
+
+        assert await async_fetch_attendances(manager, if_changed=True) is None
+
+    async def test_failed_lookup_does_not_hide_new_records(
+        self, mock_session, mock_attendance_records
+    ):
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+        with patch(
+            "custom_components.librus.librus_client._async_get_lookups",
+            side_effect=aiohttp.ClientConnectionError("lookup download failed"),
+        ), pytest.raises(LibrusConnectionError):
+            await async_fetch_attendances(manager, if_changed=True)
+
+        records, _ = await async_fetch_attendances(manager, if_changed=True)
+
+        assert records == mock_attendance_records
+
+    @pytest.mark.parametrize(
+        ("attendance_type", "kind"),
+        [
+            ({"Id": 1, "Standard": True}, "absent"),
+            ({"Id": 3, "Standard": True}, "excused"),
+            ({"Id": 1045, "Standard": False, "StandardType": {"Id": 2}}, "late"),
+            ({"Id": 1046, "Standard": False, "IsPresenceKind": True}, "present"),
+            ({"Id": 1047, "Standard": False}, "other"),
+        ],
+    )
+    def test_attendance_kind(self, attendance_type, kind):
+        assert _attendance_kind(attendance_type) == kind
+
+
+SAMPLE_LUCKY_NUMBER_RESPONSE = {
+    "LuckyNumber": {"LuckyNumber": 1, "LuckyNumberDay": "2026-02-17"},
+    "Resources": {"..": {"Url": "https://api.librus.pl/2.0/Root"}},
+    "Url": "https://api.librus.pl/2.0/LuckyNumbers",
+}
+
+
+class TestAsyncLuckyNumber:
+    """Tests for the lucky number fetch and session piggybacking."""
+
+    async def test_fetches_lucky_number(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock)
+        aioclient_mock.get(f"{LIBRUS_API_URL}/LuckyNumbers", json=SAMPLE_LUCKY_NUMBER_RESPONSE)
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+
+        result = await async_fetch_lucky_number(manager)
+
+        assert (result.number, result.day) == (1, "2026-02-17")
+
+    async def test_without_login_requires_existing_session(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock)
+        aioclient_mock.get(f"{LIBRUS_API_URL}/LuckyNumbers", json=SAMPLE_LUCKY_NUMBER_RESPONSE)
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+
+        with pytest.raises(LibrusSessionExpiredError):
+            await async_fetch_lucky_number(manager, allow_login=False)
+        assert aioclient_mock.call_count == 0
+
+    async def test_without_login_reuses_session_as_is(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock)
+        aioclient_mock.get(f"{LIBRUS_API_URL}/LuckyNumbers", json=SAMPLE_LUCKY_NUMBER_RESPONSE)
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+        await manager.async_get_session()
+        aioclient_mock.mock_calls.clear()
+
+        result = await async_fetch_lucky_number(manager, allow_login=False)
+
+        assert result.number == 1
+        # No liveness check and no login, only the data request
+        assert [str(call[1]) for call in aioclient_mock.mock_calls] == [
+            f"{LIBRUS_API_URL}/LuckyNumbers"
         ]
 
-        result = fetch_homework_data("user", "pass")
-        assert result == []
+    async def test_without_login_rejected_session_is_not_retried(
+        self, aioclient_mock, mock_session
+    ):
+        _mock_async_auth(aioclient_mock)
+        aioclient_mock.get(f"{LIBRUS_API_URL}/LuckyNumbers", status=401)
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+        await manager.async_get_session()
+        aioclient_mock.mock_calls.clear()
+
+        with pytest.raises(LibrusSessionExpiredError):
+            await async_fetch_lucky_number(manager, allow_login=False)
+        assert aioclient_mock.call_count == 1
+
+    async def test_session_listeners(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock)
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+        listener = MagicMock()
+        remove = manager.async_add_listener(listener)
+        assert manager.session is None
+
+        await manager.async_get_session()
+        assert manager.session is mock_session
+        listener.assert_called_once_with()
+
+        remove()
+        await manager.async_get_session()
+        listener.assert_called_once_with()
+
+
+class TestSchoolFreeDays:
+    """Tests for parsing GET /SchoolFreeDays."""
+
+    def test_parse_sorts_ranges_and_fills_missing_end(self):
+        payload = {
+            "SchoolFreeDays": [
+                {"Id": 2, "Name": "Ferie zimowe", "DateFrom": "2026-02-16", "DateTo": "2026-03-01"},
+                {"Id": 1, "Name": "Dzień Edukacji", "DateFrom": "2025-10-14"},
+                {"Id": 3, "Name": "Bez daty"},
+            ]
+        }
+
+        result = _parse_free_days(payload)
+
+        assert result == [
+            FreeDays("Dzień Edukacji", "2025-10-14", "2025-10-14"),
+            FreeDays("Ferie zimowe", "2026-02-16", "2026-03-01"),
+        ]
+        assert result[1].includes(date(2026, 3, 1))
+        assert not result[1].includes(date(2026, 3, 2))
+
+    def test_parse_empty_payload(self):
+        assert _parse_free_days({}) == []
+
+
+class TestAsyncFetchSchoolId:
+    """Tests for GET /Schools."""
+
+    async def test_returns_school_id(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock)
+        aioclient_mock.get(
+            f"{LIBRUS_API_URL}/Schools", json={"School": {"Id": 4321, "Name": "SP 1"}}
+        )
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+
+        assert await async_fetch_school_id(manager) == 4321
+
+    async def test_missing_school_returns_none(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock)
+        aioclient_mock.get(f"{LIBRUS_API_URL}/Schools", json={})
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+
+        assert await async_fetch_school_id(manager) is None
+
+
+def _calls(aioclient_mock, method, url):
+    """Return how many requests aioclient_mock received for method and url."""
+    return sum(
+        1
+        for call_method, call_url, *_ in aioclient_mock.mock_calls
+        if call_method == method and str(call_url).split("?")[0] == url
+    )
+
+
+class TestRetry:
+    """Tests for retrying transient failures of GET requests."""
+
+    @pytest.fixture
+    def no_retry_backoff(self):
+        """Keep the real backoff."""
+        yield
+
+    def test_backoff_is_exponential_jittered_and_capped(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+        with patch("random.uniform", side_effect=lambda low, high: high) as mock_uniform:
+            assert [policy.backoff(retry) for retry in (1, 2, 3, 4)] == [1.0, 2.0, 4.0, 5.0]
+        assert {call.args[0] for call in mock_uniform.call_args_list} == {0}
+
+    async def test_data_request_retried_on_server_error(self, aioclient_mock, mock_session):
+        aioclient_mock.get(f"{LIBRUS_API_URL}/Schools", status=503)
+
+        with (
+            patch("asyncio.sleep") as mock_sleep,
+            pytest.raises(aiohttp.ClientResponseError),
+        ):
+            await _async_fetch_api_data(mock_session, "Schools")
+
+        assert aioclient_mock.call_count == DEFAULT_RETRY.attempts
+        assert mock_sleep.await_count == DEFAULT_RETRY.attempts - 1
+
+    async def test_retry_is_tunable_per_call(self, aioclient_mock, mock_session):
+        aioclient_mock.get(f"{LIBRUS_API_URL}/Schools", exc=TimeoutError())
+
+        with pytest.raises(TimeoutError):
+            await _async_fetch_api_data(mock_session, "Schools", retry=NO_RETRY)
+
+        assert aioclient_mock.call_count == 1
+
+    async def test_client_error_not_retried(self, aioclient_mock, mock_session):
+        aioclient_mock.get(f"{LIBRUS_API_URL}/Schools", status=404)
+
+        with pytest.raises(aiohttp.ClientResponseError):
+            await _async_fetch_api_data(mock_session, "Schools")
+
+        assert aioclient_mock.call_count == 1
+
+
+class TestAuthRetry:
+    """Tests for retrying the OAuth steps."""
+
+    async def test_get_steps_retried(self, aioclient_mock, mock_session):
+        aioclient_mock.get(LIBRUS_OAUTH_URL, exc=aiohttp.ClientConnectionError())
+
+        with pytest.raises(LibrusConnectionError):
+            await async_validate_credentials(mock_session, "user", "pass")
+
+        assert _calls(aioclient_mock, "GET", LIBRUS_OAUTH_URL) == DEFAULT_RETRY.attempts
+
+    async def test_credentials_post_not_retried(self, aioclient_mock, mock_session):
+        aioclient_mock.get(LIBRUS_OAUTH_URL, text="login form")
+        aioclient_mock.post(LIBRUS_OAUTH_URL, exc=TimeoutError())
+
+        with pytest.raises(LibrusTimeoutError):
+            await async_validate_credentials(mock_session, "user", "pass")
+
+        assert _calls(aioclient_mock, "POST", LIBRUS_OAUTH_URL) == 1
+
+
+class TestCircuitBreaker:
+    """Tests for pausing Librus calls during outages."""
+
+    def test_opens_after_threshold_and_probes_after_open_for(self, freezer):
+        breaker = CircuitBreaker(failure_threshold=2, open_for=60)
+        for _ in range(2):
+            breaker.before_call()
+            breaker.after_call(False)
+
+        assert breaker.state == "open"
+        with pytest.raises(LibrusCircuitOpenError):
+            breaker.before_call()
+
+        freezer.tick(60)
+        assert breaker.state == "half_open"
+        breaker.before_call()
+        # Only one probe at a time
+        with pytest.raises(LibrusCircuitOpenError):
+            breaker.before_call()
+        breaker.after_call(True)
+
+        assert breaker.state == "closed"
+        breaker.before_call()
+
+    def test_failed_probe_reopens(self, freezer):
+        breaker = CircuitBreaker(failure_threshold=1, open_for=60)
+        breaker.before_call()
+        breaker.after_call(False)
+        freezer.tick(60)
+
+        breaker.before_call()
+        breaker.after_call(False)
+
+        assert breaker.state == "open"
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.after_call(False)
+        breaker.after_call(True)
+        breaker.after_call(False)
+
+        assert breaker.state == "closed"
+
+    async def test_outage_stops_calls(self, aioclient_mock, mock_session):
+        aioclient_mock.get(LIBRUS_OAUTH_URL, exc=TimeoutError())
+        manager = AsyncLibrusSessionManager(
+            mock_session, "user", "pass", circuit_breaker=CircuitBreaker(failure_threshold=2)
+        )
+        for _ in range(2):
+            with pytest.raises(LibrusTimeoutError):
+                await async_fetch_school_id(manager)
+        aioclient_mock.clear_requests()
+
+        with pytest.raises(LibrusCircuitOpenError):
+            await async_fetch_school_id(manager)
+        assert aioclient_mock.call_count == 0
+
+    async def test_answers_from_librus_keep_it_closed(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock, login_body="error")
+        manager = AsyncLibrusSessionManager(
+            mock_session, "user", "wrong", circuit_breaker=CircuitBreaker(failure_threshold=1)
+        )
+
+        with pytest.raises(LibrusAuthError):
+            await async_fetch_school_id(manager)
+
+        assert manager.circuit_breaker.state == "closed"
+
+
+class TestRateLimiter:
+    """Tests for pacing and prioritising Librus requests."""
+
+    async def test_paces_requests_after_burst(self, hass, freezer):
+        limiter = LibrusRateLimiter(rate=2, burst=2, max_concurrent=10)
+        await limiter.acquire()
+        await limiter.acquire()
+
+        waiter = hass.async_create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        assert limiter.waiting == 1
+
+        freezer.tick(0.4)
+        async_fire_time_changed(hass)
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        freezer.tick(0.1)
+        async_fire_time_changed(hass)
+        await waiter
+        assert limiter.active == 3
+
+    async def test_caps_concurrent_requests(self, hass):
+        limiter = LibrusRateLimiter(max_concurrent=2)
+        await limiter.acquire()
+        await limiter.acquire()
+
+        waiter = hass.async_create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        limiter.release()
+        await waiter
+        assert limiter.active == 2
+        assert limiter.waiting == 0
+
+    async def test_interactive_requests_go_first(self, hass):
+        limiter = LibrusRateLimiter(max_concurrent=1)
+        started: list[str] = []
+
+        async def request(name: str) -> None:
+            async with limiter.slot():
+                started.append(name)
+
+        await limiter.acquire()
+        with request_priority(RequestPriority.BACKGROUND):
+            background = hass.async_create_task(request("background"))
+        interactive = hass.async_create_task(request("interactive"))
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.gather(background, interactive)
+
+        assert started == ["interactive", "background"]
+        assert limiter.active == 0
+
+    async def test_cancelled_waiter_gives_up_its_turn(self, hass):
+        limiter = LibrusRateLimiter(max_concurrent=1)
+        await limiter.acquire()
+        cancelled = hass.async_create_task(limiter.acquire())
+        waiter = hass.async_create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        limiter.release()
+        await waiter
+
+        assert cancelled.cancelled()
+        assert limiter.active == 1
+        assert limiter.waiting == 0
+
+    async def test_every_request_waits_for_a_slot(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock)
+        aioclient_mock.get(f"{LIBRUS_API_URL}/Schools", json={"School": {"Id": 1}})
+        limiter = LibrusRateLimiter()
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass", rate_limiter=limiter)
+
+        with patch.object(limiter, "acquire", wraps=limiter.acquire) as acquire:
+            await async_fetch_school_id(manager)
+
+        assert acquire.await_count == aioclient_mock.call_count == 6
+        assert limiter.active == 0
+
+    async def test_validation_waits_for_slots(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock)
+        limiter = LibrusRateLimiter()
+
+        with patch.object(limiter, "acquire", wraps=limiter.acquire) as acquire:
+            assert await async_validate_credentials(mock_session, "user", "pass", limiter)
+
+        assert acquire.await_count == 5
+
+
+class TestMetrics:
+    """Tests for the request metrics recorded by the async client."""
+
+    async def test_refresh_records_phases_and_counters(
+        self,
+        aioclient_mock,
+        mock_session,
+        sample_homeworks,
+        sample_categories,
+        sample_subjects,
+        sample_users,
+    ):
+        _mock_async_auth(aioclient_mock)
+        _mock_async_homework_endpoints(
+            aioclient_mock, sample_homeworks, sample_categories, sample_subjects, sample_users
+        )
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+        cache = LookupCache(LOOKUP_CACHE_TTLS)
+        listener = MagicMock()
+        manager.metrics.async_add_listener(listener)
+
+        await async_fetch_homework_data(manager, cache=cache)
+        await async_fetch_homework_data(manager, cache=cache)
+
+        metrics = manager.metrics
+        assert metrics.counters["logins"] == 1
+        assert metrics.counters["cache_misses"] == 3
+        assert metrics.counters["cache_hits"] == 3
+        assert {f"auth step {step}" for step in range(1, 6)} | {"login"} <= metrics.phases.keys()
+        homeworks = metrics.phases["HomeWorks"]
+        assert homeworks.count == 2
+        assert homeworks.status == 200
+        assert homeworks.size > 0
+        assert 0 < homeworks.parse_time <= homeworks.total_duration
+        assert metrics.calls["homework"].count == 2
+        assert metrics.last_call == "homework"
+        assert listener.call_count == 2
+
+    async def test_failures_and_retries_are_counted(self, aioclient_mock, mock_session):
+        _mock_async_auth(aioclient_mock)
+        aioclient_mock.get(f"{LIBRUS_API_URL}/Schools", status=503)
+        manager = AsyncLibrusSessionManager(mock_session, "user", "pass")
+
+        with pytest.raises(LibrusConnectionError):
+            await async_fetch_school_id(manager)
+
+        assert manager.metrics.counters["retries"] == DEFAULT_RETRY.attempts - 1
+        assert manager.metrics.counters["failures"] == 1
+        assert manager.metrics.phases["Schools"].status == 503
+        assert manager.metrics.calls["school"].success is False
+        assert json.dumps(manager.metrics.as_dict())
@@ -0,0 +1,170 @@
+"""Tests for the Librus data models (models.py)."""
+
+from __future__ import annotations
+
+import dataclasses
+
+import pytest
+
+from custom_components.librus.models import (
+    AttendanceCounts,
+    AttendanceSummary,
+    GradeEntry,
+    HomeworkEntry,
+    HomeworkIndex,
+)
+
+
+class TestHomeworkEntry:
+    """Tests for the HomeworkEntry model."""
+
+    def test_as_dict_includes_present_optional_fields(self, mock_homework_entries):
+        assert mock_homework_entries[0].as_dict() == {
+            "id": 6671271,
+            "date": "2026-02-20",
+            "subject": "Historia",
+            "creator": "Krzysztof Krupa",
+            "category": "inne wydarzenia",
+            "lesson_no": "1",
+            "time_from": "07:45:00",
+            "time_to": "08:30:00",
+            "content": "Kartkówka z chronologii",
+            "add_date": "2026-02-15 11:12:16",
+        }
+
+    def test_as_dict_omits_missing_optional_fields(self):
+        entry = HomeworkEntry(1, "2026-02-20", "Unknown", "Unknown", "Unknown")
+        assert entry.as_dict() == {
+            "id": 1,
+            "date": "2026-02-20",
+            "subject": "Unknown",
+            "creator": "Unknown",
+            "category": "Unknown",
+        }
+
+    def test_from_dict_round_trip(self, mock_homework_entries):
+        for entry in mock_homework_entries:
+            assert HomeworkEntry.from_dict(entry.as_dict()) == entry
+
+    def test_from_dict_interns_names(self, mock_homework_entries):
+        data = mock_homework_entries[0].as_dict()
+        data["subject"] = "".join(["Hist", "oria"])
+
+        restored = HomeworkEntry.from_dict(data)
+
+        assert restored.subject is HomeworkEntry.from_dict(data).subject
+
+    def test_is_frozen_and_slotted(self, mock_homework_entries):
+        entry = mock_homework_entries[0]
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            entry.subject = "Matematyka"
+        assert not hasattr(entry, "__dict__")
+
+
+class TestHomeworkIndex:
+    """Tests for the date-sorted homework index."""
+
+    def _index(self):
+        return HomeworkIndex(
+            HomeworkEntry(i, day, "Historia", "Nowak", "inne", time_from=time_from)
+            for i, (day, time_from) in enumerate(
+                [
+                    ("2026-02-22", None),
+                    ("2026-02-20", "10:30:00"),
+                    ("2026-02-20", "07:45:00"),
+                    ("2026-02-25", None),
+                ]
+            )
+        )
+
+    def test_between_is_inclusive_and_sorted(self):
+        result = self._index().between("2026-02-20", "2026-02-22")
+        assert [entry.id for entry in result] == [2, 1, 0]
+
+    def test_between_empty_range(self):
+        assert self._index().between("2026-02-23", "2026-02-24") == []
+
+    def test_since(self):
+        assert [entry.id for entry in self._index().since("2026-02-21")] == [0, 3]
+
+    def test_len(self):
+        assert len(self._index()) == 4
+
+
+class TestGradeEntry:
+    """Tests for GradeEntry."""
+
+    def test_round_trips_through_dict(self, mock_grade_entries):
+        for grade in mock_grade_entries:
+            assert GradeEntry.from_dict(grade.as_dict()) == grade
+
+    def test_is_immutable(self, mock_grade_entries):
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            mock_grade_entries[0].grade = "6"
+
+
+class TestAttendanceCounts:
+    """Tests for AttendanceCounts."""
+
+    def test_percentages(self):
+        counts = AttendanceCounts(present=6, late=2, absent=1, excused=1)
+
+        assert counts.absences == 2
+        assert counts.attendance_percent == 80.0
+        assert counts.excused_percent == 50.0
+
+    def test_percentages_none_without_lessons(self):
+        counts = AttendanceCounts()
+
+        assert counts.attendance_percent is None
+        assert counts.excused_percent is None
+
+
+class TestAttendanceSummary:
+    """Tests for AttendanceSummary."""
+
+    def test_builds_counters(self, mock_attendance_records):
+        summary = AttendanceSummary(mock_attendance_records)
+
+        assert summary.total == AttendanceCounts(present=2, absent=1, late=1)
+        assert summary.by_subject["Historia"] == AttendanceCounts(present=1, late=1)
+        assert summary.by_type == {
+            "Obecność": 1,
+            "Nieobecność": 1,
+            "Spóźnienie": 1,
+            "wycieczka": 1,
+        }
+        assert summary.type_ids() == {600001: 100, 600002: 1, 600003: 2, 600004: 1045}
+
+    def test_apply_moves_changed_record(self, mock_attendance_records):
+        summary = AttendanceSummary(mock_attendance_records)
+        excused = dataclasses.replace(
+            mock_attendance_records[1], type_id=3, type_name="Nieobecność uspr.", kind="excused"
+        )
+
+        updated = summary.apply([excused])
+
+        assert updated.total == AttendanceCounts(present=2, excused=1, late=1)
+        assert updated.by_subject["Język polski"] == AttendanceCounts(present=1, excused=1)
+        assert "Nieobecność" not in updated.by_type
+        assert updated.records[600002] is excused
+        # The original summary is left untouched
+        assert summary.total == AttendanceCounts(present=2, absent=1, late=1)
+
+    def test_apply_removes_records(self, mock_attendance_records):
+        summary = AttendanceSummary(mock_attendance_records)
+
+        updated = summary.apply([], removed=[600003])
+
+        assert updated.total == AttendanceCounts(present=2, absent=1)
+        assert 600003 not in updated.records
+
+    def test_apply_matches_full_rebuild(self, mock_attendance_records):
+        first, *rest = mock_attendance_records
+
+        updated = AttendanceSummary([first]).apply(rest)
+        rebuilt = AttendanceSummary(mock_attendance_records)
+
+        assert updated.total == rebuilt.total
+        assert updated.by_subject == rebuilt.by_subject
+        assert updated.by_type == rebuilt.by_type
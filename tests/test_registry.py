@@ -0,0 +1,128 @@
+"""Tests for the Librus client registry."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.librus.const import (
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    DOMAIN,
+    MAX_CONCURRENT_LOGINS,
+)
+from custom_components.librus.registry import async_get_client_registry
+
+
+def _entry(hass: HomeAssistant, username: str, entry_id: str) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_USERNAME: username, CONF_PASSWORD: "pass"},
+        entry_id=entry_id,
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+@pytest.fixture
+def registry(hass: HomeAssistant):
+    """Return the registry of the test instance."""
+    return async_get_client_registry(hass)
+
+
+class TestLibrusClientRegistry:
+    """Tests for sharing clients between config entries."""
+
+    async def test_registry_is_a_singleton(self, hass: HomeAssistant, registry):
+        assert async_get_client_registry(hass) is registry
+
+    async def test_same_username_shares_session_manager(self, hass: HomeAssistant, registry):
+        first = registry.async_session_manager(_entry(hass, "Parent", "a"))
+        second = registry.async_session_manager(_entry(hass, "parent", "b"))
+        other = registry.async_session_manager(_entry(hass, "other", "c"))
+
+        assert first is second
+        assert first is not other
+
+    async def test_accounts_share_circuit_breaker(self, hass: HomeAssistant, registry):
+        first = registry.async_session_manager(_entry(hass, "child1", "a"))
+        second = registry.async_session_manager(_entry(hass, "child2", "b"))
+
+        assert first.circuit_breaker is second.circuit_breaker is registry.circuit_breaker
+
+    async def test_accounts_share_rate_limiter(self, hass: HomeAssistant, registry):
+        first = registry.async_session_manager(_entry(hass, "child1", "a"))
+        second = registry.async_session_manager(_entry(hass, "child2", "b"))
+
+        assert first.rate_limiter is second.rate_limiter is registry.rate_limiter
+
+    async def test_lookup_cache_shared_per_school(self, hass: HomeAssistant, registry):
+        first, second = _entry(hass, "child1", "a"), _entry(hass, "child2", "b")
+
+        assert registry.async_lookup_cache(first, 10) is registry.async_lookup_cache(second, 10)
+        assert registry.async_lookup_cache(first, 10) is not registry.async_lookup_cache(
+            second, 11
+        )
+
+    async def test_unknown_school_gets_private_cache(self, hass: HomeAssistant, registry):
+        first, second = _entry(hass, "child1", "a"), _entry(hass, "child2", "b")
+
+        assert registry.async_lookup_cache(first, None) is not registry.async_lookup_cache(
+            second, None
+        )
+
+    async def test_learned_school_adopts_private_cache(self, hass: HomeAssistant, registry):
+        first, second = _entry(hass, "child1", "a"), _entry(hass, "child2", "b")
+        private = registry.async_lookup_cache(first, None)
+        other = registry.async_lookup_cache(second, None)
+
+        assert registry.async_move_to_school(first, 10) is private
+        # The school's cache already exists: the other private one is dropped
+        assert registry.async_move_to_school(second, 10) is private
+        assert registry.async_lookup_cache(second, None) is not other
+
+    async def test_release_drops_unused_clients(self, hass: HomeAssistant, registry):
+        first, second = _entry(hass, "child1", "a"), _entry(hass, "child2", "b")
+        cache = registry.async_lookup_cache(first, 10)
+        registry.async_lookup_cache(second, 10)
+
+        registry.async_release("a")
+        assert registry.async_lookup_cache(second, 10) is cache
+
+        registry.async_release("b")
+        assert registry.async_lookup_cache(second, 10) is not cache
+
+    async def test_logins_are_capped_across_accounts(self, hass: HomeAssistant, registry):
+        managers = [
+            registry.async_session_manager(_entry(hass, f"child{index}", str(index)))
+            for index in range(MAX_CONCURRENT_LOGINS + 2)
+        ]
+        running = peak = 0
+        release = asyncio.Event()
+
+        async def login(session, username, password, **kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await release.wait()
+            running -= 1
+            return session
+
+        with patch(
+            "custom_components.librus.librus_client._async_create_authenticated_session",
+            side_effect=login,
+        ):
+            tasks = [
+                hass.async_create_task(manager.async_get_session()) for manager in managers
+            ]
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            release.set()
+            await asyncio.gather(*tasks)
+
+        assert peak == MAX_CONCURRENT_LOGINS
@@ -0,0 +1,429 @@
+"""Tests for the Librus refresh scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import Any
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from custom_components.librus.const import (
+    FIRST_REFRESH_RETRY,
+    FREE_DAYS_STORAGE_KEY,
+    REFRESH_INTERVALS,
+    REFRESHED_STORAGE_KEY,
+    SCHEDULER_TICK,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from custom_components.librus.librus_client import (
+    LibrusConnectionError,
+    RequestPriority,
+    current_request_priority,
+    request_priority,
+)
+from custom_components.librus.models import AttendanceSummary, FreeDays
+from custom_components.librus.scheduler import LibrusRefreshScheduler, _school_term
+
+# Monday 2026-02-09; winter break from 2026-02-16
+WINTER_BREAK = FreeDays("Ferie zimowe", "2026-02-16", "2026-03-01")
+
+
+def _local(value: str) -> datetime:
+    return dt_util.as_utc(
+        dt_util.parse_datetime(value).replace(tzinfo=dt_util.get_default_time_zone())
+    )
+
+
+@pytest.fixture
+def coordinators():
+    """Return a mock coordinator per scheduled resource."""
+    return {
+        resource: Mock(
+            async_refresh=AsyncMock(), last_update_success=True, last_exception=None
+        )
+        for resource in REFRESH_INTERVALS
+    }
+
+
+@pytest.fixture
+async def scheduler(hass: HomeAssistant, mock_config_entry, coordinators):
+    """Create a scheduler over the mock coordinators."""
+    scheduler = LibrusRefreshScheduler(hass, mock_config_entry, Mock(), coordinators)
+    scheduler.free_days = [WINTER_BREAK]
+    return scheduler
+
+
+class TestIntervals:
+    """Tests for the school-hours cadence."""
+
+    def test_school_hours_use_short_interval(self, scheduler):
+        assert scheduler.interval("homework", _local("2026-02-09 10:00:00")) == timedelta(minutes=15)
+
+    @pytest.mark.parametrize(
+        "moment",
+        ["2026-02-09 06:59:00", "2026-02-09 16:00:00", "2026-02-14 10:00:00"],
+    )
+    def test_outside_school_hours_use_long_interval(self, scheduler, moment):
+        assert scheduler.interval("homework", _local(moment)) == timedelta(hours=6)
+
+    def test_free_days_refresh_once_a_day(self, scheduler):
+        now = _local("2026-02-17 10:00:00")
+        assert scheduler.interval("homework", now) == timedelta(days=1)
+
+        for resource in REFRESH_INTERVALS:
+            scheduler._last_refresh[resource] = now - timedelta(hours=23)
+        assert scheduler.due(now) == []
+        assert set(scheduler.due(now + timedelta(hours=1))) == set(REFRESH_INTERVALS)
+
+    @pytest.mark.parametrize("moment", ["2026-07-01 10:00:00", "2026-08-31 10:00:00"])
+    def test_summer_break_refreshes_once_a_week(self, scheduler, moment):
+        assert scheduler.interval("homework", _local(moment)) == timedelta(days=7)
+
+    def test_summer_break_ends_with_september(self, scheduler):
+        assert scheduler.interval("homework", _local("2026-09-01 10:00:00")) == timedelta(
+            minutes=15
+        )
+
+    def test_due_after_interval(self, scheduler):
+        now = _local("2026-02-09 10:00:00")
+        assert set(scheduler.due(now)) == set(REFRESH_INTERVALS)
+
+        for resource in REFRESH_INTERVALS:
+            scheduler._last_refresh[resource] = now
+        assert scheduler.due(now + timedelta(minutes=14)) == []
+        assert scheduler.due(now + timedelta(minutes=15)) == ["homework", "grades"]
+
+    def test_resource_without_data_is_retried_sooner(self, scheduler, coordinators):
+        now = _local("2026-02-14 10:00:00")
+        coordinators["grades"].data = None
+        for resource in REFRESH_INTERVALS:
+            scheduler._last_refresh[resource] = now
+
+        assert scheduler.due(now + FIRST_REFRESH_RETRY) == ["grades"]
+
+
+@pytest.mark.parametrize(
+    ("day", "term"),
+    [
+        (date(2025, 9, 1), "2025-09-01"),
+        (date(2026, 1, 31), "2025-09-01"),
+        (date(2026, 2, 1), "2026-02-01"),
+        (date(2026, 8, 31), "2026-02-01"),
+    ],
+)
+def test_school_term(day, term):
+    assert _school_term(day) == term
+
+
+class TestTick:
+    """Tests for the scheduler tick."""
+
+    async def test_tick_refreshes_due_resources_and_free_days(
+        self, hass: HomeAssistant, scheduler, coordinators, freezer
+    ):
+        freezer.move_to(_local("2026-02-09 10:00:00"))
+        scheduler._last_refresh["homework"] = dt_util.utcnow()
+        with patch(
+            "custom_components.librus.scheduler.async_fetch_school_free_days",
+            return_value=[WINTER_BREAK],
+        ) as mock_free_days:
+            await scheduler._async_tick()
+            await scheduler._async_tick()
+
+        mock_free_days.assert_awaited_once()
+        coordinators["homework"].async_refresh.assert_not_awaited()
+        for resource in ("grades", "attendance", "timetable"):
+            coordinators[resource].async_refresh.assert_awaited_once()
+
+    async def test_free_days_failure_keeps_previous_list(
+        self, hass: HomeAssistant, scheduler, freezer
+    ):
+        freezer.move_to(_local("2026-02-17 10:00:00"))
+        with patch(
+            "custom_components.librus.scheduler.async_fetch_school_free_days",
+            side_effect=LibrusConnectionError("down"),
+        ) as mock_free_days:
+            await scheduler._async_tick()
+            freezer.tick(timedelta(hours=1))
+            await scheduler._async_tick()
+            freezer.tick(timedelta(hours=5))
+            await scheduler._async_tick()
+
+        assert scheduler.free_days == [WINTER_BREAK]
+        assert mock_free_days.await_count == 2
+
+    async def test_free_days_downloaded_once_per_term(
+        self, hass: HomeAssistant, scheduler, freezer, hass_storage: dict[str, Any]
+    ):
+        freezer.move_to(_local("2026-01-20 10:00:00"))
+        with patch(
+            "custom_components.librus.scheduler.async_fetch_school_free_days",
+            return_value=[WINTER_BREAK],
+        ) as mock_free_days:
+            await scheduler._async_tick()
+            freezer.tick(timedelta(days=10))
+            await scheduler._async_tick()
+            assert mock_free_days.await_count == 1
+
+            freezer.move_to(_local("2026-02-01 10:00:00"))
+            await scheduler._async_tick()
+            assert mock_free_days.await_count == 2
+
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=STORAGE_SAVE_DELAY + 1))
+        await hass.async_block_till_done()
+        key = FREE_DAYS_STORAGE_KEY.format(entry_id=scheduler.entry.entry_id)
+        assert hass_storage[key]["data"] == {
+            "term": "2026-02-01",
+            "free_days": [WINTER_BREAK.as_dict()],
+        }
+
+    async def test_restored_free_days_are_not_downloaded_again(
+        self,
+        hass: HomeAssistant,
+        mock_config_entry,
+        coordinators,
+        freezer,
+        hass_storage: dict[str, Any],
+    ):
+        hass_storage[FREE_DAYS_STORAGE_KEY.format(entry_id=mock_config_entry.entry_id)] = {
+            "version": STORAGE_VERSION,
+            "key": FREE_DAYS_STORAGE_KEY,
+            "data": {"term": "2026-02-01", "free_days": [WINTER_BREAK.as_dict()]},
+        }
+        scheduler = LibrusRefreshScheduler(hass, mock_config_entry, Mock(), coordinators)
+        assert await scheduler.async_restore_snapshot()
+        freezer.move_to(_local("2026-02-17 10:00:00"))
+
+        with patch(
+            "custom_components.librus.scheduler.async_fetch_school_free_days",
+        ) as mock_free_days:
+            await scheduler._async_tick()
+
+        mock_free_days.assert_not_called()
+        assert scheduler.free_days == [WINTER_BREAK]
+        assert scheduler.is_free_day(dt_util.utcnow())
+
+    async def test_successful_refresh_times_are_persisted(
+        self, hass: HomeAssistant, scheduler, coordinators, freezer, hass_storage: dict[str, Any]
+    ):
+        freezer.move_to(_local("2026-02-09 10:00:00"))
+        coordinators["grades"].last_update_success = False
+
+        await scheduler.async_request_refresh(["homework", "grades"])
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=STORAGE_SAVE_DELAY + 1))
+        await hass.async_block_till_done()
+
+        key = REFRESHED_STORAGE_KEY.format(entry_id=scheduler.entry.entry_id)
+        assert hass_storage[key]["data"] == {"homework": _local("2026-02-09 10:00:00").isoformat()}
+
+    async def test_restored_refresh_times_skip_fresh_resources(
+        self,
+        hass: HomeAssistant,
+        mock_config_entry,
+        coordinators,
+        freezer,
+        hass_storage: dict[str, Any],
+    ):
+        freezer.move_to(_local("2026-02-09 10:00:00"))
+        refreshed = (dt_util.utcnow() - timedelta(minutes=5)).isoformat()
+        hass_storage[REFRESHED_STORAGE_KEY.format(entry_id=mock_config_entry.entry_id)] = {
+            "version": STORAGE_VERSION,
+            "key": REFRESHED_STORAGE_KEY,
+            "data": {"homework": refreshed, "grades": refreshed},
+        }
+        # No grades were restored, so they are fetched anyway
+        coordinators["grades"].data = None
+        scheduler = LibrusRefreshScheduler(hass, mock_config_entry, Mock(), coordinators)
+        assert not await scheduler.async_restore_snapshot()
+        scheduler.free_days = []
+        scheduler._free_days_term = "2026-02-01"
+
+        await scheduler._async_tick()
+
+        coordinators["homework"].async_refresh.assert_not_awaited()
+        for resource in ("grades", "attendance", "timetable"):
+            coordinators[resource].async_refresh.assert_awaited_once()
+
+    @pytest.mark.usefixtures("unload_entries")
+    async def test_start_runs_first_tick_and_stops_on_unload(
+        self, hass: HomeAssistant, mock_config_entry
+    ):
+        with patch(
+            "custom_components.librus.async_fetch_school_id", return_value=4321
+        ), patch(
+            "custom_components.librus.scheduler.async_fetch_school_free_days",
+            return_value=[],
+        ), patch(
+            "custom_components.librus.coordinator.LibrusDataUpdateCoordinator._async_update_data",
+            return_value=[],
+        ) as mock_homework, patch(
+            "custom_components.librus.coordinator.LibrusTimetableCoordinator._async_update_data",
+            return_value=[],
+        ), patch(
+            "custom_components.librus.coordinator.LibrusGradesCoordinator._async_update_data",
+            return_value=[],
+        ), patch(
+            "custom_components.librus.coordinator.LibrusAttendanceCoordinator._async_update_data",
+            return_value=AttendanceSummary(),
+        ), patch.object(
+            LibrusRefreshScheduler,
+            "_async_tick",
+            autospec=True,
+            side_effect=LibrusRefreshScheduler._async_tick,
+        ) as mock_tick, patch.object(
+            hass.config_entries, "async_forward_entry_setups", new_callable=AsyncMock
+        ):
+            assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+            await hass.async_block_till_done(wait_background_tasks=True)
+            assert mock_tick.call_count == 1
+            mock_homework.assert_awaited_once()
+
+            async_fire_time_changed(hass, dt_util.utcnow() + SCHEDULER_TICK)
+            await hass.async_block_till_done(wait_background_tasks=True)
+            assert mock_tick.call_count == 2
+
+            assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+            async_fire_time_changed(hass, dt_util.utcnow() + 3 * SCHEDULER_TICK)
+            await hass.async_block_till_done(wait_background_tasks=True)
+
+        assert mock_tick.call_count == 2
+
+
+class TestRequestRefresh:
+    """Tests for coalescing on-demand refreshes."""
+
+    async def test_returns_result_per_resource(self, hass: HomeAssistant, scheduler, coordinators):
+        coordinators["grades"].last_update_success = False
+        coordinators["grades"].last_exception = UpdateFailed("Librus is down")
+
+        result = await scheduler.async_request_refresh(["homework", "grades"])
+
+        assert result == {
+            "homework": {"success": True, "error": None},
+            "grades": {"success": False, "error": "Librus is down"},
+        }
+        assert scheduler.due(dt_util.utcnow()) == ["attendance", "timetable"]
+
+    async def test_bursts_share_in_flight_refresh(
+        self, hass: HomeAssistant, scheduler, coordinators
+    ):
+        release = asyncio.Event()
+        coordinators["homework"].async_refresh.side_effect = release.wait
+
+        first = hass.async_create_task(scheduler.async_request_refresh(["homework"]))
+        await asyncio.sleep(0)
+        # Covered by the refresh in flight
+        joined = hass.async_create_task(scheduler.async_request_refresh(["homework"]))
+        # Not covered: merged into one follow-up refresh
+        grades = hass.async_create_task(scheduler.async_request_refresh(["grades"]))
+        attendance = hass.async_create_task(
+            scheduler.async_request_refresh(["attendance", "homework"])
+        )
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(first, joined, grades, attendance)
+
+        assert results[0] == results[1] == {"homework": {"success": True, "error": None}}
+        assert set(results[3]) == {"attendance", "homework"}
+        assert coordinators["homework"].async_refresh.await_count == 2
+        coordinators["grades"].async_refresh.assert_awaited_once()
+        coordinators["attendance"].async_refresh.assert_awaited_once()
+        coordinators["timetable"].async_refresh.assert_not_awaited()
+
+    async def test_requests_before_the_refresh_starts_share_it(
+        self, hass: HomeAssistant, scheduler, coordinators
+    ):
+        create_task = scheduler.entry.async_create_background_task
+
+        def create_lazy_task(hass, target, name):
+            return create_task(hass, target, name, eager_start=False)
+
+        with patch.object(
+            scheduler.entry, "async_create_background_task", side_effect=create_lazy_task
+        ):
+            # No yield between the calls: the refresh task has not started yet
+            homework = hass.async_create_task(scheduler.async_request_refresh(["homework"]))
+            grades = hass.async_create_task(scheduler.async_request_refresh(["grades"]))
+            results = await asyncio.gather(homework, grades)
+
+        assert results == [
+            {"homework": {"success": True, "error": None}},
+            {"grades": {"success": True, "error": None}},
+        ]
+        coordinators["homework"].async_refresh.assert_awaited_once()
+        coordinators["grades"].async_refresh.assert_awaited_once()
+
+    async def test_ticks_wait_behind_on_demand_refreshes(
+        self, hass: HomeAssistant, scheduler, coordinators, freezer
+    ):
+        freezer.move_to(_local("2026-02-09 10:00:00"))
+        scheduler.free_days = []
+        scheduler._free_days_term = "2026-02-01"
+        priorities = []
+        coordinators["homework"].async_refresh.side_effect = lambda: priorities.append(
+            current_request_priority()
+        )
+
+        await scheduler._async_tick()
+        await scheduler.async_request_refresh(["homework"])
+
+        assert priorities == [RequestPriority.BACKGROUND, RequestPriority.INTERACTIVE]
+
+    async def test_merged_refresh_takes_most_urgent_priority(
+        self, hass: HomeAssistant, scheduler, coordinators
+    ):
+        release = asyncio.Event()
+        coordinators["homework"].async_refresh.side_effect = release.wait
+        priorities = []
+
+        async def refresh_grades() -> None:
+            priorities.append(current_request_priority())
+
+        coordinators["grades"].async_refresh.side_effect = refresh_grades
+
+        first = hass.async_create_task(scheduler.async_request_refresh(["homework"]))
+        await asyncio.sleep(0)
+        with request_priority(RequestPriority.BACKGROUND):
+            background = hass.async_create_task(scheduler.async_request_refresh(["grades"]))
+        interactive = hass.async_create_task(scheduler.async_request_refresh(["grades"]))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(first, background, interactive)
+
+        assert priorities == [RequestPriority.INTERACTIVE]
+
+    async def test_cancelled_refresh_releases_waiting_callers(
+        self, hass: HomeAssistant, scheduler, coordinators
+    ):
+        release = asyncio.Event()
+
+        async def refresh_until_unload() -> None:
+            await release.wait()
+            raise asyncio.CancelledError
+
+        coordinators["homework"].async_refresh.side_effect = refresh_until_unload
+
+        first = hass.async_create_task(scheduler.async_request_refresh(["homework"]))
+        await asyncio.sleep(0)
+        queued = hass.async_create_task(scheduler.async_request_refresh(["grades"]))
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(first, queued)
+
+        assert results == [
+            {"homework": {"success": False, "error": "Refresh cancelled"}},
+            {"grades": {"success": False, "error": "Refresh cancelled"}},
+        ]
+        coordinators["grades"].async_refresh.assert_not_awaited()
+        # The next request starts a new refresh
+        assert await scheduler.async_request_refresh(["grades"]) == {
+            "grades": {"success": True, "error": None}
+        }
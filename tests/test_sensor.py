@@ -1,16 +1,43 @@
-"""Tests for the Librus homework sensor."""
+"""Tests for the Librus sensors."""
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
 from homeassistant.core import HomeAssistant
 
-from custom_components.librus.const import DOMAIN
-from custom_components.librus.coordinator import LibrusDataUpdateCoordinator
-from custom_components.librus.sensor import HomeworkSensor
+from custom_components.librus.const import (
+    ATTRIBUTE_MODE_COMPACT,
+    ATTRIBUTE_MODE_FULL,
+    CONF_ATTRIBUTE_MODE,
+    COMPACT_CONTENT_LENGTH,
+    COMPACT_MAX_ENTRIES,
+    DOMAIN,
+)
+from custom_components.librus.coordinator import (
+    LibrusAttendanceCoordinator,
+    LibrusDataUpdateCoordinator,
+    LibrusGradesCoordinator,
+    LibrusLuckyNumberCoordinator,
+    LibrusTimetableCoordinator,
+)
+from custom_components.librus.metrics import LibrusMetrics
+from custom_components.librus.models import AttendanceSummary, HomeworkEntry, LuckyNumber
+from custom_components.librus.sensor import (
+    ATTENDANCE_SENSORS,
+    DAY_SENSORS,
+    METRICS_SENSORS,
+    AttendanceSensor,
+    HomeworkSensor,
+    LatestGradeSensor,
+    LuckyNumberSensor,
+    MetricsSensor,
+    NextLessonSensor,
+)
+
+TODAY, TOMORROW, WEEK = DAY_SENSORS
 
 
 @pytest.fixture
@@ -50,6 +77,16 @@ class TestHomeworkSensor:
         assert len(attrs["homework_entries"]) == 2
         assert attrs["homework_entries"][0]["subject"] == "Historia"
 
+    async def test_attributes_serialized_once_per_update(self, mock_coordinator, mock_config_entry, mock_homework_entries):
+        """Attributes should be rebuilt only when the coordinator data changes."""
+        mock_coordinator.data = mock_homework_entries
+        sensor = HomeworkSensor(mock_coordinator, mock_config_entry)
+        attrs = sensor.extra_state_attributes
+        assert sensor.extra_state_attributes is attrs
+
+        mock_coordinator.data = mock_homework_entries[:1]
+        assert len(sensor.extra_state_attributes["homework_entries"]) == 1
+
     async def test_attributes_empty_list_when_no_data(self, mock_coordinator, mock_config_entry):
         """Attributes should return empty list when coordinator data is None."""
         mock_coordinator.data = None
@@ -76,3 +113,228 @@ class TestHomeworkSensor:
         """Sensor should have a book icon."""
         sensor = HomeworkSensor(mock_coordinator, mock_config_entry)
         assert sensor.icon == "mdi:book-open-variant"
+
+
+class TestHomeworkDaySensors:
+    """Tests for the today/tomorrow/this week sensors."""
+
+    @pytest.mark.parametrize(
+        ("description", "now", "expected"),
+        [
+            (TODAY, "2026-02-20 12:00", [6671271]),
+            (TOMORROW, "2026-02-22 12:00", []),
+            (TOMORROW, "2026-02-19 12:00", [6671271]),
+            (WEEK, "2026-02-16 12:00", [6671271, 6674588]),
+            (WEEK, "2026-02-21 12:00", [6674588]),
+        ],
+    )
+    async def test_counts_entries_in_range(
+        self, mock_coordinator, mock_config_entry, mock_homework_entries, freezer, description, now, expected
+    ):
+        freezer.move_to(now)
+        mock_coordinator.data = mock_homework_entries
+        sensor = HomeworkSensor(mock_coordinator, mock_config_entry, description)
+
+        assert sensor.native_value == len(expected)
+        assert [entry["id"] for entry in sensor.extra_state_attributes["homework_entries"]] == expected
+
+    @pytest.mark.parametrize("mode", [ATTRIBUTE_MODE_FULL, ATTRIBUTE_MODE_COMPACT])
+    async def test_attributes_list_references_only(
+        self, hass: HomeAssistant, mock_coordinator, mock_config_entry, mock_homework_entries, freezer, mode
+    ):
+        """Day sensors should not carry entry content, whatever the attribute mode."""
+        hass.config_entries.async_update_entry(
+            mock_config_entry, options={CONF_ATTRIBUTE_MODE: mode}
+        )
+        freezer.move_to("2026-02-16 12:00")
+        mock_coordinator.data = mock_homework_entries
+        sensor = HomeworkSensor(mock_coordinator, mock_config_entry, WEEK)
+
+        assert sensor.extra_state_attributes == {
+            "homework_entries": [
+                {"id": 6671271, "date": "2026-02-20", "subject": "Historia"},
+                {"id": 6674588, "date": "2026-02-22", "subject": "Unknown"},
+            ]
+        }
+
+    async def test_unique_id_uses_description_key(self, mock_coordinator, mock_config_entry):
+        sensor = HomeworkSensor(mock_coordinator, mock_config_entry, TODAY)
+        assert sensor.unique_id == "test_entry_id_homework_today"
+
+    async def test_unavailable_without_data(self, mock_coordinator, mock_config_entry):
+        mock_coordinator.data = None
+        sensor = HomeworkSensor(mock_coordinator, mock_config_entry, WEEK)
+        assert sensor.native_value is None
+
+
+class TestCompactAttributes:
+    """Tests for the compact attribute mode."""
+
+    async def test_caps_entries_and_truncates_content(
+        self, hass: HomeAssistant, mock_coordinator, mock_config_entry
+    ):
+        hass.config_entries.async_update_entry(
+            mock_config_entry, options={CONF_ATTRIBUTE_MODE: ATTRIBUTE_MODE_COMPACT}
+        )
+        mock_coordinator.data = [
+            HomeworkEntry(i, f"2026-03-{30 - i:02d}", "Historia", "Nowak", "inne", content="x" * 500)
+            for i in range(COMPACT_MAX_ENTRIES + 3)
+        ]
+        sensor = HomeworkSensor(mock_coordinator, mock_config_entry)
+
+        attrs = sensor.extra_state_attributes
+
+        assert sensor.native_value == COMPACT_MAX_ENTRIES + 3
+        assert len(attrs["homework_entries"]) == COMPACT_MAX_ENTRIES
+        assert attrs["omitted_entries"] == 3
+        # Soonest first
+        assert attrs["homework_entries"][0]["date"] == "2026-03-18"
+        assert len(attrs["homework_entries"][0]["content"]) == COMPACT_CONTENT_LENGTH
+        assert attrs["homework_entries"][0]["content"].endswith("…")
+
+    async def test_entries_not_recorded(self, mock_coordinator, mock_config_entry):
+        sensor = HomeworkSensor(mock_coordinator, mock_config_entry)
+        assert "homework_entries" in sensor._unrecorded_attributes
+
+
+class TestNextLessonSensor:
+    """Tests for the NextLessonSensor entity."""
+
+    async def test_state_is_next_lesson_subject(
+        self, hass: HomeAssistant, mock_config_entry, mock_timetable_lessons, freezer
+    ):
+        freezer.move_to("2026-02-16 07:50:00+01:00")
+        coordinator = LibrusTimetableCoordinator(hass, mock_config_entry, Mock())
+        coordinator.data = mock_timetable_lessons
+        sensor = NextLessonSensor(coordinator, mock_config_entry)
+        sensor.hass = hass
+        sensor._async_update_lesson()
+
+        assert sensor.native_value == "Historia"
+        assert sensor.extra_state_attributes["teacher"] == "Krzysztof Krupa"
+        assert sensor.extra_state_attributes["time_from"] == "08:00"
+        sensor._async_cancel_lesson_end()
+
+    async def test_state_none_without_upcoming_lessons(
+        self, hass: HomeAssistant, mock_config_entry, mock_timetable_lessons, freezer
+    ):
+        freezer.move_to("2026-02-20 12:00:00+01:00")
+        coordinator = LibrusTimetableCoordinator(hass, mock_config_entry, Mock())
+        coordinator.data = mock_timetable_lessons
+        sensor = NextLessonSensor(coordinator, mock_config_entry)
+        sensor.hass = hass
+        sensor._async_update_lesson()
+
+        assert sensor.native_value is None
+        assert sensor.extra_state_attributes == {}
+
+
+class TestLatestGradeSensor:
+    """Tests for the LatestGradeSensor entity."""
+
+    async def test_state_is_latest_grade(
+        self, hass: HomeAssistant, mock_config_entry, mock_grade_entries
+    ):
+        coordinator = LibrusGradesCoordinator(hass, mock_config_entry, Mock(), Mock())
+        coordinator.data = mock_grade_entries
+        sensor = LatestGradeSensor(coordinator, mock_config_entry)
+
+        assert sensor.native_value == "3+"
+        assert sensor.extra_state_attributes["subject"] == "Język polski"
+        assert sensor.extra_state_attributes["grade_count"] == 2
+
+    async def test_state_none_without_grades(self, hass: HomeAssistant, mock_config_entry):
+        coordinator = LibrusGradesCoordinator(hass, mock_config_entry, Mock(), Mock())
+        coordinator.data = []
+        sensor = LatestGradeSensor(coordinator, mock_config_entry)
+
+        assert sensor.native_value is None
+        assert sensor.extra_state_attributes == {}
+
+
+class TestAttendanceSensors:
+    """Tests for the AttendanceSensor entities."""
+
+    @pytest.fixture
+    def sensors(self, hass: HomeAssistant, mock_config_entry, mock_attendance_records):
+        coordinator = LibrusAttendanceCoordinator(hass, mock_config_entry, Mock(), Mock())
+        coordinator.data = AttendanceSummary(mock_attendance_records)
+        return {
+            description.key: AttendanceSensor(coordinator, mock_config_entry, description)
+            for description in ATTENDANCE_SENSORS
+        }
+
+    async def test_states(self, sensors):
+        assert sensors["attendance"].native_value == 75.0
+        assert sensors["absences"].native_value == 1
+        assert sensors["lates"].native_value == 1
+        assert sensors["excused_absences"].native_value == 0.0
+
+    async def test_attributes_per_subject(self, sensors):
+        assert sensors["absences"].extra_state_attributes == {
+            "by_subject": {"Historia": 0, "Język polski": 1}
+        }
+        attendance = sensors["attendance"].extra_state_attributes
+        assert attendance["by_subject"] == {"Historia": 100.0, "Język polski": 50.0}
+        assert attendance["by_type"]["Spóźnienie"] == 1
+        assert attendance["absent"] == 1
+
+
+class TestLuckyNumberSensor:
+    """Tests for the LuckyNumberSensor entity."""
+
+    async def test_state_and_day(self, hass: HomeAssistant, mock_config_entry):
+        coordinator = LibrusLuckyNumberCoordinator(hass, mock_config_entry, Mock())
+        coordinator.data = LuckyNumber(13, "2026-02-17")
+        sensor = LuckyNumberSensor(coordinator, mock_config_entry)
+
+        assert sensor.native_value == 13
+        assert sensor.extra_state_attributes == {"lucky_number_day": "2026-02-17"}
+
+
+class TestMetricsSensors:
+    """Tests for the diagnostic request metrics sensors."""
+
+    @pytest.fixture
+    def metrics(self):
+        """Return metrics of one login and one homework refresh."""
+        metrics = LibrusMetrics()
+        metrics.record_request("auth step 1", 0.25, 200)
+        metrics.record_request("login", 1.5, None)
+        metrics.count("logins")
+        metrics.record_request("HomeWorks", 0.5, 200, 2048, 0.125)
+        metrics.record_call("homework", 2.0, True)
+        return metrics
+
+    def _sensor(self, metrics, entry, key):
+        description = next(item for item in METRICS_SENSORS if item.key == key)
+        return MetricsSensor(metrics, entry, description)
+
+    async def test_counter(self, hass: HomeAssistant, mock_config_entry, metrics):
+        sensor = self._sensor(metrics, mock_config_entry, "logins")
+
+        assert sensor.native_value == 1
+        assert sensor.extra_state_attributes is None
+        assert sensor.entity_registry_enabled_default is False
+
+    async def test_login_time_with_steps(self, hass: HomeAssistant, mock_config_entry, metrics):
+        sensor = self._sensor(metrics, mock_config_entry, "login_time")
+
+        assert sensor.native_value == 1.5
+        assert sensor.extra_state_attributes["steps"]["auth step 1"]["duration"] == 0.25
+
+    async def test_last_refresh_time_with_requests(
+        self, hass: HomeAssistant, mock_config_entry, metrics
+    ):
+        sensor = self._sensor(metrics, mock_config_entry, "call_time")
+
+        assert sensor.native_value == 2.0
+        attributes = sensor.extra_state_attributes
+        assert attributes["call"] == "homework"
+        assert attributes["requests"]["HomeWorks"]["size"] == 2048
+        assert "auth step 1" not in attributes["requests"]
+
+    async def test_no_call_yet(self, hass: HomeAssistant, mock_config_entry):
+        sensor = self._sensor(LibrusMetrics(), mock_config_entry, "call_time")
+
+        assert sensor.native_value is None